@@ -0,0 +1,73 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import TypeVar, Generic, Callable, Awaitable, Tuple
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+class IdempotencyCache(Generic[K, V]):
+    # Remembers the result of each keyed action for ttl seconds, and at most capacity of them, so a repeat of the same
+    # key gets the first result instead of running the action again. Entries are kept in insertion order, which is also
+    # expiry order, so the oldest are dropped from the front like a ring buffer.
+    #
+    # A repeat that arrives while the first is still running waits for its result. An action that raises is forgotten,
+    # so a retry after a failure runs it again
+    def __init__(self, capacity: int, ttl: float, clock: Callable[[], float] = time.monotonic) -> None:
+        if capacity < 1:
+            raise ValueError("Cache capacity must be at least 1")
+        self._capacity: int = capacity
+        self._ttl: float = ttl
+        self._clock: Callable[[], float] = clock
+        self._entries: OrderedDict[K, Tuple[float, asyncio.Future]] = OrderedDict()
+        self._repeats: int = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: K) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and entry[0] >= self._clock()
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def repeats(self) -> int:
+        return self._repeats
+
+    def _expire(self, now: float) -> None:
+        # Dropping an entry whose action is still running only means a later repeat runs it again
+        entries = self._entries
+        while len(entries) > 0:
+            expires, _ = next(iter(entries.values()))
+            if expires >= now and len(entries) < self._capacity:
+                break
+            entries.popitem(last=False)
+
+    async def once(self, key: K, action: Callable[[], Awaitable[V]]) -> V:
+        now = self._clock()
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] >= now:
+            self._repeats += 1
+            return await asyncio.shield(entry[1])
+        self._expire(now)
+        future = asyncio.get_running_loop().create_future()
+        self._entries[key] = (now + self._ttl, future)
+        try:
+            result = await action()
+        except BaseException as e:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] is future:
+                del self._entries[key]
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+                # Marks the exception as retrieved in case no repeat was waiting for it
+                future.exception()
+            raise
+        future.set_result(result)
+        return result
@@ -0,0 +1,27 @@
+import time
+from typing import TypeVar, Optional, Tuple, Callable
+
+from Common.Cache.LruCache import LruCache
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+class TtlCache(LruCache[K, Tuple[float, V]]):
+    # An LruCache whose entries also expire ttl seconds after they were put. Expired entries are dropped when read
+    def __init__(self, capacity: int, ttl: float, clock: Callable[[], float] = time.monotonic) -> None:
+        super().__init__(capacity)
+        self._ttl: float = ttl
+        self._clock: Callable[[], float] = clock
+
+    def get(self, key: K) -> Optional[V]:
+        entry = super().get(key)
+        if entry is None:
+            return None
+        if entry[0] < self._clock():
+            self.evict(key)
+            return None
+        return entry[1]
+
+    def put(self, key: K, value: V) -> None:
+        super().put(key, (self._clock() + self._ttl, value))
@@ -0,0 +1,3 @@
+from .LruCache import LruCache
+from .TtlCache import TtlCache
+from .IdempotencyCache import IdempotencyCache
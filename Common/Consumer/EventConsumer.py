@@ -0,0 +1,198 @@
+import asyncio
+import inspect
+import zlib
+from typing import List, Dict, Optional, Callable, Union, Awaitable, Set
+
+from Common.Consumer.EventDispatcher import EventDispatcher
+from Common.Event import Event, EventCodec
+from Common.Transport import TransportConsumer, TransportMessage, Backoff
+
+ErrorHandler = Callable[[TransportMessage, Optional[Event], Exception], Union[None, Awaitable[None]]]
+
+
+class EventConsumer:
+    # Fetches messages from one or more transport consumers, decodes them and dispatches the events over a pool of
+    # workers. Each worker owns a partition of aggregate ids, chosen by a stable hash of the id, and handles its events
+    # one at a time; so the events of one aggregate are handled in the order they were fetched, while different
+    # aggregates are handled concurrently.
+    #
+    # At most prefetch messages are fetched but not yet handled; fetching pauses while the workers catch up. Handled
+    # messages are acked in batches of ack_batch, or every ack_interval seconds, whichever comes first. An event that
+    # fails to be handled is passed to on_error and retried with backoff until it succeeds, holding up the rest of its
+    # partition; handling the aggregate's later events first would apply them out of order. Once stop() is called, a
+    # failing event is nacked instead, along with the events of its aggregate still queued behind it, for the transport
+    # to redeliver in order. A message that fails to decode is passed to on_error and nacked. Messages of types no
+    # handler is registered for are acked without being decoded, and so are messages of aggregates owns() rejects, when
+    # several consumer processes each handle their own share of the aggregates
+    def __init__(self, consumers: List[TransportConsumer], codec: EventCodec, dispatcher: EventDispatcher,
+                 workers: int = 16, prefetch: int = 1000, batch_size: int = 100, ack_batch: int = 100,
+                 ack_interval: float = 0.1, fetch_timeout: float = 1.0, backoff: Optional[Backoff] = None,
+                 on_error: Optional[ErrorHandler] = None, owns: Optional[Callable[[str], bool]] = None) -> None:
+        if workers < 1 or prefetch < 1 or batch_size < 1 or ack_batch < 1:
+            raise ValueError("workers, prefetch, batch_size and ack_batch must be positive")
+        self._consumers: List[TransportConsumer] = consumers
+        self._codec: EventCodec = codec
+        self._dispatcher: EventDispatcher = dispatcher
+        self._workers: int = workers
+        self._prefetch: int = prefetch
+        self._batch_size: int = batch_size
+        self._ack_batch: int = ack_batch
+        self._ack_interval: float = ack_interval
+        self._fetch_timeout: float = fetch_timeout
+        self._backoff: Backoff = backoff or Backoff(0.1, 5.0)
+        self._on_error: Optional[ErrorHandler] = on_error
+        self._owns: Optional[Callable[[str], bool]] = owns
+        self._queues: List[asyncio.Queue] = []
+        self._acks: Dict[TransportConsumer, List[TransportMessage]] = {consumer: [] for consumer in consumers}
+        self._in_flight: int = 0
+        self._room: asyncio.Event = asyncio.Event()
+        self._stopping: bool = False
+        self._fetchers: List[asyncio.Task] = []
+        self._tasks: List[asyncio.Task] = []
+        self._handled: int = 0
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def handled(self) -> int:
+        return self._handled
+
+    @staticmethod
+    def partition(aggregate_id: str, partitions: int) -> int:
+        # crc32 rather than hash(), which differs between processes
+        return zlib.crc32(aggregate_id.encode()) % partitions
+
+    def _decode(self, message: TransportMessage) -> Optional[Event]:
+        headers = message.headers
+        if "EventTag" in headers or "EventType" in headers:
+            if not self._dispatcher.handles(self._codec.event_type(headers)):
+                return None
+        if self._owns is not None and not self._owns(self._codec.aggregate_id(message.data, headers)):
+            return None
+        return self._codec.decode(message.data, headers)
+
+    async def _fetch(self, consumer: TransportConsumer) -> None:
+        while not self._stopping:
+            await self._room.wait()
+            if self._stopping:
+                break
+            room = self._prefetch - self._in_flight
+            if room <= 0:
+                self._room.clear()
+                continue
+            messages = await consumer.fetch(min(self._batch_size, room), self._fetch_timeout)
+            self._in_flight += len(messages)
+            if self._in_flight >= self._prefetch:
+                self._room.clear()
+            for message in messages:
+                try:
+                    event = self._decode(message)
+                except Exception as e:
+                    await self._failed(consumer, message, None, e)
+                    continue
+                if event is None:
+                    await self._done(consumer, message)
+                else:
+                    self._queues[EventConsumer.partition(event.aggregate_id, self._workers)].put_nowait(
+                        (consumer, message, event))
+
+    async def _work(self, queue: asyncio.Queue) -> None:
+        # Aggregates whose failing event was nacked while stopping; their later events are nacked unhandled
+        abandoned: Set[str] = set()
+        while True:
+            consumer, message, event = await queue.get()
+            try:
+                if event.aggregate_id in abandoned:
+                    self._release()
+                    await consumer.nack([message])
+                elif await self._dispatch(event, message):
+                    await self._done(consumer, message)
+                else:
+                    abandoned.add(event.aggregate_id)
+                    self._release()
+                    await consumer.nack([message])
+            finally:
+                queue.task_done()
+
+    async def _dispatch(self, event: Event, message: TransportMessage) -> bool:
+        # Returns False if the event still fails once stop() has been called
+        attempt = 0
+        while True:
+            try:
+                await self._dispatcher.dispatch(event)
+                return True
+            except Exception as e:
+                await self._report(message, event, e)
+            if self._stopping:
+                return False
+            await asyncio.sleep(self._backoff.delay(attempt))
+            attempt += 1
+
+    def _release(self) -> None:
+        self._in_flight -= 1
+        self._room.set()
+
+    async def _done(self, consumer: TransportConsumer, message: TransportMessage) -> None:
+        self._release()
+        self._handled += 1
+        acks = self._acks[consumer]
+        acks.append(message)
+        if len(acks) >= self._ack_batch:
+            await self._flush(consumer)
+
+    async def _failed(self, consumer: TransportConsumer, message: TransportMessage, event: Optional[Event],
+                      error: Exception) -> None:
+        self._release()
+        await self._report(message, event, error)
+        await consumer.nack([message])
+
+    async def _report(self, message: TransportMessage, event: Optional[Event], error: Exception) -> None:
+        if self._on_error is not None:
+            result = self._on_error(message, event, error)
+            if inspect.isawaitable(result):
+                await result
+
+    async def _flush(self, consumer: TransportConsumer) -> None:
+        acks = self._acks[consumer]
+        if len(acks) > 0:
+            self._acks[consumer] = []
+            await consumer.ack(acks)
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self._ack_interval)
+            for consumer in self._consumers:
+                await self._flush(consumer)
+
+    def start(self) -> None:
+        self._stopping = False
+        self._room.set()
+        self._queues = [asyncio.Queue() for _ in range(self._workers)]
+        self._tasks = [asyncio.create_task(self._work(queue)) for queue in self._queues]
+        self._tasks.append(asyncio.create_task(self._flush_periodically()))
+        self._fetchers = [asyncio.create_task(self._fetch(consumer)) for consumer in self._consumers]
+
+    async def run(self) -> None:
+        # Runs until stop() is called or a fetcher fails
+        self.start()
+        try:
+            await asyncio.gather(*self._fetchers)
+        finally:
+            await self.stop()
+
+    async def stop(self) -> None:
+        # Stops fetching once the fetches under way return, lets the workers finish what has been fetched, and sends
+        # the remaining acks
+        self._stopping = True
+        self._room.set()
+        await asyncio.gather(*self._fetchers, return_exceptions=True)
+        self._fetchers = []
+        await asyncio.gather(*(queue.join() for queue in self._queues))
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        for consumer in self._consumers:
+            await self._flush(consumer)
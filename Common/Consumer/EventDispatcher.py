@@ -0,0 +1,29 @@
+import inspect
+from typing import Callable, Dict, List, Type, Union, Awaitable, Iterable
+
+from Common.Event import Event
+
+Handler = Callable[[Event], Union[None, Awaitable[None]]]
+
+
+class EventDispatcher:
+    # Routes each event to the handlers registered for its exact type, in registration order. Unlike EventBus, which
+    # hands every event to every subscriber, an event nobody registered for costs one dict lookup
+    def __init__(self) -> None:
+        self._handlers: Dict[Type[Event], List[Handler]] = {}
+
+    def register(self, event_type: Type[Event], handler: Handler) -> None:
+        self._handlers.setdefault(event_type, []).append(handler)
+
+    def register_all(self, event_types: Iterable[Type[Event]], handler: Handler) -> None:
+        for event_type in event_types:
+            self.register(event_type, handler)
+
+    def handles(self, event_type: Type[Event]) -> bool:
+        return event_type in self._handlers
+
+    async def dispatch(self, event: Event) -> None:
+        for handler in self._handlers.get(type(event), ()):
+            result = handler(event)
+            if inspect.isawaitable(result):
+                await result
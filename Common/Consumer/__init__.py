@@ -0,0 +1,2 @@
+from .EventDispatcher import EventDispatcher
+from .EventConsumer import EventConsumer
@@ -1,20 +1,158 @@
-from typing import TypeVar, Generic, Type, Optional
+from __future__ import annotations
+from typing import TypeVar, Type, Optional, Union, Dict, ClassVar, List, Sequence, Iterable
+from ulid import ULID, from_int as ulid_from_int
 
-T = TypeVar('T')
+from Common.Domain.UlidCodec import UlidCodec
 
+T = TypeVar('T', bound='AggregateId')
 
-class AggregateId(Generic[T]):
-    def __init__(self, id_type: Type[T], aggregate_id: Optional[T] = None) -> None:
-        self._id_type = id_type
-        self._value: T = self._validate_aggregate_id(aggregate_id)
 
-    def _validate_aggregate_id(self, value: Optional[T]) -> T:
-        if value is not None and not isinstance(value, self._id_type):
-            raise ValueError(f"The value must be an instance of {self._id_type.__name__}")
-        return value if value is not None else self._id_type()
+class AggregateId:
+    # An id is an immutable value object holding the 128-bit integer form of a ULID. Because the timestamp is in the
+    # high 48 bits, ordering by that integer orders ids by creation time. Subclasses opt into interning, which makes
+    # every parse of the same id return one shared instance; that suits ids that are few but referenced constantly,
+    # such as candidates and competitions in ballot ratings. Ids come from clients, so the table is dropped whenever it
+    # reaches intern_size entries; ids compare by value, so an id parsed before that still equals one parsed after
+    __slots__ = ("_value",)
+
+    label: ClassVar[str] = "Aggregate Id"
+    interned: ClassVar[bool] = False
+    intern_size: ClassVar[int] = 65536
+    _intern_table: ClassVar[Dict[int, AggregateId]] = {}
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._intern_table = {}
+
+    def __init__(self, aggregate_id: Optional[Union[ULID, int]] = None) -> None:
+        if aggregate_id is None:
+            value = UlidCodec.generate()
+        elif isinstance(aggregate_id, int):
+            if not 0 <= aggregate_id < 1 << 128:
+                raise ValueError(f"{self.label} must be a 128-bit unsigned integer")
+            value = aggregate_id
+        elif isinstance(aggregate_id, ULID):
+            value = aggregate_id.int
+        else:
+            raise ValueError(f"The value must be an instance of {ULID.__name__}")
+        object.__setattr__(self, "_value", value)
+
+    @classmethod
+    def _of(cls: Type[T], value: int) -> T:
+        if cls.interned:
+            aggregate_id = cls._intern_table.get(value)
+            if aggregate_id is None:
+                if len(cls._intern_table) >= cls.intern_size:
+                    cls._intern_table.clear()
+                aggregate_id = cls._intern_table[value] = cls(value)
+            return aggregate_id
+        return cls(value)
+
+    @classmethod
+    def empty(cls: Type[T]) -> T:
+        return cls._of(0)
+
+    @classmethod
+    def generate(cls: Type[T]) -> T:
+        return cls(UlidCodec.generate())
+
+    @classmethod
+    def from_ulid(cls: Type[T], value: ULID) -> T:
+        return cls._of(value.int)
+
+    @classmethod
+    def from_int(cls: Type[T], value: int) -> T:
+        if not 0 <= value < 1 << 128:
+            raise ValueError(f"{cls.label} must be a 128-bit unsigned integer")
+        return cls._of(value)
+
+    @classmethod
+    def from_bytes(cls: Type[T], value: bytes) -> T:
+        if len(value) != 16:
+            raise ValueError(f"{cls.label} must be 16 bytes")
+        return cls._of(int.from_bytes(value, "big"))
+
+    @classmethod
+    def from_string(cls: Type[T], value: str) -> T:
+        try:
+            return cls._of(UlidCodec.decode(value))
+        except (ValueError, TypeError, AttributeError):
+            raise ValueError(f"{cls.label} must be a valid ULID")
+
+    @classmethod
+    def parse_many(cls: Type[T], values: Sequence[str]) -> List[T]:
+        try:
+            decoded = UlidCodec.decode_many(values)
+        except (ValueError, TypeError):
+            raise ValueError(f"Every {cls.label} must be a valid ULID")
+        if cls.interned:
+            return [cls._of(value) for value in decoded]
+        return [cls(value) for value in decoded]
+
+    @staticmethod
+    def encode_many(ids: Iterable[AggregateId]) -> List[str]:
+        return UlidCodec.encode_many([aggregate_id._value for aggregate_id in ids])
+
+    @classmethod
+    def clear_intern_table(cls) -> None:
+        cls._intern_table.clear()
+
+    @property
+    def ulid(self) -> ULID:
+        return ulid_from_int(self._value)
+
+    @property
+    def bytes(self) -> bytes:
+        return self._value.to_bytes(16, "big")
+
+    @property
+    def timestamp(self) -> int:
+        # Milliseconds since the Unix epoch
+        return self._value >> 80
+
+    def __int__(self) -> int:
+        return self._value
 
     def __str__(self) -> str:
-        return str(self._value)
+        return UlidCodec.encode(self._value)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}('{self}')"
+
+    def __setattr__(self, name, value) -> None:
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+    def __delattr__(self, name) -> None:
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+    def __reduce__(self):
+        return self.__class__.from_int, (self._value,)
 
     def __eq__(self, other: object) -> bool:
-        return isinstance(other, self.__class__) and self._value == other._value
+        return other.__class__ is self.__class__ and self._value == other._value
+
+    def __ne__(self, other: object) -> bool:
+        return not self.__eq__(other)
+
+    def __hash__(self) -> int:
+        return hash(self._value)
+
+    def __lt__(self, other: AggregateId) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._value < other._value
+
+    def __le__(self, other: AggregateId) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._value <= other._value
+
+    def __gt__(self, other: AggregateId) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._value > other._value
+
+    def __ge__(self, other: AggregateId) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._value >= other._value
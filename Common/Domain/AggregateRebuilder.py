@@ -0,0 +1,93 @@
+import asyncio
+from collections import OrderedDict
+from typing import TypeVar, Generic, Callable, Iterable, AsyncIterable, Union, Any, Optional, Set, Type
+
+from Common.Domain.AggregateRoot import AggregateRoot
+from Common.Event import Event, EventCodec
+from Common.Store import SnapshotStore, Snapshot, InMemorySnapshotStore
+
+A = TypeVar("A", bound=AggregateRoot)
+
+
+class AggregateRebuilder(Generic[A]):
+    # Rebuilds every aggregate of one type from a log of all events, such as SegmentEventStore.log() or a station, and
+    # leaves the current state of each in the snapshot store. At most window aggregates are live at once: the least
+    # recently used one is spilled as a snapshot when the window is full, and restored from it if more of its events
+    # follow. Spilled snapshots go to a scratch store of the rebuild's own, in memory unless scratch is given, since
+    # the snapshot store may already hold later snapshots of the same aggregates and keep those instead. Only each
+    # aggregate's final state is saved to the snapshot store, once the whole log has been read.
+    #
+    # With a codec, the log's items are encoded events, as AggregateRoot.load_stream takes them. Items that carry
+    # headers are only decoded when the headers name one of event_types
+    def __init__(self, factory: Callable[[str], A], event_types: Iterable[Type[Event]], snapshot_store: SnapshotStore,
+                 window: int = 10000, codec: Optional[EventCodec] = None, chunk_size: int = 256,
+                 scratch: Optional[SnapshotStore] = None) -> None:
+        if window < 1:
+            raise ValueError("The window must hold at least one aggregate")
+        self._factory: Callable[[str], A] = factory
+        self._event_types: Set[Type[Event]] = set(event_types)
+        self._snapshot_store: SnapshotStore = snapshot_store
+        self._scratch: SnapshotStore = scratch if scratch is not None else InMemorySnapshotStore()
+        self._window: int = window
+        self._codec: Optional[EventCodec] = codec
+        self._chunk_size: int = chunk_size
+        self._live: OrderedDict[str, A] = OrderedDict()
+        self._spilled: Set[str] = set()
+        self._events: int = 0
+
+    @property
+    def events(self) -> int:
+        return self._events
+
+    def _wanted(self, item: Any) -> Optional[Event]:
+        if self._codec is None:
+            return item if type(item) in self._event_types else None
+        if isinstance(item, tuple) and self._codec.event_type(item[1]) not in self._event_types:
+            return None
+        event = AggregateRoot.decode(item, self._codec)
+        return event if type(event) in self._event_types else None
+
+    async def _spill(self, aggregate_id: str, aggregate: A) -> None:
+        await self._scratch.save(Snapshot(aggregate_id, aggregate.version, aggregate.snapshot()))
+        self._spilled.add(aggregate_id)
+
+    async def _aggregate(self, aggregate_id: str) -> A:
+        aggregate = self._live.get(aggregate_id)
+        if aggregate is not None:
+            self._live.move_to_end(aggregate_id)
+            return aggregate
+        aggregate = self._factory(aggregate_id)
+        if aggregate_id in self._spilled:
+            snapshot = await self._scratch.get(aggregate_id)
+            aggregate.restore(snapshot.state)
+            aggregate.version = snapshot.version
+            self._spilled.discard(aggregate_id)
+        if len(self._live) >= self._window:
+            await self._spill(*self._live.popitem(last=False))
+        self._live[aggregate_id] = aggregate
+        return aggregate
+
+    async def _apply(self, item: Any) -> None:
+        event = self._wanted(item)
+        if event is not None:
+            aggregate = await self._aggregate(event.aggregate_id)
+            aggregate.load((event,))
+            self._events += 1
+
+    async def run(self, history: Union[Iterable[Any], AsyncIterable[Any]]) -> int:
+        # Returns the number of aggregates rebuilt
+        if isinstance(history, AsyncIterable):
+            async for item in history:
+                await self._apply(item)
+        else:
+            for count, item in enumerate(history, 1):
+                await self._apply(item)
+                if count % self._chunk_size == 0:
+                    await asyncio.sleep(0)
+        rebuilt = len(self._live) + len(self._spilled)
+        while len(self._live) > 0:
+            aggregate_id, aggregate = self._live.popitem(last=False)
+            await self._snapshot_store.save(Snapshot(aggregate_id, aggregate.version, aggregate.snapshot()))
+        for aggregate_id in self._spilled:
+            await self._snapshot_store.save(await self._scratch.get(aggregate_id))
+        return rebuilt
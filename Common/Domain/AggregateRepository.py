@@ -0,0 +1,63 @@
+from typing import TypeVar, Generic, Callable, Optional, List
+
+from Common.Domain.AggregateRoot import AggregateRoot
+from Common.Event import Event
+from Common.Metrics import MetricsRegistry
+from Common.Store import EventStore, SnapshotStore, Snapshot
+
+A = TypeVar("A", bound=AggregateRoot)
+
+
+class AggregateRepository(Generic[A]):
+    def __init__(self, factory: Callable[[str], A], event_store: EventStore,
+                 snapshot_store: Optional[SnapshotStore] = None, snapshot_interval: int = 100,
+                 metrics: Optional[MetricsRegistry] = None) -> None:
+        if snapshot_interval < 1:
+            raise ValueError("Snapshot interval must be at least 1")
+        self._factory: Callable[[str], A] = factory
+        self._event_store: EventStore = event_store
+        self._snapshot_store: Optional[SnapshotStore] = snapshot_store
+        self._snapshot_interval: int = snapshot_interval
+        self._metrics: Optional[MetricsRegistry] = metrics
+
+    def create(self, aggregate_id: str) -> A:
+        return self._factory(aggregate_id)
+
+    async def load(self, aggregate_id: str) -> A:
+        aggregate = self._factory(aggregate_id)
+        if self._snapshot_store is not None:
+            snapshot = await self._snapshot_store.get(aggregate_id)
+            if snapshot is not None:
+                aggregate.restore(snapshot.state)
+                aggregate.version = snapshot.version
+        history = self._event_store.stream(aggregate_id, aggregate.version + 1)
+        metrics = self._metrics
+        if metrics is None or not metrics.sampled():
+            await aggregate.load_stream(history)
+            return aggregate
+        started = metrics.clock()
+        replayed = await aggregate.load_stream(history)
+        labels = (type(aggregate).__name__,)
+        metrics.aggregate_load.observe(labels, metrics.clock() - started)
+        metrics.aggregate_replay.observe(labels, replayed)
+        return aggregate
+
+    def aggregates(self) -> List[str]:
+        return self._event_store.aggregates()
+
+    async def history(self, aggregate_id: str) -> List[Event]:
+        return await self._event_store.read(aggregate_id)
+
+    async def save(self, aggregate: A) -> None:
+        changes = aggregate.changes
+        if len(changes) == 0:
+            return
+        aggregate_id = str(aggregate.id)
+        expected_version = aggregate.version - len(changes)
+        await self._event_store.append(aggregate_id, changes, expected_version)
+        aggregate.clear_changes()
+        # A snapshot is taken whenever the save crosses a multiple of the interval, so a batch of changes larger
+        # than the interval still produces only one
+        if self._snapshot_store is not None and \
+                (aggregate.version + 1) // self._snapshot_interval > (expected_version + 1) // self._snapshot_interval:
+            await self._snapshot_store.save(Snapshot(aggregate_id, aggregate.version, aggregate.snapshot()))
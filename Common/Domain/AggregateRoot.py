@@ -1,16 +1,42 @@
-from typing import TypeVar, Generic, Type, List
+import asyncio
+import itertools
+from typing import TypeVar, Generic, Type, List, Iterable, Dict, Any, Union, AsyncIterable, Optional, Callable, \
+    ClassVar
 from Common.Exception import AlreadyDeletedError
-from Common.Event import Event
+from Common.Event import Event, EventCodec
 
 T = TypeVar("T")
+H = TypeVar("H", bound=Callable[..., None])
 
 
 class AggregateRoot(Generic[T]):
+    # when() looks the handler up by the event's exact type in a table each subclass builds once, when it is defined,
+    # from its methods decorated with handles(). A subclass inherits its bases' handlers and may override them by name
+    _handlers: ClassVar[Dict[Type[Event], Callable[[Any, Event], None]]] = {}
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        names: Dict[Type[Event], str] = {}
+        for base in reversed(cls.__mro__):
+            for name, member in vars(base).items():
+                event_type = getattr(member, "_handles", None)
+                if event_type is not None:
+                    names[event_type] = name
+        cls._handlers = {event_type: getattr(cls, name) for event_type, name in names.items()}
+
+    @staticmethod
+    def handles(event_type: Type[Event]) -> Callable[[H], H]:
+        def register(handler: H) -> H:
+            handler._handles = event_type
+            return handler
+        return register
+
     def __init__(self, aggregate_type: Type[T], aggregate_id: T):
         self._aggregate_type: Type[T] = aggregate_type
         self._aggregate_id: T = aggregate_id
         self._version: int = -1
         self._deleted: bool = False
+        self._changes: List[Event] = []
 
     @property
     def id(self) -> T:
@@ -28,8 +54,18 @@ class AggregateRoot(Generic[T]):
     def version(self, version: int) -> None:
         self._version = version
 
+    @property
+    def changes(self) -> List[Event]:
+        return self._changes
+
+    def clear_changes(self) -> None:
+        self._changes = []
+
     def when(self, event: Event) -> None:
-        pass
+        handler = self._handlers.get(type(event))
+        if handler is None:
+            raise TypeError(f"Unexpected event type: {type(event)}")
+        handler(self, event)
 
     def ensure_valid_state(self):
         pass
@@ -40,12 +76,52 @@ class AggregateRoot(Generic[T]):
         self.when(event)
         self.ensure_valid_state()
         self.version += 1
+        self._changes.append(event)
 
-    def load(self, history: List[Event]) -> None:
+    def load(self, history: Iterable[Event]) -> None:
         for event in history:
             self.when(event)
             self.version += 1
 
+    @staticmethod
+    def decode(item: Any, codec: Optional[EventCodec]) -> Event:
+        # An item of history is an event, or with a codec an encoded event: the message alone or a (message, headers)
+        # pair
+        if codec is None:
+            return item
+        if isinstance(item, tuple):
+            return codec.decode(*item)
+        return codec.decode(item)
+
+    async def load_stream(self, history: Union[Iterable[Any], AsyncIterable[Any]], codec: Optional[EventCodec] = None,
+                          chunk_size: int = 256) -> int:
+        # Applies history as it is iterated rather than from a list, decoding each item only when its turn comes, and
+        # returns the number of events applied. A synchronous history is taken chunk_size items at a time, with the
+        # event loop let in between chunks, so a long replay doesn't hold up other requests
+        applied = 0
+        if isinstance(history, AsyncIterable):
+            async for item in history:
+                self.when(AggregateRoot.decode(item, codec))
+                self.version += 1
+                applied += 1
+            return applied
+        iterator = iter(history)
+        while True:
+            chunk = list(itertools.islice(iterator, chunk_size))
+            if len(chunk) == 0:
+                return applied
+            self.load(AggregateRoot.decode(item, codec) for item in chunk)
+            applied += len(chunk)
+            await asyncio.sleep(0)
+
+    # snapshot() and restore() let an AggregateRepository skip replaying history up to the snapshot's version.
+    # Subclasses extend both with their own state, which must be JSON-serializable
+    def snapshot(self) -> Dict[str, Any]:
+        return {"deleted": self._deleted}
+
+    def restore(self, state: Dict[str, Any]) -> None:
+        self._deleted = state["deleted"]
+
     def delete(self):
         if self.deleted:
             raise AlreadyDeletedError("%s-%s is already deleted" % (self._aggregate_type, self._aggregate_id))
@@ -0,0 +1,137 @@
+import asyncio
+from typing import TypeVar, Generic, Dict, Optional, List, Callable, Awaitable
+
+from Common.Cache import LruCache
+from Common.Domain.AggregateRepository import AggregateRepository
+from Common.Domain.AggregateRoot import AggregateRoot
+from Common.Event import Event, EventBus, EventCodec
+from Common.Transport import TransportProducer
+
+A = TypeVar("A", bound=AggregateRoot)
+T = TypeVar("T")
+
+
+class CommandHandler(Generic[A]):
+    # Applies an incoming event to its aggregate before publishing it, so events that break a domain invariant are
+    # rejected here instead of reaching the broker. Live aggregates are kept in an LRU cache; one that fails to apply or
+    # save is evicted, since apply() may have changed it before raising, and it is reloaded next time.
+    #
+    # An event is only produced once it has been saved, so one that loses the optimistic concurrency check is never
+    # published. A saved event whose produce fails stays in the aggregate's outbox and is produced before the
+    # aggregate's next command; a retry of that same event then only completes the produce.
+    #
+    # version() and copy() let a caller check events against an aggregate before sending them here, as a ballot stream
+    # does with the ratings it holds back: the copy is of the state this handler last saved, and changing it leaves
+    # the handler's own untouched.
+    #
+    # export() and adopt() move an aggregate between processes that each own a share of the aggregates: the old owner
+    # hands over the history it has saved, and the new owner appends whatever part of it its own store is missing
+    def __init__(self, repository: AggregateRepository[A], producer: TransportProducer,
+                 cache: LruCache[str, A], codec: EventCodec, bus: Optional[EventBus] = None) -> None:
+        self._repository: AggregateRepository[A] = repository
+        self._producer: TransportProducer = producer
+        self._cache: LruCache[str, A] = cache
+        self._codec: EventCodec = codec
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._waiting: Dict[str, int] = {}
+        self._outbox: Dict[str, List[Event]] = {}
+        # Projections in the same process see each event on the bus once it has been accepted
+        self._bus: Optional[EventBus] = bus
+
+    async def _load(self, aggregate_id: str) -> A:
+        aggregate = self._cache.get(aggregate_id)
+        if aggregate is None:
+            aggregate = await self._repository.load(aggregate_id)
+        return aggregate
+
+    async def _flush(self, aggregate_id: str) -> None:
+        pending = self._outbox.get(aggregate_id, [])
+        while len(pending) > 0:
+            event = pending[0]
+            await self._producer.produce(self._codec.encode(event), headers=self._codec.headers(type(event)))
+            pending.pop(0)
+            if self._bus is not None:
+                await self._bus.publish(event)
+        self._outbox.pop(aggregate_id, None)
+
+    async def _handle(self, aggregate_id: str, event: Event) -> A:
+        pending = self._outbox.get(aggregate_id)
+        if pending is not None:
+            retried = event in pending
+            await self._flush(aggregate_id)
+            if retried:
+                return await self._load(aggregate_id)
+        aggregate = await self._load(aggregate_id)
+        try:
+            aggregate.apply(event)
+            # The store rejects the append if another writer got there first, which is the optimistic concurrency
+            # check on version
+            await self._repository.save(aggregate)
+        except Exception:
+            self._cache.evict(aggregate_id)
+            raise
+        self._cache.put(aggregate_id, aggregate)
+        self._outbox[aggregate_id] = [event]
+        await self._flush(aggregate_id)
+        return aggregate
+
+    async def _cached(self, aggregate_id: str) -> A:
+        aggregate = await self._load(aggregate_id)
+        self._cache.put(aggregate_id, aggregate)
+        return aggregate
+
+    async def _copy(self, aggregate_id: str) -> A:
+        aggregate = await self._cached(aggregate_id)
+        copy = self._repository.create(aggregate_id)
+        copy.restore(aggregate.snapshot())
+        copy.version = aggregate.version
+        return copy
+
+    async def _version(self, aggregate_id: str) -> int:
+        return (await self._cached(aggregate_id)).version
+
+    async def _export(self, aggregate_id: str) -> List[Event]:
+        # Once handed over, the aggregate's next commands go to the new owner, so its saved events are produced now
+        # and it is no longer cached here
+        await self._flush(aggregate_id)
+        self._cache.evict(aggregate_id)
+        return await self._repository.history(aggregate_id)
+
+    async def _adopt(self, aggregate_id: str, history: List[Event]) -> None:
+        # This process may still hold an older part of the history from when it last owned the aggregate
+        self._cache.evict(aggregate_id)
+        aggregate = await self._repository.load(aggregate_id)
+        for event in history[aggregate.version + 1:]:
+            aggregate.apply(event)
+        await self._repository.save(aggregate)
+
+    async def _serialized(self, aggregate_id: str, action: Callable[[], Awaitable[T]]) -> T:
+        # Commands for the same aggregate are serialized; commands for different aggregates run concurrently
+        lock = self._locks.setdefault(aggregate_id, asyncio.Lock())
+        self._waiting[aggregate_id] = self._waiting.get(aggregate_id, 0) + 1
+        try:
+            async with lock:
+                return await action()
+        finally:
+            self._waiting[aggregate_id] -= 1
+            if self._waiting[aggregate_id] == 0:
+                del self._waiting[aggregate_id]
+                del self._locks[aggregate_id]
+
+    async def handle(self, event: Event) -> A:
+        return await self._serialized(event.aggregate_id, lambda: self._handle(event.aggregate_id, event))
+
+    def aggregates(self) -> List[str]:
+        return self._repository.aggregates()
+
+    async def version(self, aggregate_id: str) -> int:
+        return await self._serialized(aggregate_id, lambda: self._version(aggregate_id))
+
+    async def copy(self, aggregate_id: str) -> A:
+        return await self._serialized(aggregate_id, lambda: self._copy(aggregate_id))
+
+    async def export(self, aggregate_id: str) -> List[Event]:
+        return await self._serialized(aggregate_id, lambda: self._export(aggregate_id))
+
+    async def adopt(self, aggregate_id: str, history: List[Event]) -> None:
+        await self._serialized(aggregate_id, lambda: self._adopt(aggregate_id, history))
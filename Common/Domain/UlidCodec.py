@@ -0,0 +1,106 @@
+import os
+import re
+from itertools import product
+import threading
+import time
+from typing import List, Sequence, Iterable, Optional, Tuple
+
+
+class UlidCodec:
+    # Crockford base32 encoding and decoding of ULIDs as 128-bit integers.
+    #
+    # Decoding translates the Crockford alphabet to the digits int() uses for base 32, after which int() does the work
+    # in C. A batch is decoded as one string: every ULID is prefixed with six zeros, which pads its 130 bits to 160, so
+    # the single integer that results splits on 20-byte boundaries. Encoding looks up 10 bits at a time in a table of
+    # character pairs.
+    ALPHABET: str = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+    _DIGITS: str = "0123456789ABCDEFGHIJKLMNOPQRSTUV"
+    # Lower case is accepted, and I, L and O are read as 1, 1 and 0, as ulid-py and the Crockford spec do
+    _NORMALIZE = str.maketrans("abcdefghjkmnpqrstvwxyziloILO", "ABCDEFGHJKMNPQRSTVWXYZ110110")
+    _TO_DIGITS = str.maketrans(ALPHABET, _DIGITS)
+    _VALID = re.compile(r"[0-7][0-9A-HJKMNP-TV-Z]{25}")
+    _VALID_BATCH = re.compile(r"(?:000000[0-7][0-9A-HJKMNP-TV-Z]{25})*")
+    _PAIRS: Tuple[str, ...] = tuple(map("".join, product(ALPHABET, repeat=2)))
+    _SHIFTS: Tuple[int, ...] = tuple(range(120, -1, -10))
+    _RANDOMNESS: int = (1 << 80) - 1
+
+    _lock: threading.Lock = threading.Lock()
+    _last: int = 0
+
+    @staticmethod
+    def decode(value: str) -> int:
+        normalized = value.translate(UlidCodec._NORMALIZE)
+        if UlidCodec._VALID.fullmatch(normalized) is None:
+            raise ValueError(f"Invalid ULID: {value!r}")
+        return int(normalized.translate(UlidCodec._TO_DIGITS), 32)
+
+    @staticmethod
+    def canonical(value: str) -> Optional[int]:
+        # The integer of a ULID already in canonical form (26 upper-case characters, none of I, L, O or U), else None.
+        # Only those strings encode back to exactly themselves
+        if len(value) != 26 or UlidCodec._VALID.fullmatch(value) is None:
+            return None
+        return int(value.translate(UlidCodec._TO_DIGITS), 32)
+
+    @staticmethod
+    def decode_many(values: Sequence[str]) -> List[int]:
+        if len(values) == 0:
+            return []
+        if set(map(len, values)) != {26}:
+            raise ValueError("Every ULID must be 26 characters")
+        joined = ("000000" + "000000".join(values)).translate(UlidCodec._NORMALIZE)
+        if UlidCodec._VALID_BATCH.fullmatch(joined) is None:
+            raise ValueError("Batch contains an invalid ULID")
+        buffer = memoryview(int(joined.translate(UlidCodec._TO_DIGITS), 32).to_bytes(20 * len(values), "big"))
+        return [int.from_bytes(buffer[offset:offset + 20], "big") for offset in range(0, len(buffer), 20)]
+
+    @staticmethod
+    def decode_buffer(values: Sequence[str]) -> bytes:
+        # 16 big-endian bytes per ULID, the layout of ULID.bytes, ready for array or numpy.frombuffer
+        return UlidCodec.pack(UlidCodec.decode_many(values))
+
+    @staticmethod
+    def encode(value: int) -> str:
+        pairs = UlidCodec._PAIRS
+        return "".join([pairs[(value >> shift) & 0x3FF] for shift in UlidCodec._SHIFTS])
+
+    @staticmethod
+    def encode_many(values: Iterable[int]) -> List[str]:
+        pairs = UlidCodec._PAIRS
+        shifts = UlidCodec._SHIFTS
+        return ["".join([pairs[(value >> shift) & 0x3FF] for shift in shifts]) for value in values]
+
+    @staticmethod
+    def pack(values: Iterable[int]) -> bytes:
+        return b"".join([value.to_bytes(16, "big") for value in values])
+
+    @staticmethod
+    def unpack(buffer: bytes) -> List[int]:
+        if len(buffer) % 16 != 0:
+            raise ValueError("Buffer length must be a multiple of 16")
+        view = memoryview(buffer)
+        return [int.from_bytes(view[offset:offset + 16], "big") for offset in range(0, len(view), 16)]
+
+    @staticmethod
+    def generate_many(count: int, timestamp: Optional[int] = None) -> List[int]:
+        # ULIDs are monotonic within the process: inside one millisecond the randomness of each new ULID is the
+        # previous one's plus one, and a clock that goes backwards keeps using the last timestamp. The first random
+        # value of a millisecond has its top bit clear, so 2**79 ULIDs fit in one millisecond before it overflows
+        if count < 0:
+            raise ValueError("Count must not be negative")
+        timestamp = time.time_ns() // 1_000_000 if timestamp is None else timestamp
+        with UlidCodec._lock:
+            last = UlidCodec._last
+            if timestamp > last >> 80:
+                first = (timestamp << 80) | (int.from_bytes(os.urandom(10), "big") >> 1)
+            else:
+                first = last + 1
+            if (first & UlidCodec._RANDOMNESS) + count - 1 > UlidCodec._RANDOMNESS:
+                raise OverflowError("Too many ULIDs generated in one millisecond")
+            if count > 0:
+                UlidCodec._last = first + count - 1
+        return list(range(first, first + count))
+
+    @staticmethod
+    def generate() -> int:
+        return UlidCodec.generate_many(1)[0]
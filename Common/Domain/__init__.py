@@ -1,2 +1,6 @@
+from .UlidCodec import UlidCodec
 from .AggregateId import AggregateId
 from .AggregateRoot import AggregateRoot
+from .AggregateRepository import AggregateRepository
+from .AggregateRebuilder import AggregateRebuilder
+from .CommandHandler import CommandHandler
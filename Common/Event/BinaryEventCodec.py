@@ -0,0 +1,199 @@
+import struct
+from typing import Union, Optional, Mapping, Any, Tuple, Dict
+
+from Common.Domain.UlidCodec import UlidCodec
+from Common.Event.Event import Event
+from Common.Event.EventCodec import EventCodec
+from Common.Event.EventRegistry import EventRegistry
+
+
+class BinaryEventCodec(EventCodec):
+    # A compact binary form that carries its own type, so it decodes without headers.
+    #
+    # A message is the event's tag, its schema version and its field count, each as a varint, followed by the values of
+    # its fields in the registry's order: those Event declares, then the type's own. Field names are never sent. Every
+    # value starts with a marker byte: strings that are canonical ULIDs are sent as their 16 raw bytes, other strings
+    # and bytes as a varint length and the bytes, integers as zigzag varints and floats as 8-byte doubles. Trailing
+    # fields that are None and default to None are left out, so an event that does not use a field appended later
+    # encodes as it did before.
+    #
+    # Converting a ULID between text and bytes is most of the work, and the same few election, competition and
+    # candidate ids appear in nearly every message, so both directions are memoized in tables that are dropped whenever
+    # they reach memo_size entries
+    NONE: int = 0
+    FALSE: int = 1
+    TRUE: int = 2
+    INT: int = 3
+    FLOAT: int = 4
+    STR: int = 5
+    ULID: int = 6
+    BYTES: int = 7
+    _DOUBLE = struct.Struct(">d")
+
+    def __init__(self, registry: EventRegistry, memo_size: int = 65536, trusted: bool = False) -> None:
+        super().__init__(registry, trusted)
+        self._memo_size: int = memo_size
+        self._ulid_bytes: Dict[str, bytes] = {}
+        self._ulid_strings: Dict[bytes, str] = {}
+        self._required: Dict[type, int] = {}
+
+    @property
+    def content_type(self) -> str:
+        return "application/vnd.photovote.event"
+
+    @staticmethod
+    def _varint(value: int, out: bytearray) -> None:
+        while value > 0x7F:
+            out.append((value & 0x7F) | 0x80)
+            value >>= 7
+        out.append(value)
+
+    def _ulid(self, value: str) -> Optional[bytes]:
+        data = self._ulid_bytes.get(value)
+        if data is None:
+            ulid = UlidCodec.canonical(value)
+            if ulid is None:
+                return None
+            if len(self._ulid_bytes) >= self._memo_size:
+                self._ulid_bytes.clear()
+            data = self._ulid_bytes[value] = ulid.to_bytes(16, "big")
+        return data
+
+    def _value(self, value: Any, out: bytearray) -> None:
+        if value is None:
+            out.append(BinaryEventCodec.NONE)
+        elif value.__class__ is str:
+            ulid = self._ulid(value) if len(value) == 26 else None
+            if ulid is not None:
+                out.append(BinaryEventCodec.ULID)
+                out += ulid
+            else:
+                data = value.encode()
+                out.append(BinaryEventCodec.STR)
+                BinaryEventCodec._varint(len(data), out)
+                out += data
+        elif value is True or value is False:
+            out.append(BinaryEventCodec.TRUE if value else BinaryEventCodec.FALSE)
+        elif isinstance(value, int):
+            out.append(BinaryEventCodec.INT)
+            BinaryEventCodec._varint(value << 1 if value >= 0 else (-value << 1) - 1, out)
+        elif isinstance(value, float):
+            out.append(BinaryEventCodec.FLOAT)
+            out += BinaryEventCodec._DOUBLE.pack(value)
+        elif isinstance(value, (bytes, bytearray)):
+            out.append(BinaryEventCodec.BYTES)
+            BinaryEventCodec._varint(len(value), out)
+            out += value
+        else:
+            raise TypeError(f"Cannot encode a value of type {type(value).__name__}")
+
+    def _required_count(self, event_type: type) -> int:
+        # The number of leading fields that are always sent: up to the last one that does not default to None
+        count = self._required.get(event_type)
+        if count is None:
+            fields = self._registry.fields(event_type)
+            model_fields = event_type.model_fields
+            count = len(fields)
+            while count > 1 and not model_fields[fields[count - 1]].is_required() and \
+                    model_fields[fields[count - 1]].default is None:
+                count -= 1
+            self._required[event_type] = count
+        return count
+
+    def encode(self, event: Event) -> bytes:
+        event_type = type(event)
+        registry = self._registry
+        fields = registry.fields(event_type)
+        values = event.__dict__
+        count = len(fields)
+        required = self._required_count(event_type)
+        while count > required and values[fields[count - 1]] is None:
+            count -= 1
+        out = bytearray()
+        BinaryEventCodec._varint(registry.tag(event_type), out)
+        BinaryEventCodec._varint(registry.version(event_type), out)
+        BinaryEventCodec._varint(count, out)
+        for index in range(count):
+            self._value(values[fields[index]], out)
+        return bytes(out)
+
+    @staticmethod
+    def _read_varint(data: bytes, offset: int) -> Tuple[int, int]:
+        value = 0
+        shift = 0
+        while True:
+            byte = data[offset]
+            offset += 1
+            value |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return value, offset
+            shift += 7
+
+    def _ulid_string(self, data: bytes) -> str:
+        value = self._ulid_strings.get(data)
+        if value is None:
+            if len(self._ulid_strings) >= self._memo_size:
+                self._ulid_strings.clear()
+            value = self._ulid_strings[data] = UlidCodec.encode(int.from_bytes(data, "big"))
+        return value
+
+    def _read_value(self, data: bytes, offset: int) -> Tuple[Any, int]:
+        marker = data[offset]
+        offset += 1
+        if marker == BinaryEventCodec.ULID:
+            return self._ulid_string(bytes(data[offset:offset + 16])), offset + 16
+        if marker == BinaryEventCodec.STR:
+            length, offset = BinaryEventCodec._read_varint(data, offset)
+            return data[offset:offset + length].decode(), offset + length
+        if marker == BinaryEventCodec.NONE:
+            return None, offset
+        if marker == BinaryEventCodec.INT:
+            value, offset = BinaryEventCodec._read_varint(data, offset)
+            return (value >> 1) ^ -(value & 1), offset
+        if marker == BinaryEventCodec.TRUE or marker == BinaryEventCodec.FALSE:
+            return marker == BinaryEventCodec.TRUE, offset
+        if marker == BinaryEventCodec.FLOAT:
+            return BinaryEventCodec._DOUBLE.unpack_from(data, offset)[0], offset + 8
+        if marker == BinaryEventCodec.BYTES:
+            length, offset = BinaryEventCodec._read_varint(data, offset)
+            return bytes(data[offset:offset + length]), offset + length
+        raise ValueError(f"Unknown value marker: {marker}")
+
+    def aggregate_id(self, data: Union[str, bytes], headers: Optional[Mapping[str, str]] = None) -> str:
+        # aggregate_id is declared by Event, so it is always the first field
+        try:
+            offset = 0
+            for _ in range(3):
+                _, offset = BinaryEventCodec._read_varint(data, offset)
+            aggregate_id, _ = self._read_value(data, offset)
+        except IndexError:
+            raise ValueError("Truncated event message")
+        if not isinstance(aggregate_id, str):
+            raise ValueError("The event's first field is not an aggregate id")
+        return aggregate_id
+
+    def decode(self, data: Union[str, bytes], headers: Optional[Mapping[str, str]] = None) -> Event:
+        if isinstance(data, str):
+            raise TypeError("Binary events must be bytes")
+        try:
+            tag, offset = BinaryEventCodec._read_varint(data, 0)
+            version, offset = BinaryEventCodec._read_varint(data, offset)
+            count, offset = BinaryEventCodec._read_varint(data, offset)
+            event_type = self._registry.type(tag)
+            if version > self._registry.version(event_type):
+                raise ValueError(f"{event_type.__name__} schema version {version} is newer than this reader's")
+            fields = self._registry.fields(event_type)
+            if count > len(fields):
+                raise ValueError(f"{event_type.__name__} has {len(fields)} fields, but the message has {count}")
+            # Only the fields the message holds; a trusted event fills in the defaults of the others, and an older
+            # message missing a field without one is validated, and rejected
+            values = {}
+            for field in fields[:count]:
+                values[field], offset = self._read_value(data, offset)
+        except IndexError:
+            raise ValueError("Truncated event message")
+        if offset != len(data):
+            raise ValueError("Unexpected bytes after the event")
+        if self._trusted:
+            return event_type.trusted(values)
+        return event_type.model_validate(values)
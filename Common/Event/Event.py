@@ -1,5 +1,55 @@
-from pydantic import BaseModel
+from typing import Optional, Dict, Any, Tuple, FrozenSet
+from pydantic import BaseModel, Field
+
+# Event.trusted() fills in BaseModel's slots through their descriptors, which is quicker than object.__setattr__, and
+# keeps each event type's layout here rather than on the class, where every lookup goes through the metaclass. A
+# pydantic that lays BaseModel out differently leaves them None, and trusted() validates instead
+try:
+    _set_dict = BaseModel.__dict__["__dict__"].__set__
+    _set_fields_set = BaseModel.__dict__["__pydantic_fields_set__"].__set__
+    _set_extra = BaseModel.__dict__["__pydantic_extra__"].__set__
+    _set_private = BaseModel.__dict__["__pydantic_private__"].__set__
+except (KeyError, AttributeError):
+    _set_dict = _set_fields_set = _set_extra = _set_private = None
+_new = object.__new__
+# For each event type, the names of its fields in the model's order and the defaults of those that may be left out
+_layouts: Dict[type, Tuple[Tuple[str, ...], FrozenSet[str], Dict[str, Any]]] = {}
 
 
 class Event(BaseModel):
     aggregate_id: str
+    # A ULID the client assigns once and sends again with every retry, so the API can recognise a repeat
+    event_id: Optional[str] = Field(default=None, max_length=26)
+
+    @classmethod
+    def _layout(cls) -> Tuple[Tuple[str, ...], FrozenSet[str], Dict[str, Any]]:
+        defaults = {name: field.default for name, field in cls.model_fields.items()
+                    if not field.is_required() and field.default_factory is None}
+        layout = _layouts[cls] = (tuple(cls.model_fields), frozenset(cls.model_fields), defaults)
+        return layout
+
+    @classmethod
+    def trusted(cls, values: Dict[str, Any]) -> "Event":
+        # Builds an event from values that were validated when the event was first accepted, such as those decoded
+        # from our own store or stations, without validating them again. values is taken over rather than copied.
+        # Values missing some fields that have defaults are completed with them, in the model's order; anything else,
+        # such as values missing a required field, is validated as usual
+        if _set_dict is None:
+            return cls.model_validate(values)
+        layout = _layouts.get(cls)
+        if layout is None:
+            layout = cls._layout()
+        order, names, defaults = layout
+        if len(values) == len(names) and names.issuperset(values):
+            fields_set = set(names)
+        else:
+            if not values.keys() <= names or not names - values.keys() <= defaults.keys():
+                return cls.model_validate(values)
+            fields_set = set(values)
+            values = {name: values[name] if name in values else defaults[name] for name in order}
+        event = _new(cls)
+        _set_dict(event, values)
+        _set_fields_set(event, fields_set)
+        _set_extra(event, None)
+        _set_private(event, None)
+        return event
@@ -0,0 +1,19 @@
+import inspect
+from typing import Callable, List, Union, Awaitable
+
+from Common.Event.Event import Event
+
+
+class EventBus:
+    # In-process fan-out of accepted events to projections. Subscribers may be plain functions or coroutines
+    def __init__(self) -> None:
+        self._subscribers: List[Callable[[Event], Union[None, Awaitable[None]]]] = []
+
+    def subscribe(self, subscriber: Callable[[Event], Union[None, Awaitable[None]]]) -> None:
+        self._subscribers.append(subscriber)
+
+    async def publish(self, event: Event) -> None:
+        for subscriber in self._subscribers:
+            result = subscriber(event)
+            if inspect.isawaitable(result):
+                await result
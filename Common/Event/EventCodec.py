@@ -0,0 +1,67 @@
+from abc import ABC, abstractmethod
+from typing import Dict, Type, Union, Optional, Mapping
+
+from Common.Event.Event import Event
+from Common.Event.EventRegistry import EventRegistry
+
+
+class EventCodec(ABC):
+    # Turns events into transport messages and back. Headers are built once per event type and shared by every message
+    # of that type, so they must not be mutated.
+    #
+    # A trusted codec builds decoded events with Event.trusted() instead of validating them. That suits decoding what
+    # the API itself validated and then produced or stored, as consumers, projections and replay do; messages from
+    # anywhere else need an untrusted one
+    def __init__(self, registry: EventRegistry, trusted: bool = False) -> None:
+        self._registry: EventRegistry = registry
+        self._trusted: bool = trusted
+        self._headers: Dict[Type[Event], Dict[str, str]] = {}
+
+    @property
+    def registry(self) -> EventRegistry:
+        return self._registry
+
+    @property
+    def trusted(self) -> bool:
+        return self._trusted
+
+    @property
+    @abstractmethod
+    def content_type(self) -> str:
+        pass
+
+    def headers(self, event_type: Type[Event]) -> Dict[str, str]:
+        headers = self._headers.get(event_type)
+        if headers is None:
+            registry = self._registry
+            headers = {"EventNamespace": registry.namespace, "EventType": event_type.__name__,
+                       "EventTag": str(registry.tag(event_type)), "SchemaVersion": str(registry.version(event_type)),
+                       "ContentType": self.content_type}
+            # PackageReference is only necessary if it differs from EventNamespace, which it is not
+            # in a project with no subpackages of the main event package
+            package_reference = event_type.__module__.rpartition(".")[0]
+            if package_reference != registry.namespace:
+                headers["PackageReference"] = package_reference
+            self._headers[event_type] = headers
+        return headers
+
+    def event_type(self, headers: Mapping[str, str]) -> Type[Event]:
+        tag = headers.get("EventTag")
+        if tag is not None:
+            return self._registry.type(int(tag))
+        event_type = headers.get("EventType")
+        if event_type is None:
+            raise ValueError("Message headers name no event type")
+        return self._registry.named(event_type)
+
+    @abstractmethod
+    def encode(self, event: Event) -> Union[str, bytes]:
+        pass
+
+    def aggregate_id(self, data: Union[str, bytes], headers: Optional[Mapping[str, str]] = None) -> str:
+        # The aggregate a message belongs to; codecs override this to find it without decoding the whole event
+        return self.decode(data, headers).aggregate_id
+
+    @abstractmethod
+    def decode(self, data: Union[str, bytes], headers: Optional[Mapping[str, str]] = None) -> Event:
+        pass
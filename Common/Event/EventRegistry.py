@@ -0,0 +1,74 @@
+from typing import Dict, Type, Tuple, Iterator
+
+from Common.Event.Event import Event
+
+
+class EventRegistry:
+    # Maps each event class of a namespace to a numeric type tag and a schema version. Tags are part of the wire format,
+    # so they are assigned explicitly and never reused. A schema version only moves forward, and only by appending
+    # fields: a reader of a later version can still decode an earlier payload, with the missing fields left at their
+    # defaults. Every layout starts with the fields Event itself declares, aggregate_id and then event_id, at the same
+    # positions for every type and version, followed by the type's own fields; so appending a field to a type never
+    # moves one that an earlier payload holds. Adding a field to Event moves every type's own fields, and so needs
+    # every payload rewritten
+    def __init__(self, namespace: str) -> None:
+        self._namespace: str = namespace
+        self._types: Dict[int, Type[Event]] = {}
+        self._tags: Dict[Type[Event], int] = {}
+        self._versions: Dict[Type[Event], int] = {}
+        self._names: Dict[str, Type[Event]] = {}
+        self._fields: Dict[Type[Event], Tuple[str, ...]] = {}
+
+    @property
+    def namespace(self) -> str:
+        return self._namespace
+
+    def register(self, event_type: Type[Event], tag: int, version: int = 1) -> Type[Event]:
+        if not 0 < tag < 1 << 16:
+            raise ValueError("Event tags must be between 1 and 65535")
+        if version < 1:
+            raise ValueError("Schema versions start at 1")
+        if tag in self._types and self._types[tag] is not event_type:
+            raise ValueError(f"Tag {tag} is already registered to {self._types[tag].__name__}")
+        if event_type.__name__ in self._names and self._names[event_type.__name__] is not event_type:
+            raise ValueError(f"An event named {event_type.__name__} is already registered")
+        self._types[tag] = event_type
+        self._tags[event_type] = tag
+        self._versions[event_type] = version
+        self._names[event_type.__name__] = event_type
+        common = tuple(Event.model_fields)
+        self._fields[event_type] = common + tuple(field for field in event_type.model_fields if field not in common)
+        return event_type
+
+    def tag(self, event_type: Type[Event]) -> int:
+        try:
+            return self._tags[event_type]
+        except KeyError:
+            raise ValueError(f"{event_type.__name__} is not registered in {self._namespace}")
+
+    def version(self, event_type: Type[Event]) -> int:
+        return self._versions[event_type]
+
+    def fields(self, event_type: Type[Event]) -> Tuple[str, ...]:
+        return self._fields[event_type]
+
+    def type(self, tag: int) -> Type[Event]:
+        try:
+            return self._types[tag]
+        except KeyError:
+            raise ValueError(f"Unknown event tag: {tag}")
+
+    def named(self, name: str) -> Type[Event]:
+        try:
+            return self._names[name]
+        except KeyError:
+            raise ValueError(f"Unknown event type: {name}")
+
+    def __contains__(self, event_type: object) -> bool:
+        return event_type in self._tags
+
+    def __iter__(self) -> Iterator[Type[Event]]:
+        return iter(self._tags)
+
+    def __len__(self) -> int:
+        return len(self._tags)
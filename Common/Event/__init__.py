@@ -1 +1,6 @@
 from .Event import Event
+from .EventBus import EventBus
+from .EventRegistry import EventRegistry
+from .EventCodec import EventCodec
+from .JsonEventCodec import JsonEventCodec
+from .BinaryEventCodec import BinaryEventCodec
@@ -1 +1,3 @@
 from .AlreadyDeletedError import AlreadyDeletedError
+from .ConcurrencyError import ConcurrencyError
+from .TransportBusyError import TransportBusyError
@@ -0,0 +1,42 @@
+import math
+
+
+class BloomFilter:
+    # A fixed-size Bloom filter over 64-bit key digests. Its bit positions come from the two halves of the digest by
+    # double hashing, so adding or testing a key hashes nothing again. Sized for capacity keys at error_rate; past
+    # capacity the rate of false positives grows, but a key that was added is always found
+    def __init__(self, capacity: int, error_rate: float = 0.001) -> None:
+        if capacity < 1 or not 0 < error_rate < 1:
+            raise ValueError("capacity must be positive and error_rate between 0 and 1")
+        self._size: int = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self._hashes: int = max(1, round(self._size / capacity * math.log(2)))
+        self._bits: bytearray = bytearray((self._size + 7) // 8)
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def hashes(self) -> int:
+        return self._hashes
+
+    def _positions(self, digest: int):
+        first = digest & 0xFFFFFFFF
+        second = (digest >> 32) | 1
+        size = self._size
+        return ((first + index * second) % size for index in range(self._hashes))
+
+    def add(self, digest: int) -> None:
+        bits = self._bits
+        for position in self._positions(digest):
+            bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, digest: int) -> bool:
+        bits = self._bits
+        for position in self._positions(digest):
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    def clear(self) -> None:
+        self._bits = bytearray(len(self._bits))
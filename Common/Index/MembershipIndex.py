@@ -0,0 +1,206 @@
+import fcntl
+import hashlib
+import os
+import sys
+from array import array
+from contextlib import contextmanager
+from typing import Set, Optional, Iterable, Iterator
+
+from Common.Index.BloomFilter import BloomFilter
+
+
+class MembershipIndex:
+    # A set of keys that answers "seen before?" in constant time. Keys are kept as 64-bit blake2b digests rather than
+    # strings, so a million of them take tens of megabytes; two distinct keys collide with odds of about 1 in 2^64.
+    #
+    # A key is first claimed, which makes it a member at once so a concurrent claim of the same key fails, and then
+    # committed once whatever it guards has succeeded, or released if it failed. The backing file is an append-only run
+    # of 8-byte digests that is replayed on open; a released claim is followed by the RELEASED marker and its digest
+    # again. Several processes may share the file. A claim takes an exclusive flock, reads what the others have
+    # appended since and writes its digest before letting go, so only one process can claim a key; the lock is held
+    # for a read and a write of a few bytes, not for the work the claim guards. A miss also re-reads the file, so a key
+    # claimed by one process is soon seen by the others. The claims of a process that dies before committing or
+    # releasing them stay until the index is rebuilt.
+    #
+    # The optional Bloom filter is consulted before the set. It fits in cache where a large set does not, but in
+    # CPython a set lookup is hardly slower than a probe, so it only pays for very large indexes
+    RECORD: int = 8
+    RELEASED: int = 0xFFFFFFFFFFFFFFFF
+
+    def __init__(self, path: Optional[str] = None, bloom: Optional[BloomFilter] = None) -> None:
+        self._path: Optional[str] = path
+        self._bloom: Optional[BloomFilter] = bloom
+        self._keys: Set[int] = set()
+        self._pending: Set[int] = set()
+        self._file: Optional[int] = None
+        self._position: int = 0
+        if path is not None:
+            self._file = os.open(path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+            self._refresh()
+
+    @property
+    def path(self) -> Optional[str]:
+        return self._path
+
+    @staticmethod
+    def digest(key: str) -> int:
+        digest = int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "little")
+        # No key may look like the marker
+        return digest if digest != MembershipIndex.RELEASED else digest - 1
+
+    def _add(self, digests: Iterable[int]) -> None:
+        self._keys.update(digests)
+        if self._bloom is not None:
+            for digest in digests:
+                self._bloom.add(digest)
+
+    def _refresh(self) -> bool:
+        # Reads the records appended since the last read, by this process or another; returns whether there were any
+        size = os.fstat(self._file).st_size
+        end = size - size % MembershipIndex.RECORD
+        if end <= self._position:
+            return False
+        records = array("Q")
+        records.frombytes(os.pread(self._file, end - self._position, self._position))
+        if sys.byteorder != "little":
+            records.byteswap()
+        if MembershipIndex.RELEASED not in records:
+            self._position = end
+            self._add(records)
+            return True
+        if records[-1] == MembershipIndex.RELEASED:
+            # The digest it marks is still being written
+            records.pop()
+            end -= MembershipIndex.RECORD
+        self._position = end
+        released = False
+        for digest in records:
+            if released:
+                self._keys.discard(digest)
+                released = False
+            elif digest == MembershipIndex.RELEASED:
+                released = True
+            else:
+                self._add((digest,))
+        return True
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        # Brings the keys up to date with the file and keeps other processes from appending until the block ends
+        fcntl.flock(self._file, fcntl.LOCK_EX)
+        try:
+            self._refresh()
+            yield
+        finally:
+            fcntl.flock(self._file, fcntl.LOCK_UN)
+
+    def _write(self, digests: Iterable[int]) -> None:
+        if self._file is not None:
+            records = array("Q", digests)
+            if sys.byteorder != "little":
+                records.byteswap()
+            self._position += os.write(self._file, records.tobytes())
+
+    def _has(self, digest: int) -> bool:
+        if (self._bloom is None or digest in self._bloom) and digest in self._keys:
+            return True
+        return self._file is not None and self._refresh() and digest in self._keys
+
+    def __contains__(self, key: str) -> bool:
+        return self._has(MembershipIndex.digest(key))
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _claim(self, digest: int) -> bool:
+        if digest in self._keys:
+            return False
+        self._add((digest,))
+        self._write((digest,))
+        return True
+
+    def claim(self, key: str) -> bool:
+        # Returns False if the key is already a member, claimed or committed, here or by another process
+        digest = MembershipIndex.digest(key)
+        if self._file is None:
+            claimed = self._claim(digest)
+        else:
+            # Decided under the lock, since another process may have released a key this one still holds
+            with self._locked():
+                claimed = self._claim(digest)
+        if claimed:
+            self._pending.add(digest)
+        return claimed
+
+    def commit(self, key: str) -> None:
+        # A claimed key was written when it was claimed
+        digest = MembershipIndex.digest(key)
+        if digest in self._pending:
+            self._pending.discard(digest)
+        elif self._file is None:
+            self._claim(digest)
+        else:
+            with self._locked():
+                self._claim(digest)
+
+    def release(self, key: str) -> None:
+        digest = MembershipIndex.digest(key)
+        if digest not in self._pending:
+            return
+        self._pending.discard(digest)
+        if self._file is None:
+            self._keys.discard(digest)
+            return
+        with self._locked():
+            self._keys.discard(digest)
+            self._write((MembershipIndex.RELEASED, digest))
+
+    def add(self, key: str) -> bool:
+        # Claims and commits in one step; returns False if the key was already a member
+        if not self.claim(key):
+            return False
+        self.commit(key)
+        return True
+
+    def _update(self, digests: Set[int]) -> int:
+        added = digests - self._keys
+        self._add(added)
+        self._write(added)
+        return len(added)
+
+    def update(self, keys: Iterable[str]) -> int:
+        # Adds every key that is not a member yet, under one lock, and keeps the rest; returns how many were added.
+        # Unlike rebuild() it may run while other processes share the file
+        digests = {MembershipIndex.digest(key) for key in keys}
+        if self._file is None:
+            return self._update(digests)
+        with self._locked():
+            return self._update(digests)
+
+    def clear(self) -> None:
+        self._keys.clear()
+        self._pending.clear()
+        if self._bloom is not None:
+            self._bloom.clear()
+        if self._file is not None:
+            os.ftruncate(self._file, 0)
+            self._position = 0
+
+    def rebuild(self, keys: Iterable[str]) -> None:
+        # Replaces the members, and the backing file, with keys, writing the file in one go. Other processes sharing the
+        # file must be stopped first, since they cannot tell it was rewritten
+        self.clear()
+        digests = {MembershipIndex.digest(key) for key in keys}
+        self._add(digests)
+        self._write(digests)
+        if self._file is not None:
+            self._position = os.fstat(self._file).st_size
+
+    def sync(self) -> None:
+        if self._file is not None:
+            os.fsync(self._file)
+
+    def close(self) -> None:
+        if self._file is not None:
+            os.close(self._file)
+            self._file = None
@@ -0,0 +1,2 @@
+from .BloomFilter import BloomFilter
+from .MembershipIndex import MembershipIndex
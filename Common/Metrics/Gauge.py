@@ -0,0 +1,32 @@
+from typing import Tuple, Dict, List
+
+Labels = Tuple[str, ...]
+
+
+class Gauge:
+    # A Prometheus gauge family, one value per combination of label values
+    def __init__(self, name: str, help_text: str, label_names: Labels) -> None:
+        self._name: str = name
+        self._help: str = help_text
+        self._label_names: Labels = label_names
+        self._values: Dict[Labels, float] = {}
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    def add(self, labels: Labels, delta: float) -> None:
+        self._values[labels] = self._values.get(labels, 0) + delta
+
+    def set(self, labels: Labels, value: float) -> None:
+        self._values[labels] = value
+
+    def value(self, labels: Labels) -> float:
+        return self._values.get(labels, 0)
+
+    def render(self, lines: List[str]) -> None:
+        lines.append(f"# HELP {self._name} {self._help}")
+        lines.append(f"# TYPE {self._name} gauge")
+        for labels, value in self._values.items():
+            pairs = ",".join(f'{name}="{label}"' for name, label in zip(self._label_names, labels))
+            lines.append(f"{self._name}{{{pairs}}} {value}" if pairs else f"{self._name} {value}")
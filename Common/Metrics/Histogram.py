@@ -0,0 +1,50 @@
+from bisect import bisect_left
+from typing import Tuple, Dict, List
+
+Labels = Tuple[str, ...]
+
+
+class Histogram:
+    # A Prometheus histogram family: one set of cumulative buckets, a sum and a count per combination of label values.
+    # Buckets are stored per bucket rather than cumulatively, so an observation increments a single counter
+    SECONDS: Tuple[float, ...] = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+                                  0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+    def __init__(self, name: str, help_text: str, label_names: Labels, buckets: Tuple[float, ...] = SECONDS) -> None:
+        self._name: str = name
+        self._help: str = help_text
+        self._label_names: Labels = label_names
+        self._buckets: Tuple[float, ...] = tuple(sorted(buckets))
+        # Label values to the bucket counts (the last one for +Inf), the sum and the count
+        self._series: Dict[Labels, Tuple[List[int], List[float]]] = {}
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    def observe(self, labels: Labels, value: float) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = ([0] * (len(self._buckets) + 1), [0.0])
+        series[0][bisect_left(self._buckets, value)] += 1
+        series[1][0] += value
+
+    def count(self, labels: Labels) -> int:
+        series = self._series.get(labels)
+        return sum(series[0]) if series is not None else 0
+
+    def render(self, lines: List[str]) -> None:
+        lines.append(f"# HELP {self._name} {self._help}")
+        lines.append(f"# TYPE {self._name} histogram")
+        for labels, (counts, total) in self._series.items():
+            pairs = ",".join(f'{name}="{value}"' for name, value in zip(self._label_names, labels))
+            prefix = f"{pairs}," if pairs else ""
+            cumulative = 0
+            for bound, count in zip(self._buckets, counts):
+                cumulative += count
+                lines.append(f'{self._name}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+            cumulative += counts[-1]
+            lines.append(f'{self._name}_bucket{{{prefix}le="+Inf"}} {cumulative}')
+            suffix = f"{{{pairs}}}" if pairs else ""
+            lines.append(f"{self._name}_sum{suffix} {total[0]}")
+            lines.append(f"{self._name}_count{suffix} {cumulative}")
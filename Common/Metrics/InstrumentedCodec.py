@@ -0,0 +1,34 @@
+from typing import Union, Optional, Mapping, Dict, Type
+
+from Common.Event import Event, EventCodec
+from Common.Metrics.MetricsRegistry import MetricsRegistry
+
+
+class InstrumentedCodec(EventCodec):
+    # Wraps a codec to time encoding per event type, as the encode stage
+    def __init__(self, codec: EventCodec, metrics: MetricsRegistry) -> None:
+        super().__init__(codec.registry, codec.trusted)
+        self._codec: EventCodec = codec
+        self._metrics: MetricsRegistry = metrics
+
+    @property
+    def content_type(self) -> str:
+        return self._codec.content_type
+
+    def headers(self, event_type: Type[Event]) -> Dict[str, str]:
+        return self._codec.headers(event_type)
+
+    def encode(self, event: Event) -> Union[str, bytes]:
+        metrics = self._metrics
+        if not metrics.sampled():
+            return self._codec.encode(event)
+        started = metrics.clock()
+        data = self._codec.encode(event)
+        metrics.event_stages.observe((type(event).__name__, "encode"), metrics.clock() - started)
+        return data
+
+    def aggregate_id(self, data: Union[str, bytes], headers: Optional[Mapping[str, str]] = None) -> str:
+        return self._codec.aggregate_id(data, headers)
+
+    def decode(self, data: Union[str, bytes], headers: Optional[Mapping[str, str]] = None) -> Event:
+        return self._codec.decode(data, headers)
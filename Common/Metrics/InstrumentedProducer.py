@@ -0,0 +1,25 @@
+from typing import Union, Dict
+
+from Common.Metrics.MetricsRegistry import MetricsRegistry
+from Common.Transport import TransportProducer
+
+
+class InstrumentedProducer(TransportProducer):
+    # Wraps a producer to count its produce calls in flight and time them per event type, as the publish stage
+    def __init__(self, producer: TransportProducer, metrics: MetricsRegistry) -> None:
+        super().__init__(producer.stations, producer.name)
+        self._producer: TransportProducer = producer
+        self._metrics: MetricsRegistry = metrics
+        self._labels = (producer.name,)
+
+    async def produce(self, message: Union[str, bytes], headers: Dict[str, str]) -> None:
+        metrics = self._metrics
+        in_flight = metrics.produce_in_flight
+        in_flight.add(self._labels, 1)
+        started = metrics.clock() if metrics.sampled() else None
+        try:
+            await self._producer.produce(message, headers)
+        finally:
+            in_flight.add(self._labels, -1)
+            if started is not None:
+                metrics.event_stages.observe((headers.get("EventType", ""), "publish"), metrics.clock() - started)
@@ -0,0 +1,57 @@
+import random
+import time
+from typing import List, Union, Callable, Dict
+
+from Common.Metrics.Gauge import Gauge
+from Common.Metrics.Histogram import Histogram
+
+
+class MetricsRegistry:
+    # The metrics of one process, rendered in the Prometheus text format. Timings are only taken for a sample_rate
+    # fraction of operations, decided once per operation by sampled(); counts that must stay exact, such as gauges of
+    # work in flight, are kept for every operation. Instrumentation is installed by wrapping the codec, the producers,
+    # the routes and the repositories, so a process without a registry pays nothing for it
+    CONTENT_TYPE: str = "text/plain; version=0.0.4; charset=utf-8"
+
+    def __init__(self, sample_rate: float = 1.0, uniform: Callable[[], float] = random.random) -> None:
+        if not 0 < sample_rate <= 1:
+            raise ValueError("sample_rate must be greater than 0 and at most 1")
+        self._sample_rate: float = sample_rate
+        self._uniform: Callable[[], float] = uniform
+        self._metrics: Dict[str, Union[Histogram, Gauge]] = {}
+        self.clock: Callable[[], float] = time.perf_counter
+        self.event_stages: Histogram = self.register(Histogram(
+            "photovote_event_stage_seconds", "Time spent per event type in each stage: validate, encode, publish",
+            ("event_type", "stage")))
+        self.route_stages: Histogram = self.register(Histogram(
+            "photovote_route_stage_seconds",
+            "Time spent per route: total, validate (reading, parsing and validating the request) and handler",
+            ("route", "stage")))
+        self.produce_in_flight: Gauge = self.register(Gauge(
+            "photovote_produce_in_flight", "Produce calls started and not yet finished, per producer", ("producer",)))
+        self.aggregate_load: Histogram = self.register(Histogram(
+            "photovote_aggregate_load_seconds", "Time to load an aggregate and replay its history",
+            ("aggregate_type",)))
+        self.aggregate_replay: Histogram = self.register(Histogram(
+            "photovote_aggregate_replay_events", "Events replayed per aggregate load", ("aggregate_type",),
+            (0, 1, 10, 100, 1000, 10000)))
+
+    @property
+    def sample_rate(self) -> float:
+        return self._sample_rate
+
+    def register(self, metric: Union[Histogram, Gauge]) -> Union[Histogram, Gauge]:
+        if metric.name in self._metrics:
+            raise ValueError(f"A metric named {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def sampled(self) -> bool:
+        return self._sample_rate >= 1 or self._uniform() < self._sample_rate
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            metric.render(lines)
+        lines.append("")
+        return "\n".join(lines)
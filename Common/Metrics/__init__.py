@@ -0,0 +1,5 @@
+from .Histogram import Histogram
+from .Gauge import Gauge
+from .MetricsRegistry import MetricsRegistry
+from .InstrumentedCodec import InstrumentedCodec
+from .InstrumentedProducer import InstrumentedProducer
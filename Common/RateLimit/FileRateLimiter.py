@@ -0,0 +1,104 @@
+import fcntl
+import hashlib
+import mmap
+import os
+import struct
+import time
+from typing import Callable
+
+from Common.RateLimit.RateLimiter import RateLimiter
+
+
+class FileRateLimiter(RateLimiter):
+    # Buckets live in a file of capacity fixed-size slots that every process on the machine maps, so workers that
+    # share it share the limit. A slot holds the key's 64-bit blake2b digest, its tokens and when they were last
+    # counted. A key is looked for in the few slots after the one its digest picks; if it isn't there and none of them
+    # is free, the one used longest ago is taken over. Each acquire holds an exclusive flock on the file for a few slot
+    # reads and one write. acquire() runs on the event loop, so it never blocks on the lock: it retries a non-blocking
+    # flock for at most lock_timeout seconds, and lets the request through if another process still holds it, as one
+    # stopped while holding it would. Times come from the monotonic clock, which processes on one machine share
+    SLOT = struct.Struct("<Qdd")
+    PROBES: int = 4
+    RETRY: float = 0.0001
+
+    def __init__(self, path: str, rate: float, burst: float, capacity: int = 100000,
+                 clock: Callable[[], float] = time.monotonic, lock_timeout: float = 0.005) -> None:
+        super().__init__(rate, burst)
+        if capacity < 1:
+            raise ValueError("A rate limiter must hold at least one bucket")
+        self._path: str = path
+        self._capacity: int = capacity
+        self._clock: Callable[[], float] = clock
+        self._lock_timeout: float = lock_timeout
+        size = capacity * FileRateLimiter.SLOT.size
+        self._file: int = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(self._file, fcntl.LOCK_EX)
+            try:
+                existing = os.fstat(self._file).st_size
+                if existing == 0:
+                    os.ftruncate(self._file, size)
+                elif existing != size:
+                    raise ValueError(f"{path} holds {existing // FileRateLimiter.SLOT.size} buckets, not {capacity}")
+            finally:
+                fcntl.flock(self._file, fcntl.LOCK_UN)
+            self._map: mmap.mmap = mmap.mmap(self._file, size)
+        except Exception:
+            os.close(self._file)
+            raise
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @staticmethod
+    def digest(key: str) -> int:
+        # 0 marks a free slot
+        return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "little") or 1
+
+    def _lock(self) -> bool:
+        deadline = None
+        while True:
+            try:
+                fcntl.flock(self._file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return True
+            except BlockingIOError:
+                now = time.monotonic()
+                if deadline is None:
+                    deadline = now + self._lock_timeout
+                elif now >= deadline:
+                    return False
+                time.sleep(FileRateLimiter.RETRY)
+
+    def acquire(self, key: str, cost: float = 1.0) -> float:
+        slot = FileRateLimiter.SLOT
+        digest = FileRateLimiter.digest(key)
+        first = digest % self._capacity
+        if not self._lock():
+            return 0.0
+        try:
+            now = self._clock()
+            offset = oldest = -1
+            oldest_updated = float("inf")
+            for probe in range(min(FileRateLimiter.PROBES, self._capacity)):
+                candidate = (first + probe) % self._capacity * slot.size
+                found, tokens, updated = slot.unpack_from(self._map, candidate)
+                if found == digest:
+                    offset = candidate
+                    break
+                if found == 0:
+                    offset, tokens, updated = candidate, self._burst, now
+                    break
+                if updated < oldest_updated:
+                    oldest, oldest_updated = candidate, updated
+            else:
+                offset, tokens, updated = oldest, self._burst, now
+            tokens, wait = self._take(tokens, updated, now, cost)
+            slot.pack_into(self._map, offset, digest, tokens, now)
+            return wait
+        finally:
+            fcntl.flock(self._file, fcntl.LOCK_UN)
+
+    def close(self) -> None:
+        self._map.close()
+        os.close(self._file)
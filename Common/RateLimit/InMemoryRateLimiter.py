@@ -0,0 +1,34 @@
+import time
+from collections import OrderedDict
+from typing import Callable, List
+
+from Common.RateLimit.RateLimiter import RateLimiter
+
+
+class InMemoryRateLimiter(RateLimiter):
+    # Buckets live in this process, in least recently used order, and the oldest is dropped beyond capacity
+    def __init__(self, rate: float, burst: float, capacity: int = 100000,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        super().__init__(rate, burst)
+        if capacity < 1:
+            raise ValueError("A rate limiter must hold at least one bucket")
+        self._capacity: int = capacity
+        self._clock: Callable[[], float] = clock
+        # Each bucket is its tokens and when they were last counted
+        self._buckets: OrderedDict[str, List[float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def acquire(self, key: str, cost: float = 1.0) -> float:
+        now = self._clock()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = [self._burst, now]
+            if len(self._buckets) > self._capacity:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+        bucket[0], wait = self._take(bucket[0], bucket[1], now, cost)
+        bucket[1] = now
+        return wait
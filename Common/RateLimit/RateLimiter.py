@@ -0,0 +1,42 @@
+from abc import ABC, abstractmethod
+from typing import Tuple
+
+
+class RateLimiter(ABC):
+    # A token bucket per key: each holds up to burst tokens and refills at rate tokens a second, and a request takes its
+    # cost from its key's bucket or is refused. Buckets are only kept for a bounded number of recently used keys; a key
+    # whose bucket was dropped starts again with a full one, which only errs towards letting requests through
+    def __init__(self, rate: float, burst: float) -> None:
+        if rate <= 0:
+            raise ValueError("The rate must be positive")
+        if burst < 1:
+            raise ValueError("The burst must be at least one token")
+        self._rate: float = rate
+        self._burst: float = burst
+
+    @property
+    def rate(self) -> float:
+        return self._rate
+
+    @property
+    def burst(self) -> float:
+        return self._burst
+
+    def _take(self, tokens: float, updated: float, now: float, cost: float) -> Tuple[float, float]:
+        # The bucket's tokens after the request, and 0 if it may go ahead or else the seconds until it could
+        if cost > self._burst:
+            raise ValueError(f"A cost of {cost} can never fit in a bucket of {self._burst}")
+        # A time ahead of now can only come from a file written before a reboot
+        tokens = min(self._burst, tokens + max(now - updated, 0.0) * self._rate)
+        if tokens < cost:
+            return tokens, (cost - tokens) / self._rate
+        return tokens - cost, 0.0
+
+    @abstractmethod
+    def acquire(self, key: str, cost: float = 1.0) -> float:
+        # Takes cost tokens and returns 0, or if there are too few, takes none and returns the seconds until there will
+        # be enough
+        pass
+
+    def close(self) -> None:
+        pass
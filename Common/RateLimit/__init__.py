@@ -0,0 +1,3 @@
+from .RateLimiter import RateLimiter
+from .InMemoryRateLimiter import InMemoryRateLimiter
+from .FileRateLimiter import FileRateLimiter
@@ -0,0 +1,45 @@
+import hashlib
+from bisect import bisect_right
+from typing import Iterable, List, Dict, Tuple
+
+
+class HashRing:
+    # Consistent hashing of keys onto named nodes. Each node is placed at replicas points on a 64-bit ring, and a key
+    # belongs to the first node point at or after its own hash. Adding or removing a node therefore only moves the keys
+    # of that node, about 1/n of them, and every process that builds a ring from the same node names agrees on owners
+    def __init__(self, nodes: Iterable[str], replicas: int = 64) -> None:
+        self._nodes: Tuple[str, ...] = tuple(dict.fromkeys(nodes))
+        if len(self._nodes) == 0:
+            raise ValueError("A hash ring needs at least one node")
+        self._replicas: int = replicas
+        points = sorted((HashRing.hash(f"{node}#{replica}"), node) for node in self._nodes
+                        for replica in range(replicas))
+        self._points: List[int] = [point for point, _ in points]
+        self._owners: List[str] = [node for _, node in points]
+
+    @staticmethod
+    def hash(key: str) -> int:
+        return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+    @property
+    def nodes(self) -> Tuple[str, ...]:
+        return self._nodes
+
+    def owner(self, key: str) -> str:
+        index = bisect_right(self._points, HashRing.hash(key))
+        return self._owners[index if index < len(self._owners) else 0]
+
+    def owns(self, node: str, key: str) -> bool:
+        return self.owner(key) == node
+
+    def with_nodes(self, nodes: Iterable[str]) -> "HashRing":
+        return HashRing(nodes, self._replicas)
+
+    def share(self) -> Dict[str, float]:
+        # The fraction of the ring each node owns
+        shares = dict.fromkeys(self._nodes, 0.0)
+        previous = self._points[-1] - (1 << 64)
+        for point, node in zip(self._points, self._owners):
+            shares[node] += (point - previous) / (1 << 64)
+            previous = point
+        return shares
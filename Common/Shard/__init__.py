@@ -0,0 +1 @@
+from .HashRing import HashRing
@@ -0,0 +1,22 @@
+from abc import ABC, abstractmethod
+from typing import Optional, Dict, Any, List
+
+
+class DocumentStore(ABC):
+    # Read-model storage: JSON-like documents addressed by collection and key
+
+    @abstractmethod
+    async def get(self, collection: str, key: str) -> Optional[Dict[str, Any]]:
+        pass
+
+    @abstractmethod
+    async def put(self, collection: str, key: str, document: Dict[str, Any]) -> None:
+        pass
+
+    @abstractmethod
+    async def delete(self, collection: str, key: str) -> None:
+        pass
+
+    @abstractmethod
+    async def find(self, collection: str, field: str, value: Any) -> List[Dict[str, Any]]:
+        pass
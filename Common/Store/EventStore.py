@@ -0,0 +1,32 @@
+from abc import ABC, abstractmethod
+from typing import List, AsyncIterator
+
+from Common.Event import Event
+
+
+class EventStore(ABC):
+    # Versions follow AggregateRoot: the first event in a stream is version 0, and an empty stream is at version -1
+
+    @abstractmethod
+    async def append(self, aggregate_id: str, events: List[Event], expected_version: int) -> int:
+        pass
+
+    @abstractmethod
+    async def read(self, aggregate_id: str, from_version: int = 0) -> List[Event]:
+        pass
+
+    async def stream(self, aggregate_id: str, from_version: int = 0) -> AsyncIterator[Event]:
+        # Stores that can read a stream incrementally override this, so loading an aggregate never holds its history
+        for event in await self.read(aggregate_id, from_version):
+            yield event
+
+    @abstractmethod
+    async def version(self, aggregate_id: str) -> int:
+        pass
+
+    @abstractmethod
+    def aggregates(self) -> List[str]:
+        pass
+
+    def close(self) -> None:
+        pass
@@ -0,0 +1,24 @@
+import copy
+from typing import Optional, Dict, Any, List
+
+from Common.Store.DocumentStore import DocumentStore
+
+
+class InMemoryDocumentStore(DocumentStore):
+    # Documents are copied in and out, so callers can't change stored documents by mutating what they hold
+    def __init__(self) -> None:
+        self._collections: Dict[str, Dict[str, Dict[str, Any]]] = {}
+
+    async def get(self, collection: str, key: str) -> Optional[Dict[str, Any]]:
+        document = self._collections.get(collection, {}).get(key)
+        return copy.deepcopy(document) if document is not None else None
+
+    async def put(self, collection: str, key: str, document: Dict[str, Any]) -> None:
+        self._collections.setdefault(collection, {})[key] = copy.deepcopy(document)
+
+    async def delete(self, collection: str, key: str) -> None:
+        self._collections.get(collection, {}).pop(key, None)
+
+    async def find(self, collection: str, field: str, value: Any) -> List[Dict[str, Any]]:
+        return [copy.deepcopy(document) for document in self._collections.get(collection, {}).values()
+                if document.get(field) == value]
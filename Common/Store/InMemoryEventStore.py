@@ -0,0 +1,29 @@
+from typing import List, Dict
+
+from Common.Event import Event
+from Common.Exception import ConcurrencyError
+from Common.Store.EventStore import EventStore
+
+
+class InMemoryEventStore(EventStore):
+    def __init__(self) -> None:
+        self._streams: Dict[str, List[Event]] = {}
+
+    async def append(self, aggregate_id: str, events: List[Event], expected_version: int) -> int:
+        # A rejected append leaves no empty stream behind for aggregates() to report
+        stream = self._streams.get(aggregate_id, [])
+        if len(stream) - 1 != expected_version:
+            raise ConcurrencyError("%s is at version %d, expected %d" % (aggregate_id, len(stream) - 1,
+                                                                          expected_version))
+        stream.extend(events)
+        self._streams[aggregate_id] = stream
+        return len(stream) - 1
+
+    async def read(self, aggregate_id: str, from_version: int = 0) -> List[Event]:
+        return self._streams.get(aggregate_id, [])[from_version:]
+
+    async def version(self, aggregate_id: str) -> int:
+        return len(self._streams.get(aggregate_id, [])) - 1
+
+    def aggregates(self) -> List[str]:
+        return list(self._streams)
@@ -0,0 +1,18 @@
+from typing import Optional, Dict
+
+from Common.Store.Snapshot import Snapshot
+from Common.Store.SnapshotStore import SnapshotStore
+
+
+class InMemorySnapshotStore(SnapshotStore):
+    # Only the latest snapshot of each aggregate is kept, since rehydration never needs an older one
+    def __init__(self) -> None:
+        self._snapshots: Dict[str, Snapshot] = {}
+
+    async def get(self, aggregate_id: str) -> Optional[Snapshot]:
+        return self._snapshots.get(aggregate_id)
+
+    async def save(self, snapshot: Snapshot) -> None:
+        current = self._snapshots.get(snapshot.aggregate_id)
+        if current is None or current.version < snapshot.version:
+            self._snapshots[snapshot.aggregate_id] = snapshot
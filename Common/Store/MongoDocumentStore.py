@@ -0,0 +1,25 @@
+from typing import Optional, Dict, Any, List
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from Common.Store.DocumentStore import DocumentStore
+
+
+class MongoDocumentStore(DocumentStore):
+    def __init__(self, uri: str, database: str) -> None:
+        self._client: AsyncIOMotorClient = AsyncIOMotorClient(uri)
+        self._database = self._client[database]
+
+    async def get(self, collection: str, key: str) -> Optional[Dict[str, Any]]:
+        return await self._database[collection].find_one({"_id": key}, projection={"_id": False})
+
+    async def put(self, collection: str, key: str, document: Dict[str, Any]) -> None:
+        await self._database[collection].replace_one({"_id": key}, {**document, "_id": key}, upsert=True)
+
+    async def delete(self, collection: str, key: str) -> None:
+        await self._database[collection].delete_one({"_id": key})
+
+    async def find(self, collection: str, field: str, value: Any) -> List[Dict[str, Any]]:
+        return await self._database[collection].find({field: value}, projection={"_id": False}).to_list(length=None)
+
+    def close(self) -> None:
+        self._client.close()
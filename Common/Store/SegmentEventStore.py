@@ -0,0 +1,246 @@
+import asyncio
+import fcntl
+import mmap
+import os
+import struct
+import zlib
+from array import array
+from typing import List, Dict, Optional, Tuple, Iterator, Mapping, Set, AsyncIterator
+
+from Common.Event import Event, EventCodec
+from Common.Exception import ConcurrencyError
+from Common.Store.EventStore import EventStore
+
+
+class SegmentEventStore(EventStore):
+    # An embedded event store: every stream is appended to one log of numbered segment files under path, and an index
+    # in memory maps each aggregate_id to the positions of its events, so its version is the length of its list.
+    #
+    # A record is a header of its body's length, the body's crc32, the event's version, its registry tag and the
+    # length of its aggregate_id, followed by the body: the aggregate_id and the event as the codec encoded it. The
+    # index is rebuilt by scanning the segments when the store is opened; a torn record at the end of the last segment,
+    # left by a crash during a write, is cut off. Reads come from read-only memory maps of the segments, so replaying
+    # a stream only copies each event's own bytes out of the page cache, and records() and log() hand those bytes over
+    # undecoded.
+    #
+    # Appends are written straight away and are visible to reads at once, but only return once they are on disk.
+    # Appends that arrive within commit_interval of each other share one fsync. Only one process may open a path
+    HEADER = struct.Struct(">IIqIH")
+    # A position packs the segment number above the offset within it
+    OFFSET_BITS: int = 40
+
+    def __init__(self, path: str, codec: EventCodec, segment_size: int = 64 * 1024 * 1024,
+                 commit_interval: float = 0.002, fsync: bool = True) -> None:
+        if segment_size >= 1 << SegmentEventStore.OFFSET_BITS:
+            raise ValueError("Segments must be smaller than 1 TiB")
+        self._path: str = path
+        self._codec: EventCodec = codec
+        self._segment_size: int = segment_size
+        self._commit_interval: float = commit_interval
+        self._fsync: bool = fsync
+        self._index: Dict[str, array] = {}
+        self._maps: Dict[int, mmap.mmap] = {}
+        self._headers: Dict[int, Mapping[str, str]] = {}
+        self._committing: Optional[asyncio.Future] = None
+        self._syncing: Set[asyncio.Task] = set()
+        # fsyncs run one at a time, so a segment that fills up is only closed once no fsync can be using it
+        self._sync_lock: asyncio.Lock = asyncio.Lock()
+        self._retired: List[int] = []
+        os.makedirs(path, exist_ok=True)
+        self._lock: int = os.open(os.path.join(path, "LOCK"), os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(self._lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(self._lock)
+            raise RuntimeError(f"The event store at {path} is open in another process")
+        segments = sorted(int(name.split(".")[0]) for name in os.listdir(path) if name.endswith(".segment"))
+        for segment in segments:
+            self._scan(segment, last=segment == segments[-1])
+        self._segment: int = segments[-1] if len(segments) > 0 else 0
+        self._file: int = os.open(self._segment_path(self._segment), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        self._size: int = os.fstat(self._file).st_size
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def codec(self) -> EventCodec:
+        return self._codec
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def _segment_path(self, segment: int) -> str:
+        return os.path.join(self._path, f"{segment:010d}.segment")
+
+    def _extent(self, segment: int) -> int:
+        return self._size if segment == self._segment else os.path.getsize(self._segment_path(segment))
+
+    def _map(self, segment: int, needed: int) -> mmap.mmap:
+        # The last segment grows, so it is mapped again when a read goes past the end of its current map. A map that is
+        # replaced is left for the garbage collector, since a replay may still be reading it
+        data = self._maps.get(segment)
+        if data is None or len(data) < needed:
+            with open(self._segment_path(segment), "rb") as file:
+                data = self._maps[segment] = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        return data
+
+    def _unmap(self, segment: int) -> None:
+        data = self._maps.pop(segment, None)
+        if data is not None:
+            data.close()
+
+    def _records(self, segment: int, size: int) -> Iterator[Tuple[int, int, int, int, int]]:
+        # Yields the offset of each whole record, the end of its header and of the record, and its version and tag,
+        # and stops at the first one that is torn or fails its checksum
+        if size == 0:
+            return
+        data = self._map(segment, size)
+        header = SegmentEventStore.HEADER
+        with memoryview(data) as view:
+            offset = 0
+            while offset + header.size <= size:
+                length, crc, version, tag, id_length = header.unpack_from(data, offset)
+                start = offset + header.size
+                end = start + length
+                if end > size or zlib.crc32(view[offset + 8:end]) != crc:
+                    return
+                yield offset, start + id_length, end, version, tag
+                offset = end
+
+    def _scan(self, segment: int, last: bool) -> None:
+        size = os.path.getsize(self._segment_path(segment))
+        end = 0
+        for offset, start, end, version, _ in self._records(segment, size):
+            data = self._maps[segment]
+            aggregate_id = data[offset + SegmentEventStore.HEADER.size:start].decode()
+            positions = self._index.setdefault(aggregate_id, array("Q"))
+            if version != len(positions):
+                raise ValueError(f"Event {version} of {aggregate_id} in segment {segment} is out of order")
+            positions.append(segment << SegmentEventStore.OFFSET_BITS | offset)
+        if end < size:
+            if not last:
+                raise ValueError(f"Segment {segment} is corrupt after offset {end}")
+            self._unmap(segment)
+            os.truncate(self._segment_path(segment), end)
+
+    def _tag_headers(self, tag: int) -> Mapping[str, str]:
+        headers = self._headers.get(tag)
+        if headers is None:
+            headers = self._headers[tag] = {"EventTag": str(tag)}
+        return headers
+
+    def _record(self, aggregate_id: str, version: int, event: Event) -> bytes:
+        encoded = self._codec.encode(event)
+        if isinstance(encoded, str):
+            encoded = encoded.encode()
+        key = aggregate_id.encode()
+        tail = struct.pack(">qIH", version, self._codec.registry.tag(type(event)), len(key)) + key + encoded
+        return struct.pack(">II", len(key) + len(encoded), zlib.crc32(tail)) + tail
+
+    def _roll(self) -> None:
+        # A full segment is synced before the next one is started, so only the last can be torn
+        os.fsync(self._file)
+        self._retired.append(self._file)
+        self._segment += 1
+        self._file = os.open(self._segment_path(self._segment), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        self._size = 0
+
+    async def _commit(self) -> None:
+        if not self._fsync:
+            return
+        committing = self._committing
+        if committing is None:
+            committing = self._committing = asyncio.get_running_loop().create_future()
+            task = asyncio.create_task(self._sync(committing))
+            self._syncing.add(task)
+            task.add_done_callback(self._syncing.discard)
+        await asyncio.shield(committing)
+
+    async def _sync(self, committing: asyncio.Future) -> None:
+        await asyncio.sleep(self._commit_interval)
+        # Appends from here on wait for the next fsync
+        self._committing = None
+        async with self._sync_lock:
+            try:
+                await asyncio.get_running_loop().run_in_executor(None, os.fsync, self._file)
+                committing.set_result(None)
+            except Exception as e:
+                committing.set_exception(e)
+            retired, self._retired = self._retired, []
+            for file in retired:
+                os.close(file)
+
+    async def append(self, aggregate_id: str, events: List[Event], expected_version: int) -> int:
+        positions = self._index.get(aggregate_id)
+        version = len(positions) - 1 if positions is not None else -1
+        if version != expected_version:
+            raise ConcurrencyError("%s is at version %d, expected %d" % (aggregate_id, version, expected_version))
+        records = [self._record(aggregate_id, version + 1 + number, event) for number, event in enumerate(events)]
+        if positions is None:
+            positions = self._index[aggregate_id] = array("Q")
+        for record in records:
+            if self._size > 0 and self._size + len(record) > self._segment_size:
+                self._roll()
+            os.write(self._file, record)
+            positions.append(self._segment << SegmentEventStore.OFFSET_BITS | self._size)
+            self._size += len(record)
+        await self._commit()
+        return len(positions) - 1
+
+    def records(self, aggregate_id: str, from_version: int = 0) -> Iterator[Tuple[bytes, Mapping[str, str]]]:
+        # The stream's events as encoded, each with the headers the codec decodes it with, read as they are iterated
+        positions = self._index.get(aggregate_id)
+        if positions is None:
+            return
+        header = SegmentEventStore.HEADER
+        mask = (1 << SegmentEventStore.OFFSET_BITS) - 1
+        maps = self._maps
+        for position in positions[max(from_version, 0):]:
+            segment, offset = position >> SegmentEventStore.OFFSET_BITS, position & mask
+            data = maps.get(segment)
+            if data is None or len(data) < offset + header.size:
+                data = self._map(segment, offset + header.size)
+            length, _, _, tag, id_length = header.unpack_from(data, offset)
+            end = offset + header.size + length
+            if len(data) < end:
+                data = self._map(segment, end)
+            yield data[offset + header.size + id_length:end], self._tag_headers(tag)
+
+    def log(self) -> Iterator[Tuple[bytes, Mapping[str, str]]]:
+        # Every event in the store as encoded, in the order it was appended
+        for segment in range(self._segment + 1):
+            if not os.path.exists(self._segment_path(segment)):
+                continue
+            for _, start, end, _, tag in self._records(segment, self._extent(segment)):
+                yield self._maps[segment][start:end], self._tag_headers(tag)
+
+    def replay(self) -> Iterator[Event]:
+        for data, headers in self.log():
+            yield self._codec.decode(data, headers)
+
+    async def stream(self, aggregate_id: str, from_version: int = 0, chunk_size: int = 256) -> AsyncIterator[Event]:
+        # Lets the event loop in every chunk_size events, since reading from the maps never waits
+        for count, (data, headers) in enumerate(self.records(aggregate_id, from_version), 1):
+            yield self._codec.decode(data, headers)
+            if count % chunk_size == 0:
+                await asyncio.sleep(0)
+
+    async def read(self, aggregate_id: str, from_version: int = 0) -> List[Event]:
+        return [self._codec.decode(data, headers) for data, headers in self.records(aggregate_id, from_version)]
+
+    async def version(self, aggregate_id: str) -> int:
+        positions = self._index.get(aggregate_id)
+        return len(positions) - 1 if positions is not None else -1
+
+    def aggregates(self) -> List[str]:
+        return list(self._index)
+
+    def close(self) -> None:
+        # Only once every append has returned
+        for segment in list(self._maps):
+            self._unmap(segment)
+        os.fsync(self._file)
+        for file in self._retired + [self._file, self._lock]:
+            os.close(file)
@@ -0,0 +1,7 @@
+from typing import NamedTuple, Dict, Any
+
+
+class Snapshot(NamedTuple):
+    aggregate_id: str
+    version: int
+    state: Dict[str, Any]
@@ -0,0 +1,14 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from Common.Store.Snapshot import Snapshot
+
+
+class SnapshotStore(ABC):
+    @abstractmethod
+    async def get(self, aggregate_id: str) -> Optional[Snapshot]:
+        pass
+
+    @abstractmethod
+    async def save(self, snapshot: Snapshot) -> None:
+        pass
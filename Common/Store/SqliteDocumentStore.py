@@ -0,0 +1,37 @@
+import json
+import sqlite3
+from typing import Optional, Dict, Any, List
+
+from Common.Store.DocumentStore import DocumentStore
+
+
+class SqliteDocumentStore(DocumentStore):
+    # A local stand-in for the document database: one table of JSON documents, queried with json_extract. Calls are
+    # synchronous, which is fine for a local file or ":memory:" but not for a networked store
+    def __init__(self, path: str = ":memory:") -> None:
+        self._connection: sqlite3.Connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("CREATE TABLE IF NOT EXISTS documents (collection TEXT NOT NULL, key TEXT NOT NULL, "
+                                 "document TEXT NOT NULL, PRIMARY KEY (collection, key))")
+        self._connection.commit()
+
+    async def get(self, collection: str, key: str) -> Optional[Dict[str, Any]]:
+        row = self._connection.execute("SELECT document FROM documents WHERE collection = ? AND key = ?",
+                                       (collection, key)).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    async def put(self, collection: str, key: str, document: Dict[str, Any]) -> None:
+        self._connection.execute("INSERT OR REPLACE INTO documents (collection, key, document) VALUES (?, ?, ?)",
+                                 (collection, key, json.dumps(document)))
+        self._connection.commit()
+
+    async def delete(self, collection: str, key: str) -> None:
+        self._connection.execute("DELETE FROM documents WHERE collection = ? AND key = ?", (collection, key))
+        self._connection.commit()
+
+    async def find(self, collection: str, field: str, value: Any) -> List[Dict[str, Any]]:
+        rows = self._connection.execute("SELECT document FROM documents WHERE collection = ? "
+                                        "AND json_extract(document, ?) = ?", (collection, f"$.{field}", value))
+        return [json.loads(row[0]) for row in rows]
+
+    def close(self) -> None:
+        self._connection.close()
@@ -0,0 +1,9 @@
+from .Snapshot import Snapshot
+from .EventStore import EventStore
+from .InMemoryEventStore import InMemoryEventStore
+from .SegmentEventStore import SegmentEventStore
+from .SnapshotStore import SnapshotStore
+from .InMemorySnapshotStore import InMemorySnapshotStore
+from .DocumentStore import DocumentStore
+from .InMemoryDocumentStore import InMemoryDocumentStore
+from .SqliteDocumentStore import SqliteDocumentStore
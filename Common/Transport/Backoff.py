@@ -0,0 +1,21 @@
+import random
+from typing import Callable
+
+
+class Backoff:
+    # Exponential backoff with full jitter: the delay before attempt n is drawn uniformly from
+    # [0, min(cap, base * factor**n)]. Spreading the delays out keeps every producer of every worker from reconnecting
+    # to the broker at the same moment
+    def __init__(self, base: float = 0.1, cap: float = 10.0, factor: float = 2.0,
+                 uniform: Callable[[float, float], float] = random.uniform) -> None:
+        if base <= 0 or cap < base or factor < 1:
+            raise ValueError("Backoff needs 0 < base <= cap and factor >= 1")
+        self._base: float = base
+        self._cap: float = cap
+        self._factor: float = factor
+        self._uniform: Callable[[float, float], float] = uniform
+
+    def delay(self, attempt: int) -> float:
+        # Capping the exponent first keeps large attempt numbers from overflowing the float
+        exponent = min(attempt, 64)
+        return self._uniform(0.0, min(self._cap, self._base * self._factor ** exponent))
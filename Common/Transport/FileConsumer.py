@@ -0,0 +1,122 @@
+import asyncio
+import base64
+import json
+import os
+from collections import OrderedDict
+from typing import List, Optional, BinaryIO, Tuple, Dict
+
+from Common.Transport.TransportConsumer import TransportConsumer
+from Common.Transport.TransportMessage import TransportMessage
+
+
+class FileConsumer(TransportConsumer):
+    # Tails a station file from the offset its group has committed. The receipt of a message is its byte range in the
+    # file, and the committed offset only advances past messages that have been acked and have nothing unacked before
+    # them, so acks may arrive in any order. A nacked message is redelivered before any new one, up to redeliveries
+    # times; nacked once more, its record is appended to the group's dead letter file and it counts as acked, so one
+    # message that keeps failing cannot hold the offset back for good
+    def __init__(self, station_path: str, station: str, consumer_name: str, consumer_group: str,
+                 poll_interval: float = 0.05, redeliveries: int = 3) -> None:
+        super().__init__(station, consumer_name, consumer_group)
+        self._station_path: str = station_path
+        self._offset_path: str = f"{station_path}.{consumer_group or 'default'}.offset"
+        self._dead_letter_path: str = f"{station_path}.{consumer_group or 'default'}.dead"
+        self._redeliveries: int = redeliveries
+        self._poll_interval: float = poll_interval
+        self._segment: Optional[BinaryIO] = None
+        self._committed: int = self._read_committed()
+        self._position: int = self._committed
+        # Byte ranges delivered but not yet committed, in file order, mapped to whether they have been acked
+        self._pending: OrderedDict[Tuple[int, int], bool] = OrderedDict()
+        # Nacked messages waiting to be delivered again, and how often each pending message has been nacked
+        self._nacked: List[TransportMessage] = []
+        self._nacks: Dict[Tuple[int, int], int] = {}
+
+    @property
+    def committed(self) -> int:
+        return self._committed
+
+    @property
+    def dead_letter_path(self) -> str:
+        return self._dead_letter_path
+
+    def _read_committed(self) -> int:
+        if not os.path.exists(self._offset_path):
+            return 0
+        with open(self._offset_path, "r") as offset:
+            return int(offset.read() or 0)
+
+    def _open(self) -> Optional[BinaryIO]:
+        if self._segment is None and os.path.exists(self._station_path):
+            self._segment = open(self._station_path, "rb")
+            self._segment.seek(self._position)
+        return self._segment
+
+    def _read(self, max_messages: int) -> List[TransportMessage]:
+        segment = self._open()
+        messages: List[TransportMessage] = []
+        while segment is not None and len(messages) < max_messages:
+            line = segment.readline()
+            if not line.endswith(b"\n"):
+                # Nothing more, or a record the producer is still writing
+                segment.seek(self._position)
+                break
+            start, self._position = self._position, self._position + len(line)
+            record = json.loads(line)
+            data = base64.b64decode(record["data"]) if record.get("encoding") == "base64" else record["data"]
+            self._pending[(start, self._position)] = False
+            messages.append(TransportMessage(self.station, data, record["headers"], (start, self._position)))
+        return messages
+
+    async def fetch(self, max_messages: int, timeout: float) -> List[TransportMessage]:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            messages, self._nacked = self._nacked[:max_messages], self._nacked[max_messages:]
+            messages += self._read(max_messages - len(messages))
+            if len(messages) > 0 or loop.time() >= deadline:
+                return messages
+            await asyncio.sleep(min(self._poll_interval, max(deadline - loop.time(), 0)))
+
+    async def ack(self, messages: List[TransportMessage]) -> None:
+        for message in messages:
+            self._pending[message.receipt] = True
+            self._nacks.pop(message.receipt, None)
+        committed = self._committed
+        while len(self._pending) > 0:
+            receipt, acked = next(iter(self._pending.items()))
+            if not acked:
+                break
+            committed = receipt[1]
+            self._pending.popitem(last=False)
+        if committed != self._committed:
+            self._committed = committed
+            temporary = f"{self._offset_path}.tmp"
+            with open(temporary, "w") as offset:
+                offset.write(str(committed))
+            os.replace(temporary, self._offset_path)
+
+    async def nack(self, messages: List[TransportMessage]) -> None:
+        dead: List[TransportMessage] = []
+        for message in messages:
+            self._nacks[message.receipt] = self._nacks.get(message.receipt, 0) + 1
+            if self._nacks[message.receipt] > self._redeliveries:
+                dead.append(message)
+            else:
+                self._nacked.append(message)
+        if len(dead) > 0:
+            self._bury(dead)
+            await self.ack(dead)
+
+    def _bury(self, messages: List[TransportMessage]) -> None:
+        # Copies the messages' records as they are in the station file
+        with open(self._station_path, "rb") as station, open(self._dead_letter_path, "ab") as dead_letters:
+            for message in messages:
+                start, end = message.receipt
+                station.seek(start)
+                dead_letters.write(station.read(end - start))
+
+    async def close(self) -> None:
+        if self._segment is not None:
+            self._segment.close()
+            self._segment = None
@@ -0,0 +1,26 @@
+import base64
+import json
+from typing import Dict, List, Union, Callable, BinaryIO
+
+from Common.Transport.TransportProducer import TransportProducer
+
+
+class FileProducer(TransportProducer):
+    def __init__(self, segment: Callable[[str], BinaryIO], stations: List[str], producer_name: str) -> None:
+        super().__init__(stations, producer_name)
+        self._segment: Callable[[str], BinaryIO] = segment
+
+    @staticmethod
+    def record(message: Union[str, bytes], headers: Dict[str, str]) -> bytes:
+        if isinstance(message, bytes):
+            body = {"headers": headers, "data": base64.b64encode(message).decode("ascii"), "encoding": "base64"}
+        else:
+            body = {"headers": headers, "data": message}
+        return json.dumps(body, separators=(",", ":")).encode("utf-8") + b"\n"
+
+    async def produce(self, message: Union[str, bytes], headers: Dict[str, str]) -> None:
+        record = FileProducer.record(message, headers)
+        for station in self.stations:
+            segment = self._segment(station)
+            segment.write(record)
+            segment.flush()
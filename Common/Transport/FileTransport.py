@@ -0,0 +1,50 @@
+import base64
+import json
+import os
+from typing import Dict, List, Union, BinaryIO, Iterator
+
+from Common.Transport.FileConsumer import FileConsumer
+from Common.Transport.FileProducer import FileProducer
+from Common.Transport.Transport import Transport
+from Common.Transport.TransportConsumer import TransportConsumer
+from Common.Transport.TransportMessage import TransportMessage
+from Common.Transport.TransportProducer import TransportProducer
+
+
+class FileTransport(Transport):
+    # Every station is an append-only file of newline-delimited JSON records in the given directory. Writes are a
+    # single buffered write per record, which is atomic with respect to other producers in the same event loop
+    def __init__(self, path: str) -> None:
+        self._path: str = path
+        self._segments: Dict[str, BinaryIO] = {}
+
+    def station_path(self, station: str) -> str:
+        return os.path.join(self._path, f"{station}.jsonl")
+
+    def segment(self, station: str) -> BinaryIO:
+        if station not in self._segments:
+            self._segments[station] = open(self.station_path(station), "ab")
+        return self._segments[station]
+
+    def read(self, station: str) -> Iterator[TransportMessage]:
+        if not os.path.exists(self.station_path(station)):
+            return
+        with open(self.station_path(station), "rb") as segment:
+            for line in segment:
+                record = json.loads(line)
+                data = base64.b64decode(record["data"]) if record.get("encoding") == "base64" else record["data"]
+                yield TransportMessage(station, data, record["headers"])
+
+    async def connect(self) -> None:
+        os.makedirs(self._path, exist_ok=True)
+
+    async def close(self) -> None:
+        for segment in self._segments.values():
+            segment.close()
+        self._segments.clear()
+
+    async def producer(self, station_name: Union[str, List[str]], producer_name: str) -> TransportProducer:
+        return FileProducer(self.segment, Transport.stations(station_name), producer_name)
+
+    async def consumer(self, station_name: str, consumer_name: str, consumer_group: str = "") -> TransportConsumer:
+        return FileConsumer(self.station_path(station_name), station_name, consumer_name, consumer_group)
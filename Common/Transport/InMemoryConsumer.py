@@ -0,0 +1,40 @@
+import asyncio
+from typing import List, Callable
+
+from Common.Transport.TransportConsumer import TransportConsumer
+from Common.Transport.TransportMessage import TransportMessage
+
+
+class InMemoryConsumer(TransportConsumer):
+    # Takes messages off the station's queue, so every consumer of a station competes for its messages, as members of
+    # one consumer group would. A nacked message goes back on the end of the queue. closed tells the transport when
+    # the consumer is closed
+    def __init__(self, queue: asyncio.Queue, station: str, consumer_name: str, consumer_group: str,
+                 closed: Callable[[], None]) -> None:
+        super().__init__(station, consumer_name, consumer_group)
+        self._queue: asyncio.Queue = queue
+        self._closed: Callable[[], None] = closed
+        self._open: bool = True
+
+    async def fetch(self, max_messages: int, timeout: float) -> List[TransportMessage]:
+        try:
+            messages = [await asyncio.wait_for(self._queue.get(), timeout)]
+        except asyncio.TimeoutError:
+            return []
+        while len(messages) < max_messages and not self._queue.empty():
+            messages.append(self._queue.get_nowait())
+        return messages
+
+    async def ack(self, messages: List[TransportMessage]) -> None:
+        for _ in messages:
+            self._queue.task_done()
+
+    async def nack(self, messages: List[TransportMessage]) -> None:
+        for message in messages:
+            self._queue.task_done()
+            await self._queue.put(message)
+
+    async def close(self) -> None:
+        if self._open:
+            self._open = False
+            self._closed()
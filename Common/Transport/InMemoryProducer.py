@@ -0,0 +1,19 @@
+import asyncio
+from typing import Dict, List, Union, Callable, Optional
+
+from Common.Transport.TransportMessage import TransportMessage
+from Common.Transport.TransportProducer import TransportProducer
+
+
+class InMemoryProducer(TransportProducer):
+    # queue gives a station's queue, or None when the station has no consumer and the message is dropped
+    def __init__(self, queue: Callable[[str], Optional[asyncio.Queue]], stations: List[str],
+                 producer_name: str) -> None:
+        super().__init__(stations, producer_name)
+        self._queue: Callable[[str], Optional[asyncio.Queue]] = queue
+
+    async def produce(self, message: Union[str, bytes], headers: Dict[str, str]) -> None:
+        for station in self.stations:
+            queue = self._queue(station)
+            if queue is not None:
+                await queue.put(TransportMessage(station, message, headers))
@@ -0,0 +1,55 @@
+import asyncio
+from typing import Dict, List, Union, Optional
+
+from Common.Transport.InMemoryConsumer import InMemoryConsumer
+from Common.Transport.InMemoryProducer import InMemoryProducer
+from Common.Transport.Transport import Transport
+from Common.Transport.TransportConsumer import TransportConsumer
+from Common.Transport.TransportProducer import TransportProducer
+
+
+class InMemoryTransport(Transport):
+    # Each station is an asyncio.Queue in this process, which only exists while the station has consumers: nothing
+    # could ever read a message produced to a station without one, so it is dropped, and a station's last consumer
+    # closing drops what it left. A full queue makes produce() wait for a consumer, which is also useful when load
+    # testing to see the effect of a slow downstream; a maxsize of 0 means unbounded
+    def __init__(self, maxsize: int = 10000) -> None:
+        self._maxsize: int = maxsize
+        self._queues: Dict[str, asyncio.Queue] = {}
+        self._consumers: Dict[str, int] = {}
+        self._dropped: int = 0
+
+    @property
+    def dropped(self) -> int:
+        return self._dropped
+
+    def queue(self, station: str) -> Optional[asyncio.Queue]:
+        queue = self._queues.get(station)
+        if queue is None:
+            self._dropped += 1
+        return queue
+
+    def _subscribe(self, station: str) -> asyncio.Queue:
+        self._consumers[station] = self._consumers.get(station, 0) + 1
+        if station not in self._queues:
+            self._queues[station] = asyncio.Queue(maxsize=self._maxsize)
+        return self._queues[station]
+
+    def _unsubscribe(self, station: str) -> None:
+        self._consumers[station] -= 1
+        if self._consumers[station] == 0:
+            del self._consumers[station]
+            del self._queues[station]
+
+    async def connect(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+    async def producer(self, station_name: Union[str, List[str]], producer_name: str) -> TransportProducer:
+        return InMemoryProducer(self.queue, Transport.stations(station_name), producer_name)
+
+    async def consumer(self, station_name: str, consumer_name: str, consumer_group: str = "") -> TransportConsumer:
+        return InMemoryConsumer(self._subscribe(station_name), station_name, consumer_name, consumer_group,
+                                lambda: self._unsubscribe(station_name))
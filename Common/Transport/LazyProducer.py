@@ -0,0 +1,39 @@
+import asyncio
+from typing import List, Union, Dict, Optional
+
+from Common.Exception import TransportBusyError
+from Common.Transport.Transport import Transport
+from Common.Transport.TransportProducer import TransportProducer
+
+
+class LazyProducer(TransportProducer):
+    # Stands in for a transport's producer until start() has created it, so routes can be built before the transport
+    # connects. A produce before then waits up to wait seconds for the producer, and is refused with TransportBusyError
+    # if it still isn't there
+    def __init__(self, transport: Transport, stations: Union[str, List[str]], producer_name: str,
+                 wait: float = 5.0) -> None:
+        super().__init__(Transport.stations(stations), producer_name)
+        self._transport: Transport = transport
+        self._wait: float = wait
+        self._producer: Optional[TransportProducer] = None
+        self._ready: asyncio.Event = asyncio.Event()
+
+    @property
+    def ready(self) -> bool:
+        return self._producer is not None
+
+    async def start(self) -> TransportProducer:
+        if self._producer is None:
+            self._producer = await self._transport.producer(self.stations, self.name)
+            self._ready.set()
+        return self._producer
+
+    async def produce(self, message: Union[str, bytes], headers: Dict[str, str]) -> None:
+        producer = self._producer
+        if producer is None:
+            try:
+                await asyncio.wait_for(self._ready.wait(), self._wait)
+            except asyncio.TimeoutError:
+                raise TransportBusyError(f"Producer {self.name} is not connected yet")
+            producer = self._producer
+        await producer.produce(message, headers)
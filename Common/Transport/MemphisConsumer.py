@@ -0,0 +1,29 @@
+import asyncio
+from typing import List
+from memphis.consumer import Consumer
+
+from Common.Transport.TransportConsumer import TransportConsumer
+from Common.Transport.TransportMessage import TransportMessage
+
+
+class MemphisConsumer(TransportConsumer):
+    # Fetches with prefetch on, so the next batch is already on its way while this one is processed. Memphis acks
+    # messages one at a time; a batch of acks is sent concurrently
+    def __init__(self, consumer: Consumer, station: str, consumer_name: str, consumer_group: str) -> None:
+        super().__init__(station, consumer_name, consumer_group)
+        self._memphis: Consumer = consumer
+
+    async def fetch(self, max_messages: int, timeout: float) -> List[TransportMessage]:
+        # The wait for a batch is bounded by the consumer's batch_max_time_to_wait_ms rather than timeout
+        messages = await self._memphis.fetch(batch_size=max_messages, prefetch=True)
+        return [TransportMessage(self.station, bytes(message.get_data()), message.get_headers() or {}, message)
+                for message in messages or []]
+
+    async def ack(self, messages: List[TransportMessage]) -> None:
+        await asyncio.gather(*(message.receipt.ack() for message in messages))
+
+    async def nack(self, messages: List[TransportMessage]) -> None:
+        await asyncio.gather(*(message.receipt.nack() for message in messages))
+
+    async def close(self) -> None:
+        await self._memphis.destroy()
@@ -0,0 +1,53 @@
+from __future__ import annotations
+import asyncio
+from typing import Dict, List, Union, TYPE_CHECKING
+from memphis import Headers
+from memphis.exceptions import MemphisError, MemphisSchemaError, MemphisHeaderError
+from memphis.producer import Producer
+
+from Common.Transport.TransportProducer import TransportProducer
+
+if TYPE_CHECKING:
+    from Common.Transport.MemphisTransport import MemphisTransport
+
+
+class MemphisProducer(TransportProducer):
+    def __init__(self, transport: MemphisTransport, producer: Producer, generation: int, stations: List[str],
+                 producer_name: str) -> None:
+        super().__init__(stations, producer_name)
+        self._transport: MemphisTransport = transport
+        self._memphis: Producer = producer
+        self._generation: int = generation
+
+    @staticmethod
+    def headers(headers: Dict[str, str]) -> Headers:
+        memphis_headers = Headers()
+        for key, value in headers.items():
+            memphis_headers.add(key, value)
+        return memphis_headers
+
+    async def _current(self) -> Producer:
+        if self._generation != self._transport.generation:
+            self._memphis, self._generation = await self._transport.create(self.stations, self.name)
+        return self._memphis
+
+    async def produce(self, message: Union[str, bytes], headers: Dict[str, str]) -> None:
+        memphis_headers = MemphisProducer.headers(headers)
+        async with self._transport.limiter:
+            attempt = 0
+            while True:
+                producer = await self._current()
+                try:
+                    await producer.produce(message, headers=memphis_headers)
+                    return
+                except (MemphisSchemaError, MemphisHeaderError):
+                    # The message itself was rejected, so sending it again can't succeed
+                    raise
+                except MemphisError:
+                    if attempt >= self._transport.retries:
+                        raise
+                    if not self._transport.connection_active:
+                        await self._transport.reconnect(self._generation)
+                    else:
+                        await asyncio.sleep(self._transport.backoff.delay(attempt))
+                    attempt += 1
@@ -0,0 +1,131 @@
+import asyncio
+from typing import List, Union, Dict, Tuple, Optional
+from memphis import Memphis
+from memphis.producer import Producer
+
+from Common.Transport.Backoff import Backoff
+from Common.Transport.MemphisConsumer import MemphisConsumer
+from Common.Transport.MemphisProducer import MemphisProducer
+from Common.Transport.ProduceLimiter import ProduceLimiter
+from Common.Transport.Transport import Transport
+from Common.Transport.TransportConsumer import TransportConsumer
+from Common.Transport.TransportProducer import TransportProducer
+
+
+class MemphisTransport(Transport):
+    # One Memphis connection per process, shared by a pool of producers keyed by station set and producer name, so
+    # asking for the same producer twice returns the same one. Every produce goes through one ProduceLimiter, which
+    # bounds the messages in flight on the connection.
+    #
+    # When a produce fails because the connection dropped, the producer calls reconnect() with the generation it last
+    # saw. Only the first caller for a generation reconnects, retrying with jittered backoff; the others wait on the
+    # lock and then find the generation has moved on. Producers recreate their Memphis producer lazily on the next
+    # produce after a reconnect
+    def __init__(self, host: str, username: str, account_id: Union[int, str, None], password: str,
+                 max_in_flight: int = 256, max_waiting: int = 1024, retries: int = 3,
+                 backoff: Optional[Backoff] = None) -> None:
+        self._host: str = host
+        self._username: str = username
+        # Checked when connecting, so an app can be built, and report itself not ready, without a valid one
+        self._account_id: Union[int, str, None] = account_id
+        self._password: str = password
+        self._memphis: Memphis = Memphis()
+        self._connected: bool = False
+        self._generation: int = 0
+        self._lock: asyncio.Lock = asyncio.Lock()
+        self._limiter: ProduceLimiter = ProduceLimiter(max_in_flight, max_waiting)
+        self._retries: int = retries
+        self._backoff: Backoff = backoff or Backoff()
+        self._producers: Dict[Tuple[Tuple[str, ...], str], MemphisProducer] = {}
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    @property
+    def limiter(self) -> ProduceLimiter:
+        return self._limiter
+
+    @property
+    def retries(self) -> int:
+        return self._retries
+
+    @property
+    def backoff(self) -> Backoff:
+        return self._backoff
+
+    @property
+    def connection_active(self) -> bool:
+        return self._connected and self._memphis.is_connection_active
+
+    def _account(self) -> int:
+        try:
+            return int(self._account_id)
+        except (TypeError, ValueError):
+            raise ValueError(f"The Memphis account id must be a number, not {self._account_id!r}")
+
+    async def connect(self) -> None:
+        # Routers ask for their producers concurrently at startup, but they all share one connection
+        async with self._lock:
+            if not self._connected:
+                await self._memphis.connect(self._host, self._username, self._account(), password=self._password)
+                self._connected = True
+
+    async def reconnect(self, generation: int) -> None:
+        async with self._lock:
+            if generation != self._generation:
+                return
+            if self._connected:
+                try:
+                    await self._memphis.close()
+                except Exception:
+                    pass
+                self._connected = False
+            attempt = 0
+            while True:
+                try:
+                    self._memphis = Memphis()
+                    await self._memphis.connect(self._host, self._username, self._account(),
+                                                password=self._password)
+                    break
+                except Exception:
+                    if attempt >= self._retries:
+                        raise
+                    await asyncio.sleep(self._backoff.delay(attempt))
+                    attempt += 1
+            self._connected = True
+            self._generation += 1
+
+    async def close(self) -> None:
+        async with self._lock:
+            if self._connected:
+                await self._memphis.close()
+                self._connected = False
+            self._producers.clear()
+
+    async def create(self, stations: List[str], producer_name: str) -> Tuple[Producer, int]:
+        # A Memphis producer for the current connection, and the generation it belongs to
+        await self.connect()
+        generation = self._generation
+        producer = await self._memphis.producer(station_name=stations if len(stations) > 1 else stations[0],
+                                                producer_name=producer_name)
+        return producer, generation
+
+    async def producer(self, station_name: Union[str, List[str]], producer_name: str) -> TransportProducer:
+        stations = Transport.stations(station_name)
+        key = (tuple(stations), producer_name)
+        producer = self._producers.get(key)
+        if producer is None:
+            memphis_producer, generation = await self.create(stations, producer_name)
+            # Another caller may have created the same producer while this one was awaiting
+            producer = self._producers.setdefault(key, MemphisProducer(self, memphis_producer, generation, stations,
+                                                                       producer_name))
+        return producer
+
+    async def consumer(self, station_name: str, consumer_name: str, consumer_group: str = "",
+                       batch_size: int = 100, max_wait: float = 0.1) -> TransportConsumer:
+        await self.connect()
+        consumer = await self._memphis.consumer(station_name=station_name, consumer_name=consumer_name,
+                                                consumer_group=consumer_group, batch_size=batch_size,
+                                                batch_max_time_to_wait_ms=int(max_wait * 1000))
+        return MemphisConsumer(consumer, station_name, consumer_name, consumer_group)
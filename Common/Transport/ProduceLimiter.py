@@ -0,0 +1,43 @@
+import asyncio
+
+from Common.Exception import TransportBusyError
+
+
+class ProduceLimiter:
+    # Caps the number of produce calls in flight on a transport. Calls beyond max_in_flight wait for a free slot, but
+    # only up to max_waiting of them: after that a call fails at once with TransportBusyError instead of queueing
+    # without bound while the broker is slow or reconnecting, which lets the HTTP tier shed load with a 503
+    def __init__(self, max_in_flight: int = 256, max_waiting: int = 1024) -> None:
+        if max_in_flight < 1 or max_waiting < 0:
+            raise ValueError("max_in_flight must be positive and max_waiting must not be negative")
+        self._semaphore: asyncio.Semaphore = asyncio.Semaphore(max_in_flight)
+        self._max_in_flight: int = max_in_flight
+        self._max_waiting: int = max_waiting
+        self._in_flight: int = 0
+        self._waiting: int = 0
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def waiting(self) -> int:
+        return self._waiting
+
+    async def __aenter__(self) -> "ProduceLimiter":
+        if self._semaphore.locked():
+            if self._waiting >= self._max_waiting:
+                raise TransportBusyError(f"{self._max_in_flight} messages in flight and {self._waiting} waiting")
+            self._waiting += 1
+            try:
+                await self._semaphore.acquire()
+            finally:
+                self._waiting -= 1
+        else:
+            await self._semaphore.acquire()
+        self._in_flight += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc, traceback) -> None:
+        self._in_flight -= 1
+        self._semaphore.release()
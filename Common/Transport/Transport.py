@@ -0,0 +1,27 @@
+from abc import ABC, abstractmethod
+from typing import List, Union
+
+from Common.Transport.TransportConsumer import TransportConsumer
+from Common.Transport.TransportProducer import TransportProducer
+
+
+class Transport(ABC):
+    @abstractmethod
+    async def connect(self) -> None:
+        pass
+
+    @abstractmethod
+    async def close(self) -> None:
+        pass
+
+    @abstractmethod
+    async def producer(self, station_name: Union[str, List[str]], producer_name: str) -> TransportProducer:
+        pass
+
+    @abstractmethod
+    async def consumer(self, station_name: str, consumer_name: str, consumer_group: str = "") -> TransportConsumer:
+        pass
+
+    @staticmethod
+    def stations(station_name: Union[str, List[str]]) -> List[str]:
+        return [station_name] if isinstance(station_name, str) else list(station_name)
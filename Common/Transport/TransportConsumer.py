@@ -0,0 +1,40 @@
+from abc import ABC, abstractmethod
+from typing import List
+
+from Common.Transport.TransportMessage import TransportMessage
+
+
+class TransportConsumer(ABC):
+    def __init__(self, station: str, consumer_name: str, consumer_group: str) -> None:
+        self._station: str = station
+        self._consumer_name: str = consumer_name
+        self._consumer_group: str = consumer_group
+
+    @property
+    def station(self) -> str:
+        return self._station
+
+    @property
+    def name(self) -> str:
+        return self._consumer_name
+
+    @property
+    def group(self) -> str:
+        return self._consumer_group
+
+    @abstractmethod
+    async def fetch(self, max_messages: int, timeout: float) -> List[TransportMessage]:
+        # Up to max_messages messages in station order, or an empty list if none arrive within timeout seconds
+        pass
+
+    @abstractmethod
+    async def ack(self, messages: List[TransportMessage]) -> None:
+        pass
+
+    @abstractmethod
+    async def nack(self, messages: List[TransportMessage]) -> None:
+        pass
+
+    @abstractmethod
+    async def close(self) -> None:
+        pass
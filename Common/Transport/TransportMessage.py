@@ -0,0 +1,9 @@
+from typing import NamedTuple, Dict, Union, Any
+
+
+class TransportMessage(NamedTuple):
+    station: str
+    data: Union[str, bytes]
+    headers: Dict[str, str]
+    # Whatever the consumer that received the message needs to ack it; None for messages being produced
+    receipt: Any = None
@@ -0,0 +1,20 @@
+from abc import ABC, abstractmethod
+from typing import Dict, Union, List
+
+
+class TransportProducer(ABC):
+    def __init__(self, stations: List[str], producer_name: str) -> None:
+        self._stations: List[str] = stations
+        self._producer_name: str = producer_name
+
+    @property
+    def stations(self) -> List[str]:
+        return self._stations
+
+    @property
+    def name(self) -> str:
+        return self._producer_name
+
+    @abstractmethod
+    async def produce(self, message: Union[str, bytes], headers: Dict[str, str]) -> None:
+        pass
@@ -0,0 +1,11 @@
+from .TransportMessage import TransportMessage
+from .TransportProducer import TransportProducer
+from .TransportConsumer import TransportConsumer
+from .Transport import Transport
+from .InMemoryTransport import InMemoryTransport
+from .InMemoryConsumer import InMemoryConsumer
+from .FileTransport import FileTransport
+from .FileConsumer import FileConsumer
+from .Backoff import Backoff
+from .ProduceLimiter import ProduceLimiter
+from .LazyProducer import LazyProducer
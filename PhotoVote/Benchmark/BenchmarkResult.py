@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+
+
+class BenchmarkResult(BaseModel):
+    name: str
+    kind: str
+    operations: int
+    events: int
+    errors: int
+    seconds: float
+    throughput: float
+    events_per_second: float
+    p50_us: float
+    p99_us: float
+    max_us: float
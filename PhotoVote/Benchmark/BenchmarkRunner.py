@@ -0,0 +1,95 @@
+import asyncio
+import inspect
+import time
+import zlib
+from typing import List, Callable, Any, Awaitable, Sequence, TypeVar, Optional, Union
+
+from PhotoVote.Benchmark.BenchmarkResult import BenchmarkResult
+
+T = TypeVar("T")
+
+
+class BenchmarkRunner:
+    # Times an operation over a sequence of inputs, one call at a time, and keeps the results. Latency percentiles come
+    # from the individual calls and throughput from the wall time of the whole run, so for concurrent runs the two
+    # measure different things: how long each call waited, and how much work got done. An operation returning False
+    # counts as an error
+    def __init__(self) -> None:
+        self._results: List[BenchmarkResult] = []
+
+    @property
+    def results(self) -> List[BenchmarkResult]:
+        return self._results
+
+    @staticmethod
+    def percentile(latencies: List[int], fraction: float) -> float:
+        # latencies in nanoseconds, sorted; nearest rank, in microseconds
+        if len(latencies) == 0:
+            return 0.0
+        return latencies[min(len(latencies) - 1, int(fraction * len(latencies)))] / 1000
+
+    def _record(self, name: str, kind: str, latencies: List[int], seconds: float, events: int,
+                errors: int) -> BenchmarkResult:
+        latencies.sort()
+        operations = len(latencies)
+        result = BenchmarkResult(name=name, kind=kind, operations=operations, events=events, errors=errors,
+                                 seconds=round(seconds, 6),
+                                 throughput=round(operations / seconds, 1) if seconds > 0 else 0.0,
+                                 events_per_second=round(events / seconds, 1) if seconds > 0 else 0.0,
+                                 p50_us=round(BenchmarkRunner.percentile(latencies, 0.5), 3),
+                                 p99_us=round(BenchmarkRunner.percentile(latencies, 0.99), 3),
+                                 max_us=round(latencies[-1] / 1000, 3) if operations > 0 else 0.0)
+        self._results.append(result)
+        return result
+
+    def measure(self, name: str, operation: Callable[[T], Any], inputs: Sequence[T], kind: str = "micro",
+                warmup: int = 0, events_per_input: Union[int, Callable[[T], int]] = 1) -> BenchmarkResult:
+        # The first warmup inputs are run untimed first; only use it for operations that can be repeated
+        for item in inputs[:warmup]:
+            operation(item)
+        clock = time.perf_counter_ns
+        latencies: List[int] = []
+        errors = 0
+        started = clock()
+        for item in inputs:
+            before = clock()
+            if operation(item) is False:
+                errors += 1
+            latencies.append(clock() - before)
+        seconds = (clock() - started) / 1e9
+        return self._record(name, kind, latencies, seconds, BenchmarkRunner._events(inputs, events_per_input), errors)
+
+    async def measure_async(self, name: str, operation: Callable[[T], Awaitable[Any]], inputs: Sequence[T],
+                            concurrency: int = 1, key: Optional[Callable[[T], str]] = None, kind: str = "macro",
+                            events_per_input: Union[int, Callable[[T], int]] = 1) -> BenchmarkResult:
+        # Runs concurrency lanes at once. With a key, inputs with the same key go to the same lane in their original
+        # order, as the requests of one client session would; without one, inputs are dealt out round robin
+        lanes: List[List[T]] = [[] for _ in range(concurrency)]
+        for index, item in enumerate(inputs):
+            lane = zlib.crc32(key(item).encode()) % concurrency if key is not None else index % concurrency
+            lanes[lane].append(item)
+        clock = time.perf_counter_ns
+        latencies: List[int] = []
+        errors = 0
+
+        async def run(lane: List[T]) -> None:
+            nonlocal errors
+            for item in lane:
+                before = clock()
+                result = operation(item)
+                if inspect.isawaitable(result):
+                    result = await result
+                if result is False:
+                    errors += 1
+                latencies.append(clock() - before)
+
+        started = clock()
+        await asyncio.gather(*(run(lane) for lane in lanes))
+        seconds = (clock() - started) / 1e9
+        return self._record(name, kind, latencies, seconds, BenchmarkRunner._events(inputs, events_per_input), errors)
+
+    @staticmethod
+    def _events(inputs: Sequence[Any], events_per_input: Union[int, Callable[[Any], int]]) -> int:
+        if callable(events_per_input):
+            return sum(events_per_input(item) for item in inputs)
+        return len(inputs) * events_per_input
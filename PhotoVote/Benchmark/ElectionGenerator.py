@@ -0,0 +1,105 @@
+import random
+from typing import List, Dict, Iterator, Tuple
+
+from Common.Domain import UlidCodec
+from Common.Event import Event
+from PhotoVote.Event import ElectionCreated, CompetitionAdded, CandidateAdded, VoterRegistered, BallotCandidateRated, \
+    BallotCast
+
+
+class ElectionGenerator:
+    # Builds a synthetic, reproducible workload: elections with their competitions and candidates, registered voters,
+    # and one ballot per voter and election. A ballot rates a few candidates, changes some of those ratings again, and
+    # is usually cast at the end. The same seed always gives the same events and ids, so runs on different commits
+    # measure the same work
+    def __init__(self, elections: int = 1, competitions: int = 5, candidates: int = 10, voters: int = 1000,
+                 ratings: int = 8, rerate: float = 0.2, cast: float = 0.9, seed: int = 0) -> None:
+        if min(elections, competitions, candidates, voters, ratings) < 1:
+            raise ValueError("Every count must be at least 1")
+        self._random: random.Random = random.Random(seed)
+        self._elections: int = elections
+        self._competitions: int = competitions
+        self._candidates: int = candidates
+        self._voters: int = voters
+        self._ratings: int = ratings
+        self._rerate: float = rerate
+        self._cast: float = cast
+        self._clock: int = 1_700_000_000_000 + seed * 1_000_000_000
+        # Election id to its competitions, and competition id to its candidates, once setup() has run
+        self._structure: Dict[str, Dict[str, List[str]]] = {}
+        self._voter_ids: List[str] = []
+
+    def _id(self) -> str:
+        # ULIDs with increasing timestamps, as clients would create them
+        self._clock += self._random.randint(1, 50)
+        return UlidCodec.encode((self._clock << 80) | self._random.getrandbits(80))
+
+    def setup(self) -> List[Event]:
+        events: List[Event] = []
+        for election in range(self._elections):
+            election_id = self._id()
+            events.append(ElectionCreated(aggregate_id=election_id, name=f"Election {election}",
+                                          description="A synthetic election"))
+            competitions: Dict[str, List[str]] = {}
+            for competition in range(self._competitions):
+                competition_id = self._id()
+                events.append(CompetitionAdded(aggregate_id=competition_id, election_id=election_id,
+                                               name=f"Competition {competition}", description=None))
+                competitions[competition_id] = []
+                for candidate in range(self._candidates):
+                    candidate_id = self._id()
+                    events.append(CandidateAdded(aggregate_id=candidate_id, name=f"Candidate {candidate}",
+                                                 election_id=election_id, competition_id=competition_id,
+                                                 description=None))
+                    competitions[competition_id].append(candidate_id)
+            self._structure[election_id] = competitions
+        for voter in range(self._voters):
+            voter_id = self._id()
+            events.append(VoterRegistered(aggregate_id=voter_id, name=f"Voter {voter}",
+                                          email=f"voter{voter}.{voter_id.lower()}@example.org"))
+            self._voter_ids.append(voter_id)
+        return events
+
+    def _ballot(self, election_id: str, voter_id: str) -> List[Event]:
+        ballot_id = self._id()
+        competitions = self._structure[election_id]
+        rated: List[Tuple[str, str]] = []
+        events: List[Event] = []
+        for _ in range(self._ratings):
+            competition_id = self._random.choice(list(competitions))
+            if len(rated) > 0 and self._random.random() < self._rerate:
+                competition_id, candidate_id = self._random.choice(rated)
+            else:
+                candidate_id = self._random.choice(competitions[competition_id])
+                rated.append((competition_id, candidate_id))
+            events.append(BallotCandidateRated(aggregate_id=ballot_id, election_id=election_id,
+                                               competition_id=competition_id, candidate_id=candidate_id,
+                                               ballot_id=ballot_id, rating=self._random.randint(1, 5)))
+        if self._random.random() < self._cast:
+            events.append(BallotCast(aggregate_id=ballot_id, election_id=election_id, voter_id=voter_id))
+        return events
+
+    def ballots(self) -> List[List[Event]]:
+        # One ballot per voter and election, each in the order its client would send it
+        if len(self._structure) == 0:
+            self.setup()
+        return [self._ballot(election_id, voter_id) for voter_id in self._voter_ids for election_id in self._structure]
+
+    def interleave(self, ballots: List[List[Event]], sessions: int = 100) -> Iterator[Event]:
+        # Yields the events of up to sessions ballots at a time, alternating between them like concurrent clients
+        pending = iter(ballots)
+        active: List[Iterator[Event]] = []
+        while True:
+            while len(active) < sessions:
+                ballot = next(pending, None)
+                if ballot is None:
+                    break
+                active.append(iter(ballot))
+            if len(active) == 0:
+                return
+            index = self._random.randrange(len(active))
+            event = next(active[index], None)
+            if event is None:
+                active.pop(index)
+            else:
+                yield event
@@ -0,0 +1,174 @@
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+from typing import List, Dict, Any, Optional, Tuple
+
+from Common.Event import Event, JsonEventCodec, BinaryEventCodec
+from PhotoVote.Benchmark.BenchmarkRunner import BenchmarkRunner
+from PhotoVote.Benchmark.ElectionGenerator import ElectionGenerator
+from PhotoVote.Domain import BallotId
+from PhotoVote.Domain.Ballot import Ballot
+from PhotoVote.Event import registry
+from PhotoVote.Projection import TallyEngine
+from PhotoVote.Server.routes import EVENT_ROUTES
+
+# python -m PhotoVote.Benchmark.benchmark [--only micro|macro] [--output results.json] [--baseline earlier.json]
+#
+# Micro benchmarks time the domain model and the codecs in a loop; macro benchmarks drive the FastAPI app through
+# httpx's in-process ASGI client, over the memory transport unless PHOTOVOTE_TRANSPORT says otherwise. The results are
+# one JSON document, and --baseline prints how they compare with an earlier one
+ROUTES: Dict[type, Tuple[str, str]] = {route.event_type: (route.method, route.url) for route in EVENT_ROUTES}
+
+
+def micro(runner: BenchmarkRunner, generator: ElectionGenerator) -> None:
+    ballots = generator.ballots()
+    events: List[Event] = [event for ballot in ballots for event in ballot]
+    ids = [ballot[0].aggregate_id for ballot in ballots]
+    runner.measure("BallotId.from_string", BallotId.from_string, ids, warmup=len(ids))
+
+    def when(pair: Tuple[Ballot, Event]) -> None:
+        pair[0].when(pair[1])
+
+    pairs = []
+    for ballot in ballots:
+        aggregate = Ballot(BallotId.from_string(ballot[0].aggregate_id))
+        pairs.extend((aggregate, event) for event in ballot)
+    runner.measure("Ballot.when", when, pairs)
+
+    def load(history: List[Event]) -> None:
+        Ballot(BallotId.from_string(history[0].aggregate_id)).load(history)
+
+    runner.measure("AggregateRoot.load", load, ballots, warmup=len(ballots), events_per_input=len)
+
+    tally = TallyEngine("mean")
+    runner.measure("TallyEngine.apply", tally.apply, events)
+    # One read over every rating applied above
+    runner.measure("TallyEngine.results", lambda engine: engine.results(), [tally], events_per_input=len(events))
+
+    raw = [event.model_dump_json() for event in events]
+    runner.measure("Event.model_validate_json", lambda item: type(item[0]).model_validate_json(item[1]),
+                   list(zip(events, raw)), warmup=len(raw))
+    for codec in (JsonEventCodec(registry), BinaryEventCodec(registry)):
+        name = type(codec).__name__
+        runner.measure(f"{name}.encode", codec.encode, events, warmup=len(events))
+        encoded = [(codec.encode(event), codec.headers(type(event))) for event in events]
+        runner.measure(f"{name}.decode", lambda item: codec.decode(*item), encoded, warmup=len(encoded))
+        trusted = type(codec)(registry, trusted=True)
+        runner.measure(f"{name}.decode[trusted]", lambda item: trusted.decode(*item), encoded, warmup=len(encoded))
+        runner.measure(f"{name}.aggregate_id", lambda item: codec.aggregate_id(*item), encoded, warmup=len(encoded))
+
+
+async def macro(runner: BenchmarkRunner, generator: ElectionGenerator, batch_generator: ElectionGenerator,
+                concurrency: int, batch_size: int) -> None:
+    os.environ.setdefault("PHOTOVOTE_TRANSPORT", "memory")
+    # A durable store would leave the ballots of one run behind to reject those of the next
+    os.environ.setdefault("PHOTOVOTE_EVENT_STORE", "memory")
+    import httpx
+    from PhotoVote.Server import api
+    app = api.create_app()
+    async with app.router.lifespan_context(app):
+        while not app.state.ready:
+            if app.state.startup_error is not None:
+                raise RuntimeError(f"The API did not start: {app.state.startup_error}")
+            await asyncio.sleep(0.01)
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://benchmark")
+
+        async def send(event: Event) -> bool:
+            method, path = ROUTES[type(event)]
+            response = await client.request(method, path, content=event.model_dump_json(),
+                                             headers={"content-type": "application/json"})
+            return response.status_code == 200
+
+        async def send_batch(events: List[Event]) -> bool:
+            response = await client.post("/batch/", json=[{"event_type": type(event).__name__,
+                                                           "event": event.model_dump(mode="json")}
+                                                          for event in events])
+            return response.status_code == 200
+
+        try:
+            # Setup events reference each other only through ids, so they can be sent concurrently
+            await runner.measure_async("api.setup", send, generator.setup(), concurrency)
+            # Each ballot's requests are sent in order on one lane, as one client would send them
+            events = list(generator.interleave(generator.ballots()))
+            await runner.measure_async("api.ballot", send, events, concurrency,
+                                       key=lambda event: event.aggregate_id)
+            batch_events = batch_generator.setup() + list(batch_generator.interleave(batch_generator.ballots()))
+            batches = [batch_events[index:index + batch_size] for index in range(0, len(batch_events), batch_size)]
+            # Batches are sent one after another, since a later batch may hold the cast of a ballot rated in an
+            # earlier one
+            await runner.measure_async(f"api.batch[{batch_size}]", send_batch, batches, 1, events_per_input=len)
+        finally:
+            await client.aclose()
+
+
+def commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: List[Dict[str, Any]], baseline: Dict[str, Any]) -> None:
+    earlier = {result["name"]: result for result in baseline["results"]}
+    print(f"{'benchmark':<36}{'throughput':>14}{'change':>9}{'p50 us':>12}{'p99 us':>12}{'p99 change':>12}",
+          file=sys.stderr)
+    for result in results:
+        before = earlier.get(result["name"])
+        change = p99_change = ""
+        if before is not None and before["throughput"] > 0 and before["p99_us"] > 0:
+            change = f"{result['throughput'] / before['throughput'] - 1:+.1%}"
+            p99_change = f"{result['p99_us'] / before['p99_us'] - 1:+.1%}"
+        print(f"{result['name']:<36}{result['throughput']:>14,.0f}{change:>9}{result['p50_us']:>12.1f}"
+              f"{result['p99_us']:>12.1f}{p99_change:>12}", file=sys.stderr)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmarks the PhotoVote domain model, codecs and ingest API")
+    parser.add_argument("--only", choices=("micro", "macro"))
+    parser.add_argument("--elections", type=int, default=1)
+    parser.add_argument("--competitions", type=int, default=5)
+    parser.add_argument("--candidates", type=int, default=10)
+    parser.add_argument("--voters", type=int, default=1000)
+    parser.add_argument("--ratings", type=int, default=8, help="ratings per ballot, including changed ones")
+    parser.add_argument("--concurrency", type=int, default=32, help="concurrent client sessions for the API")
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="file to write the results to instead of stdout")
+    parser.add_argument("--baseline", help="earlier results to compare with")
+    arguments = parser.parse_args()
+
+    def generator(seed: int) -> ElectionGenerator:
+        return ElectionGenerator(arguments.elections, arguments.competitions, arguments.candidates, arguments.voters,
+                                 arguments.ratings, seed=seed)
+
+    runner = BenchmarkRunner()
+    if arguments.only != "macro":
+        micro(runner, generator(arguments.seed))
+    if arguments.only != "micro":
+        asyncio.run(macro(runner, generator(arguments.seed), generator(arguments.seed + 1), arguments.concurrency,
+                          arguments.batch_size))
+    results = [result.model_dump() for result in runner.results]
+    report = {"commit": commit(), "timestamp": datetime.now(timezone.utc).isoformat(),
+              "python": platform.python_version(), "machine": platform.machine(), "processors": os.cpu_count(),
+              "parameters": {name: value for name, value in vars(arguments).items()
+                             if name not in ("output", "baseline")},
+              "transport": os.getenv("PHOTOVOTE_TRANSPORT"), "results": results}
+    if arguments.output is not None:
+        with open(arguments.output, "w") as output:
+            json.dump(report, output, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    if arguments.baseline is not None:
+        with open(arguments.baseline, "r") as baseline:
+            compare(results, json.load(baseline))
+
+
+if __name__ == "__main__":
+    main()
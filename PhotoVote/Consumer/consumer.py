@@ -0,0 +1,64 @@
+import asyncio
+import logging
+import os
+import signal
+
+from Common.Cache import TtlCache
+from Common.Consumer import EventConsumer, EventDispatcher
+from Common.Shard import HashRing
+from Common.Transport import TransportMessage
+from PhotoVote.Event import registry
+from PhotoVote.Projection import ReadModel
+from PhotoVote.config import create_transport, create_codec, create_document_store
+
+# Every producer publishes to the election station as well as its own, so the election station alone carries every
+# event, in the order the API accepted them
+PHOTOVOTE_CONSUMER_STATIONS: str = os.getenv("PHOTOVOTE_CONSUMER_STATIONS", "election")
+PHOTOVOTE_CONSUMER_NAME: str = os.getenv("PHOTOVOTE_CONSUMER_NAME", "ReadModelConsumer")
+PHOTOVOTE_CONSUMER_GROUP: str = os.getenv("PHOTOVOTE_CONSUMER_GROUP", "read-model")
+PHOTOVOTE_CONSUMER_WORKERS: int = int(os.getenv("PHOTOVOTE_CONSUMER_WORKERS", "16"))
+PHOTOVOTE_CONSUMER_PREFETCH: int = int(os.getenv("PHOTOVOTE_CONSUMER_PREFETCH", "1000"))
+PHOTOVOTE_CONSUMER_BATCH_SIZE: int = int(os.getenv("PHOTOVOTE_CONSUMER_BATCH_SIZE", "100"))
+PHOTOVOTE_CONSUMER_ACK_BATCH: int = int(os.getenv("PHOTOVOTE_CONSUMER_ACK_BATCH", "100"))
+# Set by PhotoVote.Worker.supervisor when several consumer processes share the work: this process's name and the names
+# of all of them, which place the processes on a hash ring of aggregate ids. Each reads the stations in its own
+# consumer group and handles only the aggregates it owns
+PHOTOVOTE_SHARD: str = os.getenv("PHOTOVOTE_SHARD", "")
+PHOTOVOTE_SHARDS: str = os.getenv("PHOTOVOTE_SHARDS", "")
+
+logger = logging.getLogger(__name__)
+
+
+def failed(message: TransportMessage, event, error: Exception) -> None:
+    logger.error("Failed to handle %s from %s: %s", message.headers.get("EventType"), message.station, error)
+
+
+async def main() -> None:
+    transport = create_transport()
+    await transport.connect()
+    read_model = ReadModel(create_document_store(), TtlCache(1, 0))
+    dispatcher = EventDispatcher()
+    dispatcher.register_all(registry, read_model.apply)
+    group, owns = PHOTOVOTE_CONSUMER_GROUP, None
+    if PHOTOVOTE_SHARD:
+        ring = HashRing(PHOTOVOTE_SHARDS.split(","))
+        group = f"{PHOTOVOTE_CONSUMER_GROUP}-{PHOTOVOTE_SHARD}"
+        owns = lambda aggregate_id: ring.owns(PHOTOVOTE_SHARD, aggregate_id)
+    consumers = [await transport.consumer(station, PHOTOVOTE_CONSUMER_NAME, group)
+                 for station in PHOTOVOTE_CONSUMER_STATIONS.split(",")]
+    consumer = EventConsumer(consumers, create_codec(trusted=True), dispatcher, workers=PHOTOVOTE_CONSUMER_WORKERS,
+                             prefetch=PHOTOVOTE_CONSUMER_PREFETCH, batch_size=PHOTOVOTE_CONSUMER_BATCH_SIZE,
+                             ack_batch=PHOTOVOTE_CONSUMER_ACK_BATCH, on_error=failed, owns=owns)
+    loop = asyncio.get_running_loop()
+    for stop_signal in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(stop_signal, lambda: asyncio.create_task(consumer.stop()))
+    try:
+        await consumer.run()
+    finally:
+        for transport_consumer in consumers:
+            await transport_consumer.close()
+        await transport.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
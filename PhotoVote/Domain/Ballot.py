@@ -1,32 +1,45 @@
-from typing import Dict
-from ulid import MIN_ULID
+from typing import Dict, Optional, Any
 from Common.Domain import AggregateRoot
-from Common.Event import Event
 from PhotoVote.Domain import BallotId, CompetitionId, CandidateId, Rating
 from PhotoVote.Event import BallotCandidateRated, BallotCast
 from PhotoVote.Exception import AlreadyVotedError
 
 
 class Ballot(AggregateRoot[BallotId]):
-    def __init__(self):
-        super().__init__(aggregate_type=BallotId, aggregate_id=BallotId.from_ulid(MIN_ULID))
+    def __init__(self, ballot_id: Optional[BallotId] = None):
+        super().__init__(aggregate_type=BallotId, aggregate_id=ballot_id if ballot_id is not None else BallotId.empty())
         self._ratings: Dict[CompetitionId, Dict[CandidateId, Rating]] = {}
         self._is_cast: bool = False
 
-    def when(self, event: Event) -> None:
-        if isinstance(event, BallotCandidateRated):
-            self._handle_ballot_candidate_rated(event)
-        elif isinstance(event, BallotCast):
-            self._handle_ballot_cast(event)
-        else:
-            raise TypeError(f"Unexpected event type: {type(event)}")
-
     def ensure_valid_state(self) -> None:
         if self._is_cast and len(self._ratings) == 0:
             raise ValueError("Cannot cast an empty ballot")
-        if self.id == MIN_ULID or self.id is None:
+        if self.id is None or self.id == BallotId.empty():
             raise ValueError("Invalid ULID for Ballot Id")
 
+    def snapshot(self) -> Dict[str, Any]:
+        state = super().snapshot()
+        state["is_cast"] = self._is_cast
+        # The ballot's ids are encoded, and parsed again on restore, in one batch per id type
+        competition_ids = CompetitionId.encode_many(self._ratings)
+        candidate_ids = iter(CandidateId.encode_many([candidate_id for ratings in self._ratings.values()
+                                                      for candidate_id in ratings]))
+        state["ratings"] = {competition_id: {next(candidate_ids): int(rating) for rating in ratings.values()}
+                            for competition_id, ratings in zip(competition_ids, self._ratings.values())}
+        return state
+
+    def restore(self, state: Dict[str, Any]) -> None:
+        super().restore(state)
+        self._is_cast = state["is_cast"]
+        ratings = state["ratings"]
+        competition_ids = CompetitionId.parse_many(list(ratings))
+        candidate_ids = iter(CandidateId.parse_many([candidate_id for candidates in ratings.values()
+                                                     for candidate_id in candidates]))
+        self._ratings = {competition_id: {next(candidate_ids): Rating.from_int(rating)
+                                          for rating in candidates.values()}
+                         for competition_id, candidates in zip(competition_ids, ratings.values())}
+
+    @AggregateRoot.handles(BallotCandidateRated)
     def _handle_ballot_candidate_rated(self, event: BallotCandidateRated) -> None:
         if self._is_cast is True:
             raise AlreadyVotedError("Ballot is already cast")
@@ -39,7 +52,10 @@ class Ballot(AggregateRoot[BallotId]):
         else:
             self._remove_ratings(competition_id, candidate_id)
 
+    @AggregateRoot.handles(BallotCast)
     def _handle_ballot_cast(self, event: BallotCast) -> None:
+        if self._is_cast is True:
+            raise AlreadyVotedError("Ballot is already cast")
         self._is_cast = True
 
     def _update_ratings(self, competition_id: CompetitionId, candidate_id: CandidateId, rating: Rating):
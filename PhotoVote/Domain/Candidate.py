@@ -0,0 +1,108 @@
+from typing import Dict, Optional, Any
+from Common.Domain import AggregateRoot
+from PhotoVote.Domain import CandidateId, CompetitionId, ElectionId
+from PhotoVote.Event import CandidateAdded, CandidateRemoved, CandidateNameChanged, CandidateDescriptionChanged, \
+    CandidateImageUrlChanged, CandidateImageCaptionChanged
+
+
+class Candidate(AggregateRoot[CandidateId]):
+    def __init__(self, candidate_id: Optional[CandidateId] = None):
+        super().__init__(aggregate_type=CandidateId,
+                         aggregate_id=candidate_id if candidate_id is not None else CandidateId.empty())
+        self._election_id: Optional[ElectionId] = None
+        self._competition_id: Optional[CompetitionId] = None
+        self._name: str = ""
+        self._description: Optional[str] = None
+        self._image_url: Optional[str] = None
+        self._image_caption: Optional[str] = None
+
+    @property
+    def election_id(self) -> Optional[ElectionId]:
+        return self._election_id
+
+    @property
+    def competition_id(self) -> Optional[CompetitionId]:
+        return self._competition_id
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def description(self) -> Optional[str]:
+        return self._description
+
+    @property
+    def image_url(self) -> Optional[str]:
+        return self._image_url
+
+    @property
+    def image_caption(self) -> Optional[str]:
+        return self._image_caption
+
+    def ensure_valid_state(self) -> None:
+        if self.id is None or self.id == CandidateId.empty():
+            raise ValueError("Invalid ULID for Candidate Id")
+        if self._competition_id is not None and len(self._name.strip()) == 0:
+            raise ValueError("A candidate must have a name")
+
+    def snapshot(self) -> Dict[str, Any]:
+        state = super().snapshot()
+        state["election_id"] = str(self._election_id) if self._election_id is not None else None
+        state["competition_id"] = str(self._competition_id) if self._competition_id is not None else None
+        state["name"] = self._name
+        state["description"] = self._description
+        state["image_url"] = self._image_url
+        state["image_caption"] = self._image_caption
+        return state
+
+    def restore(self, state: Dict[str, Any]) -> None:
+        super().restore(state)
+        self._election_id = ElectionId.from_string(state["election_id"]) if state["election_id"] is not None \
+            else None
+        self._competition_id = CompetitionId.from_string(state["competition_id"]) \
+            if state["competition_id"] is not None else None
+        self._name = state["name"]
+        self._description = state["description"]
+        self._image_url = state["image_url"]
+        self._image_caption = state["image_caption"]
+
+    def _ensure_added(self) -> None:
+        if self._competition_id is None:
+            raise ValueError("Candidate has not been added")
+
+    @AggregateRoot.handles(CandidateAdded)
+    def _handle_candidate_added(self, event: CandidateAdded) -> None:
+        if self._competition_id is not None:
+            raise ValueError("Candidate is already added")
+        self._election_id = ElectionId.from_string(event.election_id)
+        self._competition_id = CompetitionId.from_string(event.competition_id)
+        self._name = event.name
+        self._description = event.description
+
+    @AggregateRoot.handles(CandidateRemoved)
+    def _handle_candidate_removed(self, event: CandidateRemoved) -> None:
+        self._ensure_added()
+        if CompetitionId.from_string(event.competition_id) != self._competition_id:
+            raise ValueError(f"Candidate belongs to competition {self._competition_id}")
+        self.delete()
+
+    @AggregateRoot.handles(CandidateNameChanged)
+    def _handle_candidate_name_changed(self, event: CandidateNameChanged) -> None:
+        self._ensure_added()
+        self._name = event.name
+
+    @AggregateRoot.handles(CandidateDescriptionChanged)
+    def _handle_candidate_description_changed(self, event: CandidateDescriptionChanged) -> None:
+        self._ensure_added()
+        self._description = event.description
+
+    @AggregateRoot.handles(CandidateImageUrlChanged)
+    def _handle_candidate_image_url_changed(self, event: CandidateImageUrlChanged) -> None:
+        self._ensure_added()
+        self._image_url = event.url
+
+    @AggregateRoot.handles(CandidateImageCaptionChanged)
+    def _handle_candidate_image_caption_changed(self, event: CandidateImageCaptionChanged) -> None:
+        self._ensure_added()
+        self._image_caption = event.caption
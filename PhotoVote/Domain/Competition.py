@@ -0,0 +1,76 @@
+from typing import Dict, Optional, Any
+from Common.Domain import AggregateRoot
+from PhotoVote.Domain import CompetitionId, ElectionId
+from PhotoVote.Event import CompetitionAdded, CompetitionRemoved, CompetitionNameChanged, \
+    CompetitionDescriptionChanged
+
+
+class Competition(AggregateRoot[CompetitionId]):
+    def __init__(self, competition_id: Optional[CompetitionId] = None):
+        super().__init__(aggregate_type=CompetitionId,
+                         aggregate_id=competition_id if competition_id is not None else CompetitionId.empty())
+        self._election_id: Optional[ElectionId] = None
+        self._name: str = ""
+        self._description: Optional[str] = None
+
+    @property
+    def election_id(self) -> Optional[ElectionId]:
+        return self._election_id
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def description(self) -> Optional[str]:
+        return self._description
+
+    def ensure_valid_state(self) -> None:
+        if self.id is None or self.id == CompetitionId.empty():
+            raise ValueError("Invalid ULID for Competition Id")
+        if self._election_id is not None and len(self._name.strip()) == 0:
+            raise ValueError("A competition must have a name")
+
+    def snapshot(self) -> Dict[str, Any]:
+        state = super().snapshot()
+        state["election_id"] = str(self._election_id) if self._election_id is not None else None
+        state["name"] = self._name
+        state["description"] = self._description
+        return state
+
+    def restore(self, state: Dict[str, Any]) -> None:
+        super().restore(state)
+        self._election_id = ElectionId.from_string(state["election_id"]) if state["election_id"] is not None \
+            else None
+        self._name = state["name"]
+        self._description = state["description"]
+
+    def _ensure_added(self, election_id: str) -> None:
+        # Every event after the first names the election again, which must be the one the competition was added to
+        if self._election_id is None:
+            raise ValueError("Competition has not been added")
+        if ElectionId.from_string(election_id) != self._election_id:
+            raise ValueError(f"Competition belongs to election {self._election_id}")
+
+    @AggregateRoot.handles(CompetitionAdded)
+    def _handle_competition_added(self, event: CompetitionAdded) -> None:
+        if self._election_id is not None:
+            raise ValueError("Competition is already added")
+        self._election_id = ElectionId.from_string(event.election_id)
+        self._name = event.name
+        self._description = event.description
+
+    @AggregateRoot.handles(CompetitionRemoved)
+    def _handle_competition_removed(self, event: CompetitionRemoved) -> None:
+        self._ensure_added(event.election_id)
+        self.delete()
+
+    @AggregateRoot.handles(CompetitionNameChanged)
+    def _handle_competition_name_changed(self, event: CompetitionNameChanged) -> None:
+        self._ensure_added(event.election_id)
+        self._name = event.name
+
+    @AggregateRoot.handles(CompetitionDescriptionChanged)
+    def _handle_competition_description_changed(self, event: CompetitionDescriptionChanged) -> None:
+        self._ensure_added(event.election_id)
+        self._description = event.description
@@ -0,0 +1,67 @@
+from typing import Dict, Optional, Any
+from Common.Domain import AggregateRoot
+from PhotoVote.Domain import ElectionId
+from PhotoVote.Event import ElectionCreated, ElectionDeleted, ElectionNameChanged, ElectionDescriptionChanged
+
+
+class Election(AggregateRoot[ElectionId]):
+    def __init__(self, election_id: Optional[ElectionId] = None):
+        super().__init__(aggregate_type=ElectionId,
+                         aggregate_id=election_id if election_id is not None else ElectionId.empty())
+        self._created: bool = False
+        self._name: str = ""
+        self._description: Optional[str] = None
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def description(self) -> Optional[str]:
+        return self._description
+
+    def ensure_valid_state(self) -> None:
+        if self.id is None or self.id == ElectionId.empty():
+            raise ValueError("Invalid ULID for Election Id")
+        if self._created and len(self._name.strip()) == 0:
+            raise ValueError("An election must have a name")
+
+    def snapshot(self) -> Dict[str, Any]:
+        state = super().snapshot()
+        state["created"] = self._created
+        state["name"] = self._name
+        state["description"] = self._description
+        return state
+
+    def restore(self, state: Dict[str, Any]) -> None:
+        super().restore(state)
+        self._created = state["created"]
+        self._name = state["name"]
+        self._description = state["description"]
+
+    def _ensure_created(self) -> None:
+        if not self._created:
+            raise ValueError("Election has not been created")
+
+    @AggregateRoot.handles(ElectionCreated)
+    def _handle_election_created(self, event: ElectionCreated) -> None:
+        if self._created:
+            raise ValueError("Election is already created")
+        self._created = True
+        self._name = event.name
+        self._description = event.description
+
+    @AggregateRoot.handles(ElectionDeleted)
+    def _handle_election_deleted(self, event: ElectionDeleted) -> None:
+        self._ensure_created()
+        self.delete()
+
+    @AggregateRoot.handles(ElectionNameChanged)
+    def _handle_election_name_changed(self, event: ElectionNameChanged) -> None:
+        self._ensure_created()
+        self._name = event.name
+
+    @AggregateRoot.handles(ElectionDescriptionChanged)
+    def _handle_election_description_changed(self, event: ElectionDescriptionChanged) -> None:
+        self._ensure_created()
+        self._description = event.description
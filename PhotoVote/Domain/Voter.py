@@ -0,0 +1,49 @@
+from typing import Dict, Optional, Any
+from Common.Domain import AggregateRoot
+from PhotoVote.Domain import VoterId
+from PhotoVote.Event import VoterRegistered
+from PhotoVote.Exception import AlreadyRegisteredError
+
+
+class Voter(AggregateRoot[VoterId]):
+    # Registering is a voter's only event; the email's uniqueness across voters is VoterIndex's to check
+    def __init__(self, voter_id: Optional[VoterId] = None):
+        super().__init__(aggregate_type=VoterId, aggregate_id=voter_id if voter_id is not None else VoterId.empty())
+        self._registered: bool = False
+        self._name: str = ""
+        self._email: str = ""
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def email(self) -> str:
+        return self._email
+
+    def ensure_valid_state(self) -> None:
+        if self.id is None or self.id == VoterId.empty():
+            raise ValueError("Invalid ULID for Voter Id")
+        if self._registered and len(self._email.strip()) == 0:
+            raise ValueError("A voter must have an email")
+
+    def snapshot(self) -> Dict[str, Any]:
+        state = super().snapshot()
+        state["registered"] = self._registered
+        state["name"] = self._name
+        state["email"] = self._email
+        return state
+
+    def restore(self, state: Dict[str, Any]) -> None:
+        super().restore(state)
+        self._registered = state["registered"]
+        self._name = state["name"]
+        self._email = state["email"]
+
+    @AggregateRoot.handles(VoterRegistered)
+    def _handle_voter_registered(self, event: VoterRegistered) -> None:
+        if self._registered:
+            raise AlreadyRegisteredError("Voter is already registered")
+        self._registered = True
+        self._name = event.name
+        self._email = event.email
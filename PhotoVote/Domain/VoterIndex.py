@@ -0,0 +1,93 @@
+from contextlib import contextmanager
+from typing import Iterable, Optional, Tuple, Iterator, List
+
+from Common.Event import Event
+from Common.Index import MembershipIndex
+from PhotoVote.Event import BallotCast, VoterRegistered
+from PhotoVote.Exception import AlreadyVotedError, AlreadyRegisteredError
+
+
+class VoterIndex:
+    # Rejects a second ballot cast by a voter in an election, and a second registration of an email, before either is
+    # produced. Votes are keyed by election and voter; a ballot cast without a voter_id counts as its own voter, so
+    # only recasting it is caught. Emails are compared stripped and case-folded.
+    #
+    # Both indexes can be rebuilt from the event stream with rebuild(), or given the keys of some events they lack with
+    # restore()
+    def __init__(self, votes: Optional[MembershipIndex] = None, emails: Optional[MembershipIndex] = None) -> None:
+        self._votes: MembershipIndex = votes if votes is not None else MembershipIndex()
+        self._emails: MembershipIndex = emails if emails is not None else MembershipIndex()
+
+    @property
+    def votes(self) -> MembershipIndex:
+        return self._votes
+
+    @property
+    def emails(self) -> MembershipIndex:
+        return self._emails
+
+    @staticmethod
+    def normalize_email(email: str) -> str:
+        return email.strip().casefold()
+
+    @staticmethod
+    def vote_key(event: BallotCast) -> str:
+        return f"{event.election_id}:{event.voter_id if event.voter_id is not None else event.aggregate_id}"
+
+    def _key(self, event: Event) -> Optional[Tuple[MembershipIndex, str]]:
+        if isinstance(event, BallotCast):
+            return self._votes, VoterIndex.vote_key(event)
+        if isinstance(event, VoterRegistered):
+            return self._emails, VoterIndex.normalize_email(event.email)
+        return None
+
+    def has_voted(self, election_id: str, voter_id: str) -> bool:
+        return f"{election_id}:{voter_id}" in self._votes
+
+    def is_registered(self, email: str) -> bool:
+        return VoterIndex.normalize_email(email) in self._emails
+
+    @contextmanager
+    def claim(self, event: Event) -> Iterator[None]:
+        # Guards accepting event: raises if it is a duplicate, and otherwise records it once the block succeeds
+        key = self._key(event)
+        if key is None:
+            yield
+            return
+        index, value = key
+        if not index.claim(value):
+            if index is self._votes:
+                raise AlreadyVotedError("The voter has already cast a ballot in this election")
+            raise AlreadyRegisteredError("The email is already registered")
+        try:
+            yield
+        except BaseException:
+            index.release(value)
+            raise
+        index.commit(value)
+
+    def apply(self, event: Event) -> None:
+        key = self._key(event)
+        if key is not None:
+            key[0].add(key[1])
+
+    @staticmethod
+    def _keys(events: Iterable[Event]) -> Tuple[List[str], List[str]]:
+        votes = []
+        emails = []
+        for event in events:
+            if isinstance(event, BallotCast):
+                votes.append(VoterIndex.vote_key(event))
+            elif isinstance(event, VoterRegistered):
+                emails.append(VoterIndex.normalize_email(event.email))
+        return votes, emails
+
+    def rebuild(self, events: Iterable[Event]) -> None:
+        votes, emails = VoterIndex._keys(events)
+        self._votes.rebuild(votes)
+        self._emails.rebuild(emails)
+
+    def restore(self, events: Iterable[Event]) -> int:
+        # Returns how many keys were missing
+        votes, emails = VoterIndex._keys(events)
+        return self._votes.update(votes) + self._emails.update(emails)
@@ -4,6 +4,7 @@ from Common.Event import Event
 
 class BallotCandidateRated(Event):
     election_id: str
+    competition_id: str
     candidate_id: str
     ballot_id: str
     rating: Optional[int]
@@ -1,5 +1,7 @@
+from typing import Optional
 from Common.Event import Event
 
 
 class BallotCast(Event):
     election_id: str
+    voter_id: Optional[str] = None
@@ -15,3 +15,4 @@ from .ElectionDeleted import ElectionDeleted
 from .ElectionNameChanged import ElectionNameChanged
 from .ElectionDescriptionChanged import ElectionDescriptionChanged
 from .VoterRegistered import VoterRegistered
+from .registry import registry
@@ -0,0 +1,39 @@
+from Common.Event import EventRegistry
+from PhotoVote.Event.BallotCast import BallotCast
+from PhotoVote.Event.BallotCandidateRated import BallotCandidateRated
+from PhotoVote.Event.CandidateAdded import CandidateAdded
+from PhotoVote.Event.CandidateRemoved import CandidateRemoved
+from PhotoVote.Event.CandidateNameChanged import CandidateNameChanged
+from PhotoVote.Event.CandidateImageUrlChanged import CandidateImageUrlChanged
+from PhotoVote.Event.CandidateDescriptionChanged import CandidateDescriptionChanged
+from PhotoVote.Event.CandidateImageCaptionChanged import CandidateImageCaptionChanged
+from PhotoVote.Event.CompetitionAdded import CompetitionAdded
+from PhotoVote.Event.CompetitionRemoved import CompetitionRemoved
+from PhotoVote.Event.CompetitionNameChanged import CompetitionNameChanged
+from PhotoVote.Event.CompetitionDescriptionChanged import CompetitionDescriptionChanged
+from PhotoVote.Event.ElectionCreated import ElectionCreated
+from PhotoVote.Event.ElectionDeleted import ElectionDeleted
+from PhotoVote.Event.ElectionNameChanged import ElectionNameChanged
+from PhotoVote.Event.ElectionDescriptionChanged import ElectionDescriptionChanged
+from PhotoVote.Event.VoterRegistered import VoterRegistered
+
+# Tags are part of the binary wire format: never change or reuse one, only add new ones. Adding a field to an event
+# means appending it to the class and bumping its version here
+registry: EventRegistry = EventRegistry("PhotoVote.Event")
+registry.register(ElectionCreated, 1)
+registry.register(ElectionDeleted, 2)
+registry.register(ElectionNameChanged, 3)
+registry.register(ElectionDescriptionChanged, 4)
+registry.register(CompetitionAdded, 10)
+registry.register(CompetitionRemoved, 11)
+registry.register(CompetitionNameChanged, 12)
+registry.register(CompetitionDescriptionChanged, 13)
+registry.register(CandidateAdded, 20)
+registry.register(CandidateRemoved, 21)
+registry.register(CandidateNameChanged, 22)
+registry.register(CandidateDescriptionChanged, 23)
+registry.register(CandidateImageUrlChanged, 24)
+registry.register(CandidateImageCaptionChanged, 25)
+registry.register(VoterRegistered, 30)
+registry.register(BallotCandidateRated, 40, version=2)
+registry.register(BallotCast, 41, version=2)
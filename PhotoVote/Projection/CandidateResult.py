@@ -0,0 +1,10 @@
+from typing import NamedTuple
+
+
+class CandidateResult(NamedTuple):
+    competition_id: str
+    candidate_id: str
+    total: int
+    count: int
+    mean: float
+    rank: int
@@ -0,0 +1,34 @@
+from typing import Dict, List, Sequence
+import numpy as np
+
+
+class IdIndex:
+    # Assigns dense integer indexes to string ids in first-seen order, so ids can be stored in NumPy columns
+    def __init__(self) -> None:
+        self._indexes: Dict[str, int] = {}
+        self._ids: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self._indexes)
+
+    def __contains__(self, value: str) -> bool:
+        return value in self._indexes
+
+    @property
+    def ids(self) -> List[str]:
+        # Dicts keep insertion order, so the reverse mapping can be rebuilt from the keys whenever it falls behind
+        if len(self._ids) < len(self._indexes):
+            self._ids = list(self._indexes)
+        return self._ids
+
+    def get(self, value: str) -> int:
+        indexes = self._indexes
+        return indexes.setdefault(value, len(indexes))
+
+    def get_many(self, values: Sequence[str]) -> np.ndarray:
+        indexes = self._indexes
+        setdefault = indexes.setdefault
+        return np.fromiter([setdefault(value, len(indexes)) for value in values], dtype=np.int32, count=len(values))
+
+    def id(self, index: int) -> str:
+        return self.ids[index]
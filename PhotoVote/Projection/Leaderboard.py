@@ -0,0 +1,88 @@
+from bisect import bisect_left, insort
+from typing import Dict, List, Tuple, Set, Optional, Iterable
+
+from Common.Event import Event
+from PhotoVote.Event import BallotCandidateRated, BallotCast
+from PhotoVote.Projection.LeaderboardEntry import LeaderboardEntry
+
+
+class Leaderboard:
+    # Live competition standings, maintained one event at a time.
+    #
+    # Ratings on a ballot are held until the ballot is cast and then added to the running total and count of each
+    # candidate. Every competition keeps its candidates in a list sorted by (-total, candidate_id), so a changed total
+    # is moved with two binary searches and the top N is a slice. A per-competition version changes with every update,
+    # letting readers skip unchanged standings.
+    def __init__(self) -> None:
+        self._ballots: Dict[str, Dict[str, Tuple[str, int]]] = {}
+        self._cast: Set[str] = set()
+        self._totals: Dict[str, List[int]] = {}
+        self._competitions: Dict[str, str] = {}
+        self._rankings: Dict[str, List[Tuple[int, str]]] = {}
+        self._versions: Dict[str, int] = {}
+
+    def apply(self, event: Event) -> None:
+        if isinstance(event, BallotCandidateRated):
+            self._handle_ballot_candidate_rated(event)
+        elif isinstance(event, BallotCast):
+            self._handle_ballot_cast(event)
+
+    def apply_all(self, events: Iterable[Event]) -> None:
+        for event in events:
+            self.apply(event)
+
+    def _handle_ballot_candidate_rated(self, event: BallotCandidateRated) -> None:
+        # Ballot rejects ratings once it is cast, so a rating for a cast ballot can only be a duplicate
+        if event.aggregate_id in self._cast:
+            return
+        ratings = self._ballots.setdefault(event.aggregate_id, {})
+        if event.rating is None:
+            ratings.pop(event.candidate_id, None)
+        else:
+            ratings[event.candidate_id] = (event.competition_id, event.rating)
+
+    def _handle_ballot_cast(self, event: BallotCast) -> None:
+        if event.aggregate_id in self._cast:
+            return
+        self._cast.add(event.aggregate_id)
+        # A cast ballot can no longer change, so only the fact that it was cast needs to be remembered
+        for candidate_id, (competition_id, rating) in self._ballots.pop(event.aggregate_id, {}).items():
+            self._add(competition_id, candidate_id, rating)
+
+    def _add(self, competition_id: str, candidate_id: str, rating: int) -> None:
+        ranking = self._rankings.setdefault(competition_id, [])
+        totals = self._totals.get(candidate_id)
+        if totals is None:
+            totals = self._totals[candidate_id] = [0, 0]
+            self._competitions[candidate_id] = competition_id
+        else:
+            del ranking[bisect_left(ranking, (-totals[0], candidate_id))]
+        totals[0] += rating
+        totals[1] += 1
+        insort(ranking, (-totals[0], candidate_id))
+        self._versions[competition_id] = self._versions.get(competition_id, 0) + 1
+
+    def version(self, competition_id: str) -> int:
+        return self._versions.get(competition_id, 0)
+
+    def _entry(self, ranking: List[Tuple[int, str]], key: Tuple[int, str]) -> LeaderboardEntry:
+        total, count = self._totals[key[1]]
+        # Candidates with equal totals share the best rank among them
+        return LeaderboardEntry(key[1], total, count, total / count, bisect_left(ranking, (key[0], "")) + 1)
+
+    def top(self, competition_id: str, n: Optional[int] = None) -> List[LeaderboardEntry]:
+        ranking = self._rankings.get(competition_id, [])
+        return [self._entry(ranking, key) for key in (ranking if n is None else ranking[:n])]
+
+    def candidate(self, candidate_id: str) -> Optional[LeaderboardEntry]:
+        totals = self._totals.get(candidate_id)
+        if totals is None:
+            return None
+        return self._entry(self._rankings[self._competitions[candidate_id]], (-totals[0], candidate_id))
+
+    async def read_top(self, competition_id: str, n: Optional[int] = None) -> Tuple[int, List[LeaderboardEntry]]:
+        # Reads are served from memory without awaiting anything, so the version and standings are consistent
+        return self.version(competition_id), self.top(competition_id, n)
+
+    async def read_candidate(self, candidate_id: str) -> Optional[LeaderboardEntry]:
+        return self.candidate(candidate_id)
@@ -0,0 +1,9 @@
+from typing import NamedTuple
+
+
+class LeaderboardEntry(NamedTuple):
+    candidate_id: str
+    total: int
+    count: int
+    mean: float
+    rank: int
@@ -0,0 +1,142 @@
+from typing import Optional, Dict, Any, List, Tuple, Union
+
+from Common.Cache import TtlCache
+from Common.Event import Event
+from Common.Store import DocumentStore
+from PhotoVote.Event import BallotCast, BallotCandidateRated, CandidateAdded, CandidateRemoved, CandidateNameChanged, \
+    CandidateDescriptionChanged, CandidateImageUrlChanged, CandidateImageCaptionChanged, CompetitionAdded, \
+    CompetitionRemoved, CompetitionNameChanged, CompetitionDescriptionChanged, ElectionCreated, ElectionDeleted, \
+    ElectionNameChanged, ElectionDescriptionChanged
+
+Document = Dict[str, Any]
+CacheKey = Tuple[str, str]
+
+
+class ReadModel:
+    # Documents for elections, competitions, candidates and ballots, projected from events into a DocumentStore and
+    # read through an in-process LRU/TTL cache.
+    #
+    # Each event invalidates exactly the cache entries it changes: the document of its aggregate and, when it adds or
+    # removes a competition or candidate, the list that contains it. The TTL only bounds how stale an entry can be when
+    # another process updates the store. Cached documents are shared between readers and must not be mutated.
+    _MISSING: Document = {}
+
+    def __init__(self, store: DocumentStore, cache: TtlCache[CacheKey, Union[Document, List[Document]]]) -> None:
+        self._store: DocumentStore = store
+        self._cache: TtlCache[CacheKey, Union[Document, List[Document]]] = cache
+
+    async def _get(self, collection: str, key: str) -> Optional[Document]:
+        document = self._cache.get((collection, key))
+        if document is None:
+            document = await self._store.get(collection, key)
+            # Misses are cached too, so repeated lookups of an unknown id don't reach the store
+            self._cache.put((collection, key), document if document is not None else ReadModel._MISSING)
+        return document if document is not ReadModel._MISSING else None
+
+    async def _find(self, collection: str, field: str, value: str) -> List[Document]:
+        key = (f"{collection}.{field}", value)
+        documents = self._cache.get(key)
+        if documents is None:
+            documents = await self._store.find(collection, field, value)
+            self._cache.put(key, documents)
+        return documents
+
+    async def election(self, election_id: str) -> Optional[Document]:
+        return await self._get("election", election_id)
+
+    async def competitions(self, election_id: str) -> List[Document]:
+        return await self._find("competition", "election_id", election_id)
+
+    async def competition(self, competition_id: str) -> Optional[Document]:
+        return await self._get("competition", competition_id)
+
+    async def candidates(self, competition_id: str) -> List[Document]:
+        return await self._find("candidate", "competition_id", competition_id)
+
+    async def candidate(self, candidate_id: str) -> Optional[Document]:
+        return await self._get("candidate", candidate_id)
+
+    async def ballot(self, ballot_id: str) -> Optional[Document]:
+        return await self._get("ballot", ballot_id)
+
+    async def _create(self, collection: str, key: str, document: Document, *lists: CacheKey) -> None:
+        await self._store.put(collection, key, document)
+        self._invalidate((collection, key), *lists)
+
+    async def _update(self, collection: str, key: str, **fields: Any) -> None:
+        document = await self._store.get(collection, key)
+        if document is None:
+            return
+        document.update(fields)
+        await self._store.put(collection, key, document)
+        self._invalidate((collection, key), *self._lists(collection, document))
+
+    async def _remove(self, collection: str, key: str) -> None:
+        document = await self._store.get(collection, key)
+        await self._store.delete(collection, key)
+        self._invalidate((collection, key), *(self._lists(collection, document) if document is not None else []))
+
+    @staticmethod
+    def _lists(collection: str, document: Document) -> List[CacheKey]:
+        if collection == "competition":
+            return [("competition.election_id", document["election_id"])]
+        if collection == "candidate":
+            return [("candidate.competition_id", document["competition_id"])]
+        return []
+
+    def _invalidate(self, *keys: CacheKey) -> None:
+        for key in keys:
+            self._cache.evict(key)
+
+    async def apply(self, event: Event) -> None:
+        if isinstance(event, ElectionCreated):
+            await self._create("election", event.aggregate_id, {"id": event.aggregate_id, "name": event.name,
+                                                                "description": event.description})
+        elif isinstance(event, ElectionDeleted):
+            await self._remove("election", event.aggregate_id)
+        elif isinstance(event, ElectionNameChanged):
+            await self._update("election", event.aggregate_id, name=event.name)
+        elif isinstance(event, ElectionDescriptionChanged):
+            await self._update("election", event.aggregate_id, description=event.description)
+        elif isinstance(event, CompetitionAdded):
+            await self._create("competition", event.aggregate_id,
+                               {"id": event.aggregate_id, "election_id": event.election_id, "name": event.name,
+                                "description": event.description},
+                               ("competition.election_id", event.election_id))
+        elif isinstance(event, CompetitionRemoved):
+            await self._remove("competition", event.aggregate_id)
+        elif isinstance(event, CompetitionNameChanged):
+            await self._update("competition", event.aggregate_id, name=event.name)
+        elif isinstance(event, CompetitionDescriptionChanged):
+            await self._update("competition", event.aggregate_id, description=event.description)
+        elif isinstance(event, CandidateAdded):
+            await self._create("candidate", event.aggregate_id,
+                               {"id": event.aggregate_id, "election_id": event.election_id,
+                                "competition_id": event.competition_id, "name": event.name,
+                                "description": event.description, "image_url": None, "image_caption": None},
+                               ("candidate.competition_id", event.competition_id))
+        elif isinstance(event, CandidateRemoved):
+            await self._remove("candidate", event.aggregate_id)
+        elif isinstance(event, CandidateNameChanged):
+            await self._update("candidate", event.aggregate_id, name=event.name)
+        elif isinstance(event, CandidateDescriptionChanged):
+            await self._update("candidate", event.aggregate_id, description=event.description)
+        elif isinstance(event, CandidateImageUrlChanged):
+            await self._update("candidate", event.aggregate_id, image_url=event.url)
+        elif isinstance(event, CandidateImageCaptionChanged):
+            await self._update("candidate", event.aggregate_id, image_caption=event.caption)
+        elif isinstance(event, BallotCandidateRated):
+            await self._rate(event)
+        elif isinstance(event, BallotCast):
+            await self._update("ballot", event.aggregate_id, cast=True)
+
+    async def _rate(self, event: BallotCandidateRated) -> None:
+        ballot = await self._store.get("ballot", event.aggregate_id)
+        if ballot is None:
+            ballot = {"id": event.aggregate_id, "election_id": event.election_id, "cast": False, "ratings": {}}
+        if event.rating is None:
+            ballot["ratings"].pop(event.candidate_id, None)
+        else:
+            ballot["ratings"][event.candidate_id] = {"competition_id": event.competition_id, "rating": event.rating}
+        await self._store.put("ballot", event.aggregate_id, ballot)
+        self._invalidate(("ballot", event.aggregate_id))
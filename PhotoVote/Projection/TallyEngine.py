@@ -0,0 +1,153 @@
+from typing import Dict, List, Sequence, Optional, Iterable
+import numpy as np
+
+from Common.Event import Event
+from PhotoVote.Event import BallotCandidateRated, BallotCast
+from PhotoVote.Projection.CandidateResult import CandidateResult
+from PhotoVote.Projection.IdIndex import IdIndex
+
+
+class TallyEngine:
+    # Computes competition results from the BallotCandidateRated and BallotCast streams.
+    #
+    # Ratings are kept as four int32 columns (ballot, competition, candidate, rating), with ids replaced by dense
+    # indexes. A removed rating is stored as REMOVED. Events can keep arriving after results have been read: they are
+    # buffered and appended to the columns on the next read, which only needs vectorized passes over the columns.
+    # Only the latest rating of a candidate on a ballot counts, and only if that ballot has been cast.
+    REMOVED: int = -1
+    RANK_BY = ("total", "mean")
+
+    def __init__(self, rank_by: str = "total") -> None:
+        if rank_by not in TallyEngine.RANK_BY:
+            raise ValueError(f"rank_by must be one of {', '.join(TallyEngine.RANK_BY)}")
+        self._rank_by: str = rank_by
+        self._ballots: IdIndex = IdIndex()
+        self._competitions: IdIndex = IdIndex()
+        self._candidates: IdIndex = IdIndex()
+        self._columns: List[np.ndarray] = [np.empty(0, dtype=np.int32) for _ in range(4)]
+        self._chunks: List[List[np.ndarray]] = [[], [], [], []]
+        self._pending: List[List[int]] = [[], [], [], []]
+        self._cast: np.ndarray = np.zeros(0, dtype=bool)
+        self._pending_casts: List[int] = []
+        self._results: Optional[Dict[str, List[CandidateResult]]] = None
+
+    def __len__(self) -> int:
+        return len(self._columns[0]) + sum(len(chunk) for chunk in self._chunks[0]) + len(self._pending[0])
+
+    def apply(self, event: Event) -> None:
+        if isinstance(event, BallotCandidateRated):
+            self._pending[0].append(self._ballots.get(event.aggregate_id))
+            self._pending[1].append(self._competitions.get(event.competition_id))
+            self._pending[2].append(self._candidates.get(event.candidate_id))
+            self._pending[3].append(TallyEngine.REMOVED if event.rating is None else event.rating)
+            self._results = None
+        elif isinstance(event, BallotCast):
+            self._pending_casts.append(self._ballots.get(event.aggregate_id))
+            self._results = None
+
+    def apply_all(self, events: Iterable[Event]) -> None:
+        for event in events:
+            self.apply(event)
+
+    def ingest_ratings(self, ballot_ids: Sequence[str], competition_ids: Sequence[str],
+                       candidate_ids: Sequence[str], ratings: Sequence[Optional[int]]) -> None:
+        # Columnar bulk ingestion, for replaying or importing ratings without building an event per rating
+        if not len(ballot_ids) == len(competition_ids) == len(candidate_ids) == len(ratings):
+            raise ValueError("All rating columns must have the same length")
+        self._flush()
+        self._chunks[0].append(self._ballots.get_many(ballot_ids))
+        self._chunks[1].append(self._competitions.get_many(competition_ids))
+        self._chunks[2].append(self._candidates.get_many(candidate_ids))
+        if isinstance(ratings, np.ndarray) and ratings.dtype.kind in "iu":
+            self._chunks[3].append(ratings.astype(np.int32))
+        else:
+            self._chunks[3].append(np.fromiter([TallyEngine.REMOVED if rating is None else rating
+                                                for rating in ratings], dtype=np.int32, count=len(ratings)))
+        self._results = None
+
+    def ingest_casts(self, ballot_ids: Sequence[str]) -> None:
+        self._pending_casts.extend(self._ballots.get_many(ballot_ids).tolist())
+        self._results = None
+
+    def _flush(self) -> None:
+        if len(self._pending[0]) > 0:
+            for column, pending in zip(self._chunks, self._pending):
+                column.append(np.asarray(pending, dtype=np.int32))
+            self._pending = [[], [], [], []]
+
+    def _consolidate(self) -> None:
+        self._flush()
+        if len(self._chunks[0]) > 0:
+            self._columns = [np.concatenate([column] + chunks) for column, chunks in zip(self._columns,
+                                                                                         self._chunks)]
+            self._chunks = [[], [], [], []]
+        if len(self._cast) < len(self._ballots):
+            self._cast = np.concatenate([self._cast, np.zeros(len(self._ballots) - len(self._cast), dtype=bool)])
+        if len(self._pending_casts) > 0:
+            self._cast[np.asarray(self._pending_casts, dtype=np.int64)] = True
+            self._pending_casts = []
+
+    def compact(self) -> None:
+        # Drops every rating that has been superseded or removed. Results are unchanged, but the columns shrink to
+        # one row per rated candidate per ballot
+        self._consolidate()
+        latest = self._latest()
+        latest = latest[self._columns[3][latest] != TallyEngine.REMOVED]
+        self._columns = [column[latest] for column in self._columns]
+
+    def _latest(self) -> np.ndarray:
+        # Row indexes of the last rating of each candidate on each ballot, in row order
+        ballot, _, candidate, _ = self._columns
+        key = ballot.astype(np.int64) * max(len(self._candidates), 1) + candidate
+        _, first_in_reversed = np.unique(key[::-1], return_index=True)
+        return np.sort(len(key) - 1 - first_in_reversed)
+
+    def results(self) -> Dict[str, List[CandidateResult]]:
+        if self._results is not None:
+            return self._results
+        self._consolidate()
+        ballot, competition, candidate, rating = self._columns
+        latest = self._latest()
+        counted = latest[(rating[latest] != TallyEngine.REMOVED) & self._cast[ballot[latest]]]
+
+        candidates = len(self._candidates)
+        totals = np.bincount(candidate[counted], weights=rating[counted], minlength=candidates).astype(np.int64)
+        counts = np.bincount(candidate[counted], minlength=candidates)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            means = np.where(counts > 0, totals / np.maximum(counts, 1), 0.0)
+        # A candidate is only ever rated in its own competition, so any row tells us which one that is
+        competitions = np.full(candidates, -1, dtype=np.int64)
+        competitions[candidate] = competition
+        rated = np.flatnonzero(competitions >= 0)
+
+        score = totals if self._rank_by == "total" else means
+        order = rated[np.lexsort((-score[rated], competitions[rated]))]
+        ranks = self._ranks(competitions[order], score[order])
+
+        results: Dict[str, List[CandidateResult]] = {}
+        for index, rank in zip(order.tolist(), ranks.tolist()):
+            competition_id = self._competitions.id(int(competitions[index]))
+            results.setdefault(competition_id, []).append(
+                CandidateResult(competition_id, self._candidates.id(index), int(totals[index]), int(counts[index]),
+                                float(means[index]), rank))
+        self._results = results
+        return results
+
+    @staticmethod
+    def _ranks(competitions: np.ndarray, scores: np.ndarray) -> np.ndarray:
+        # Standard competition ranking ("1224") within each competition, over rows already sorted by competition and
+        # then by descending score
+        rows = len(competitions)
+        if rows == 0:
+            return np.empty(0, dtype=np.int64)
+        positions = np.arange(rows)
+        new_competition = np.ones(rows, dtype=bool)
+        new_competition[1:] = competitions[1:] != competitions[:-1]
+        new_score = new_competition.copy()
+        new_score[1:] |= scores[1:] != scores[:-1]
+        competition_start = np.maximum.accumulate(np.where(new_competition, positions, 0))
+        score_start = np.maximum.accumulate(np.where(new_score, positions, 0))
+        return score_start - competition_start + 1
+
+    def competition(self, competition_id: str) -> List[CandidateResult]:
+        return self.results().get(competition_id, [])
@@ -0,0 +1,6 @@
+from .CandidateResult import CandidateResult
+from .IdIndex import IdIndex
+from .TallyEngine import TallyEngine
+from .LeaderboardEntry import LeaderboardEntry
+from .Leaderboard import Leaderboard
+from .ReadModel import ReadModel
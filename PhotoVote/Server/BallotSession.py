@@ -0,0 +1,152 @@
+import asyncio
+from typing import Optional, Dict, Tuple, List, Type
+
+from pydantic import ValidationError
+
+from Common.Domain import CommandHandler
+from Common.Event import Event
+from PhotoVote.Domain.Ballot import Ballot
+from PhotoVote.Event import BallotCandidateRated, BallotCast
+from PhotoVote.Server.BatchItem import BatchItem
+from PhotoVote.Server.BatchItemResult import BatchItemResult
+from PhotoVote.Server.EventPublisher import EventPublisher
+
+
+class BallotSession:
+    # One client's stream of events for one ballot. Each event is applied to an in-memory Ballot as it arrives, so an
+    # invalid one is rejected straight away. That Ballot is a copy of the ballot handler's, taken again whenever the
+    # handler's has moved on, such as by a batch or a single request for the same ballot; every event is published
+    # through the handler, under its lock. A held rating that no longer applies to a new copy is rejected then.
+    # Ratings are held back: a candidate rated again before they are
+    # published only has its last rating published. Held ratings are published when the ballot is cast, after idle
+    # seconds without an event, and when the stream ends. Once publishing an event fails, the rest of the stream is
+    # not published, as in a batch
+    EVENT_TYPES: Dict[str, Type[Event]] = {"BallotCandidateRated": BallotCandidateRated, "BallotCast": BallotCast}
+
+    def __init__(self, ballot_id: str, handler: CommandHandler[Ballot], publisher: EventPublisher,
+                 idle: float = 2.0) -> None:
+        self._ballot_id: str = ballot_id
+        self._handler: CommandHandler[Ballot] = handler
+        self._publisher: EventPublisher = publisher
+        self._idle: float = idle
+        # The published state with the held ratings applied; None after a failure, until it is reloaded
+        self._ballot: Optional[Ballot] = None
+        # The handler's version of the ballot when it was copied
+        self._version: int = -1
+        self._pending: Dict[Tuple[str, str], Tuple[int, BallotCandidateRated]] = {}
+        self._results: List[BatchItemResult] = []
+        self._failed: Optional[int] = None
+        self._lock: asyncio.Lock = asyncio.Lock()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flushing: Optional[asyncio.Task] = None
+
+    @property
+    def results(self) -> List[BatchItemResult]:
+        return self._results
+
+    def reject(self, event_type: str, status_code: int, detail: str) -> None:
+        self._results.append(BatchItemResult(index=len(self._results), event_type=event_type,
+                                             status_code=status_code, detail=detail))
+
+    def _replay(self, ballot: Ballot) -> bool:
+        # Applies the held ratings to a new copy. One that no longer applies is rejected and dropped, and False
+        # returned, since the copy may have changed before it raised
+        for key, (index, event) in self._pending.items():
+            try:
+                ballot.load((event,))
+            except EventPublisher.REJECTED as e:
+                del self._pending[key]
+                self._results[index].status_code = EventPublisher.status_code(e)
+                self._results[index].detail = str(e)
+                return False
+        return True
+
+    async def _aggregate(self) -> Ballot:
+        if self._ballot is not None and await self._handler.version(self._ballot_id) == self._version:
+            return self._ballot
+        while True:
+            ballot = await self._handler.copy(self._ballot_id)
+            version = ballot.version
+            if self._replay(ballot):
+                break
+        self._ballot, self._version = ballot, version
+        return ballot
+
+    async def _publish(self, index: int, event: Event) -> None:
+        result = self._results[index]
+        if self._failed is not None:
+            result.status_code = 424
+            result.detail = f"Not published because event {self._failed} for the same ballot failed"
+            return
+        try:
+            await self._publisher.publish_once(event)
+            result.status_code = 200
+        except Exception as e:
+            self._failed = index
+            self._ballot = None
+            result.status_code = EventPublisher.status_code(e)
+            result.detail = str(e)
+
+    async def _flush(self) -> None:
+        pending, self._pending = self._pending, {}
+        for index, event in pending.values():
+            await self._publish(index, event)
+
+    async def _flush_idle(self) -> None:
+        async with self._lock:
+            await self._flush()
+
+    def _idle_elapsed(self) -> None:
+        self._timer = None
+        self._flushing = asyncio.create_task(self._flush_idle())
+
+    async def receive(self, item: BatchItem) -> None:
+        index = len(self._results)
+        event_type = BallotSession.EVENT_TYPES.get(item.event_type)
+        if event_type is None:
+            return self.reject(item.event_type, 400, f"A ballot stream cannot carry {item.event_type}")
+        try:
+            event = event_type.model_validate(item.event)
+        except ValidationError as e:
+            return self.reject(item.event_type, 422, str(e))
+        if event.aggregate_id != self._ballot_id:
+            return self.reject(item.event_type, 422, f"The event is for ballot {event.aggregate_id}")
+        result = BatchItemResult(index=index, event_type=item.event_type, aggregate_id=event.aggregate_id,
+                                 status_code=202)
+        self._results.append(result)
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        async with self._lock:
+            if self._failed is not None:
+                return await self._publish(index, event)
+            ballot = await self._aggregate()
+            try:
+                ballot.apply(event)
+            except EventPublisher.REJECTED as e:
+                # apply() may have changed the ballot before raising
+                self._ballot = None
+                result.status_code = EventPublisher.status_code(e)
+                result.detail = str(e)
+                return
+            ballot.clear_changes()
+            if isinstance(event, BallotCast):
+                await self._flush()
+                return await self._publish(index, event)
+            key = (event.competition_id, event.candidate_id)
+            replaced = self._pending.get(key)
+            if replaced is not None:
+                self._results[replaced[0]].status_code = 200
+                self._results[replaced[0]].detail = f"Superseded by event {index}"
+            self._pending[key] = (index, event)
+        self._timer = asyncio.get_running_loop().call_later(self._idle, self._idle_elapsed)
+
+    async def close(self) -> List[BatchItemResult]:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._flushing is not None:
+            await self._flushing
+        async with self._lock:
+            await self._flush()
+        return self._results
@@ -0,0 +1,7 @@
+from typing import Any, Dict
+from pydantic import BaseModel
+
+
+class BatchItem(BaseModel):
+    event_type: str
+    event: Dict[str, Any]
@@ -0,0 +1,10 @@
+from typing import Optional
+from pydantic import BaseModel
+
+
+class BatchItemResult(BaseModel):
+    index: int
+    event_type: str
+    aggregate_id: Optional[str] = None
+    status_code: int
+    detail: Optional[str] = None
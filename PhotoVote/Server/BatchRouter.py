@@ -0,0 +1,66 @@
+import asyncio
+from typing import Optional, Dict, Type, List, Tuple
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from pydantic import ValidationError
+
+from Common.Event import Event
+from PhotoVote.Server.BatchItem import BatchItem
+from PhotoVote.Server.BatchItemResult import BatchItemResult
+from PhotoVote.Server.EventPublisher import EventPublisher
+
+
+class BatchRouter(APIRouter):
+    def __init__(self, publisher: EventPublisher) -> None:
+        super().__init__()
+        self._publisher: EventPublisher = publisher
+        self._event_types: Dict[str, Type[Event]] = {event_type.__name__: event_type
+                                                     for event_type in publisher.event_types}
+
+    def _validate(self, items: List[BatchItem]) -> Tuple[List[BatchItemResult], Dict[str, List[Tuple[int, Event]]]]:
+        results: List[BatchItemResult] = []
+        # Events are grouped by aggregate in arrival order; dicts preserve insertion order, so each group is
+        # published in the order the client sent it
+        streams: Dict[str, List[Tuple[int, Event]]] = {}
+        for index, item in enumerate(items):
+            event_type = self._event_types.get(item.event_type)
+            if event_type is None:
+                results.append(BatchItemResult(index=index, event_type=item.event_type, status_code=400,
+                                               detail=f"Unknown event type: {item.event_type}"))
+                continue
+            try:
+                event = event_type.model_validate(item.event)
+            except ValidationError as e:
+                results.append(BatchItemResult(index=index, event_type=item.event_type, status_code=422,
+                                               detail=str(e)))
+                continue
+            results.append(BatchItemResult(index=index, event_type=item.event_type,
+                                           aggregate_id=event.aggregate_id, status_code=202))
+            streams.setdefault(event.aggregate_id, []).append((index, event))
+        return results, streams
+
+    async def _publish_stream(self, stream: List[Tuple[int, Event]], results: List[BatchItemResult]) -> None:
+        # Events for one aggregate are produced sequentially so the broker sees them in order. Once one of them
+        # fails or is rejected, the rest of the stream is not sent, since applying them out of order would be worse
+        # than not at all
+        failed: Optional[int] = None
+        for index, event in stream:
+            result = results[index]
+            if failed is not None:
+                result.status_code = 424
+                result.detail = f"Not published because event {failed} for the same aggregate failed"
+                continue
+            try:
+                await self._publisher.publish_once(event)
+                result.status_code = 200
+            except Exception as e:
+                failed = index
+                result.status_code = EventPublisher.status_code(e)
+                result.detail = str(e)
+
+    async def ingest(self, items: List[BatchItem]) -> JSONResponse:
+        results, streams = self._validate(items)
+        # Different aggregates have no ordering relationship, so their streams are published concurrently
+        await asyncio.gather(*(self._publish_stream(stream, results) for stream in streams.values()))
+        status_code = 200 if all(result.status_code == 200 for result in results) else 207
+        return JSONResponse(status_code=status_code, content=[result.model_dump() for result in results])
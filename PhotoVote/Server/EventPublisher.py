@@ -0,0 +1,78 @@
+from contextlib import nullcontext
+from typing import Optional, Dict, Type, List, Tuple
+
+from fastapi import HTTPException, status
+from fastapi.responses import Response
+
+from Common.Cache import IdempotencyCache
+from Common.Domain import CommandHandler
+from Common.Event import Event, EventBus, EventCodec, JsonEventCodec
+from Common.Exception import AlreadyDeletedError, ConcurrencyError, TransportBusyError
+from Common.Transport import TransportProducer
+from PhotoVote.Domain.VoterIndex import VoterIndex
+from PhotoVote.Event import registry
+from PhotoVote.Exception import AlreadyVotedError, AlreadyRegisteredError
+
+
+class EventPublisher:
+    # Accepts the events of every route, batch item and stream alike. An event is checked against the voter index,
+    # then applied to its aggregate by the event type's CommandHandler where one is registered, and otherwise produced
+    # straight to the type's producer and published on the bus. The producer, headers and handler of each type are
+    # looked up once, when the publisher is built
+    REJECTED = (AlreadyVotedError, AlreadyRegisteredError, ConcurrencyError, AlreadyDeletedError, ValueError, TypeError)
+
+    def __init__(self, producers: Dict[Type[Event], TransportProducer],
+                 handlers: Optional[Dict[Type[Event], CommandHandler]] = None, bus: Optional[EventBus] = None,
+                 codec: Optional[EventCodec] = None, index: Optional[VoterIndex] = None,
+                 dedup: Optional[IdempotencyCache] = None) -> None:
+        self._bus: Optional[EventBus] = bus
+        self._codec: EventCodec = codec or JsonEventCodec(registry)
+        self._index: Optional[VoterIndex] = index
+        self._dedup: Optional[IdempotencyCache] = dedup
+        handlers = handlers or {}
+        self._targets: Dict[Type[Event], Tuple[TransportProducer, Dict[str, str], Optional[CommandHandler]]] = {
+            event_type: (producer, self._codec.headers(event_type), handlers.get(event_type))
+            for event_type, producer in producers.items()}
+
+    @property
+    def event_types(self) -> List[Type[Event]]:
+        return list(self._targets)
+
+    @staticmethod
+    def status_code(error: Exception) -> int:
+        if isinstance(error, (AlreadyVotedError, AlreadyRegisteredError, ConcurrencyError)):
+            return status.HTTP_409_CONFLICT
+        if isinstance(error, AlreadyDeletedError):
+            return status.HTTP_410_GONE
+        if isinstance(error, TransportBusyError):
+            return status.HTTP_503_SERVICE_UNAVAILABLE
+        if isinstance(error, (ValueError, TypeError)):
+            return status.HTTP_422_UNPROCESSABLE_ENTITY
+        return status.HTTP_502_BAD_GATEWAY
+
+    async def publish(self, event: Event) -> None:
+        producer, headers, handler = self._targets[type(event)]
+        with self._index.claim(event) if self._index is not None else nullcontext():
+            if handler is not None:
+                await handler.handle(event)
+            else:
+                await producer.produce(self._codec.encode(event), headers)
+        if handler is None and self._bus is not None:
+            await self._bus.publish(event)
+
+    async def _accepted(self, event: Event) -> Response:
+        await self.publish(event)
+        return Response(status_code=200)
+
+    async def publish_once(self, event: Event) -> Response:
+        # A retry carrying the event_id of an event already accepted gets the same response without producing again,
+        # whether it comes by its own route, in a batch or on a stream
+        if self._dedup is not None and event.event_id is not None:
+            return await self._dedup.once((event.aggregate_id, event.event_id), lambda: self._accepted(event))
+        return await self._accepted(event)
+
+    async def accept(self, event: Event) -> Response:
+        try:
+            return await self.publish_once(event)
+        except EventPublisher.REJECTED as e:
+            raise HTTPException(status_code=EventPublisher.status_code(e), detail=str(e))
@@ -0,0 +1,15 @@
+from typing import NamedTuple, Type
+
+from Common.Event import Event
+
+
+class EventRoute(NamedTuple):
+    event_type: Type[Event]
+    # The aggregate whose router serves the route, under /{aggregate}, and whose producer the event is produced with
+    aggregate: str
+    method: str
+    path: str
+
+    @property
+    def url(self) -> str:
+        return f"/{self.aggregate}{self.path}"
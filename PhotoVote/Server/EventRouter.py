@@ -0,0 +1,34 @@
+import inspect
+from typing import Callable, Type, Any
+
+from fastapi import APIRouter
+from fastapi.responses import Response
+
+from Common.Event import Event
+from PhotoVote.Server.EventPublisher import EventPublisher
+from PhotoVote.Server.EventRoute import EventRoute
+
+
+class EventRouter(APIRouter):
+    # Serves an aggregate's routes from the EventRoute table. Each route's endpoint takes the body as its event type,
+    # so FastAPI validates it, and hands it straight to the publisher
+    def __init__(self, publisher: EventPublisher, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self._publisher: EventPublisher = publisher
+
+    @staticmethod
+    def endpoint(event_type: Type[Event], accept: Callable) -> Callable:
+        async def endpoint(event: Event) -> Response:
+            return await accept(event)
+
+        # FastAPI reads the body's type from the signature
+        endpoint.__signature__ = inspect.Signature(
+            [inspect.Parameter("event", inspect.Parameter.POSITIONAL_OR_KEYWORD, annotation=event_type)],
+            return_annotation=Response)
+        endpoint.__annotations__ = {"event": event_type, "return": Response}
+        endpoint.__name__ = endpoint.__qualname__ = event_type.__name__
+        return endpoint
+
+    def add_event_route(self, route: EventRoute) -> None:
+        self.add_api_route(route.path, EventRouter.endpoint(route.event_type, self._publisher.accept),
+                           methods=[route.method])
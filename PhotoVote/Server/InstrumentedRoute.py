@@ -0,0 +1,78 @@
+import functools
+from contextvars import ContextVar
+from typing import Callable, Type, Optional, List, Any
+
+from fastapi.routing import APIRoute
+
+from Common.Event import Event
+from Common.Metrics import MetricsRegistry
+
+# The handler's time and event type for the request being timed, filled in by the endpoint wrapper
+_timing: ContextVar[Optional[List[Any]]] = ContextVar("photovote_route_timing", default=None)
+
+
+class InstrumentedRoute(APIRoute):
+    # A route class that times every sampled request as a whole and its endpoint on its own. The difference is the time
+    # FastAPI spent reading, parsing and validating the request, which is recorded as the validate stage, for the route
+    # and for the type of the event the endpoint received. Install it with router.route_class = using(metrics, prefix),
+    # where prefix is the one the router is included with, which routes are labelled with
+    metrics: MetricsRegistry
+    prefix: str = ""
+
+    @staticmethod
+    def using(metrics: MetricsRegistry, prefix: str = "") -> Type["InstrumentedRoute"]:
+        return type("InstrumentedRoute", (InstrumentedRoute,), {"metrics": metrics, "prefix": prefix})
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs) -> None:
+        self.label: str = self.prefix + path
+        # FastAPI versions that copy a router's routes when it is included build each one again with the prefixed path,
+        # from the first one's endpoint, which is already wrapped
+        if getattr(endpoint, "_instrumented", False):
+            endpoint = endpoint.__wrapped__
+            self.label = path
+        super().__init__(path, InstrumentedRoute._timed(endpoint, self.metrics), **kwargs)
+
+    @staticmethod
+    def _timed(endpoint: Callable, metrics: MetricsRegistry) -> Callable:
+        @functools.wraps(endpoint)
+        async def timed(*args, **kwargs):
+            timing = _timing.get()
+            if timing is None:
+                return await endpoint(*args, **kwargs)
+            started = metrics.clock()
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                timing[0] = metrics.clock() - started
+                for value in kwargs.values():
+                    if isinstance(value, Event):
+                        timing[1] = type(value).__name__
+                        break
+
+        timed._instrumented = True
+        return timed
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        metrics = self.metrics
+        route = f"{','.join(sorted(self.methods))} {self.label}"
+
+        async def timed(request):
+            if not metrics.sampled():
+                return await handler(request)
+            timing: List[Any] = [0.0, None]
+            token = _timing.set(timing)
+            started = metrics.clock()
+            try:
+                return await handler(request)
+            finally:
+                total = metrics.clock() - started
+                _timing.reset(token)
+                validate = total - timing[0]
+                metrics.route_stages.observe((route, "total"), total)
+                metrics.route_stages.observe((route, "handler"), timing[0])
+                metrics.route_stages.observe((route, "validate"), validate)
+                if timing[1] is not None:
+                    metrics.event_stages.observe((timing[1], "validate"), validate)
+
+        return timed
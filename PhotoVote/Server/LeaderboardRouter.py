@@ -0,0 +1,26 @@
+from typing import Optional
+from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import Response, JSONResponse
+
+from PhotoVote.Projection import Leaderboard
+
+
+class LeaderboardRouter(APIRouter):
+    def __init__(self, leaderboard: Leaderboard) -> None:
+        super().__init__()
+        self._leaderboard: Leaderboard = leaderboard
+
+    async def top(self, competition_id: str, n: Optional[int] = None,
+                  if_none_match: Optional[str] = None) -> Response:
+        version, entries = await self._leaderboard.read_top(competition_id, n)
+        # The ETag is the competition's version, so pollers get a 304 until the standings change
+        etag = f'"{competition_id}-{version}"'
+        if if_none_match == etag:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+        return JSONResponse(content=[entry._asdict() for entry in entries], headers={"ETag": etag})
+
+    async def candidate(self, candidate_id: str) -> Response:
+        entry = await self._leaderboard.read_candidate(candidate_id)
+        if entry is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Candidate has no cast ratings")
+        return JSONResponse(content=entry._asdict())
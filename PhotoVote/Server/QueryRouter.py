@@ -0,0 +1,34 @@
+from typing import Optional, Dict, Any, List
+from fastapi import APIRouter, HTTPException, status
+
+from PhotoVote.Projection import ReadModel
+
+
+class QueryRouter(APIRouter):
+    def __init__(self, read_model: ReadModel) -> None:
+        super().__init__()
+        self._read_model: ReadModel = read_model
+
+    @staticmethod
+    def _found(document: Optional[Dict[str, Any]], name: str) -> Dict[str, Any]:
+        if document is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"{name} not found")
+        return document
+
+    async def election(self, election_id: str) -> Dict[str, Any]:
+        return QueryRouter._found(await self._read_model.election(election_id), "Election")
+
+    async def competitions(self, election_id: str) -> List[Dict[str, Any]]:
+        return await self._read_model.competitions(election_id)
+
+    async def competition(self, competition_id: str) -> Dict[str, Any]:
+        return QueryRouter._found(await self._read_model.competition(competition_id), "Competition")
+
+    async def candidates(self, competition_id: str) -> List[Dict[str, Any]]:
+        return await self._read_model.candidates(competition_id)
+
+    async def candidate(self, candidate_id: str) -> Dict[str, Any]:
+        return QueryRouter._found(await self._read_model.candidate(candidate_id), "Candidate")
+
+    async def ballot(self, ballot_id: str) -> Dict[str, Any]:
+        return QueryRouter._found(await self._read_model.ballot(ballot_id), "Ballot")
@@ -0,0 +1,39 @@
+from typing import NamedTuple, List, Iterable
+
+
+class RateLimit(NamedTuple):
+    # The limit on one route group, named by the first segment of its paths: an aggregate's routes, or batch. key is
+    # aggregate, for a bucket per aggregate_id such as each ballot or voter, or client, for one per client address.
+    # rate is in requests a second, and burst is how many may come at once after a quiet spell. A group may have several
+    # limits, such as a sustained rate and a tighter burst, and a request must pass all of them
+    group: str
+    key: str
+    rate: float
+    burst: float
+
+    KEYS = ("aggregate", "client")
+
+    @staticmethod
+    def parse(spec: str, groups: Iterable[str]) -> List["RateLimit"]:
+        # group:key:rate[:burst], separated by commas; burst defaults to the rate
+        groups = set(groups)
+        limits: List[RateLimit] = []
+        for entry in spec.split(","):
+            if entry.strip() == "":
+                continue
+            parts = [part.strip() for part in entry.split(":")]
+            if len(parts) not in (3, 4):
+                raise ValueError(f"Expected group:key:rate[:burst], got {entry!r}")
+            group, key, rate = parts[0], parts[1], float(parts[2])
+            burst = float(parts[3]) if len(parts) == 4 else max(rate, 1.0)
+            if group not in groups:
+                raise ValueError(f"Unknown route group {group!r}; expected one of {', '.join(sorted(groups))}")
+            if key not in RateLimit.KEYS:
+                raise ValueError(f"Unknown rate limit key {key!r}; expected one of {', '.join(RateLimit.KEYS)}")
+            if group == "batch" and key != "client":
+                raise ValueError("A batch holds events for many aggregates, so it can only be limited by client")
+            limit = RateLimit(group, key, rate, burst)
+            if limit in limits:
+                raise ValueError(f"The rate limit {entry!r} is given twice")
+            limits.append(limit)
+        return limits
@@ -0,0 +1,104 @@
+import json
+import math
+import re
+from typing import Dict, Optional, List
+
+from Common.RateLimit import RateLimiter
+from PhotoVote.Server.RateLimit import RateLimit
+
+
+class RateLimitMiddleware:
+    # Refuses writes over their route group's limit with 429 and Retry-After before the app parses, validates or
+    # produces anything. A group limited by aggregate reads the aggregate_id from the request's JSON body, which is then
+    # handed on to the app unchanged, or the ballot id from a stream's path; a request without one is limited by client
+    # instead. A ballot stream counts as one request however many events it carries. A group with several limits checks
+    # them in order and refuses the request at the first one it is over; the limits before that have counted it.
+    #
+    # Behind the worker supervisor, every request reaches a worker from the front, which passes on the client's
+    # address in X-Forwarded-For; forwarded says to believe that header, which a client could otherwise set itself
+    WRITE_METHODS = ("POST", "PUT", "DELETE")
+    STREAM_PATH = re.compile(r"^/ballot/([^/]+)/stream/?$")
+
+    def __init__(self, app, limits: Dict[str, List[RateLimit]], limiters: Dict[RateLimit, RateLimiter],
+                 forwarded: bool = False) -> None:
+        self._app = app
+        self._limits: Dict[str, List[RateLimit]] = limits
+        self._limiters: Dict[RateLimit, RateLimiter] = limiters
+        self._forwarded: bool = forwarded
+
+    def _client(self, scope) -> str:
+        if self._forwarded:
+            for name, value in scope["headers"]:
+                if name == b"x-forwarded-for":
+                    return value.decode().split(",")[0].strip()
+        client = scope.get("client")
+        return client[0] if client else ""
+
+    @staticmethod
+    async def _body(receive) -> bytes:
+        chunks: List[bytes] = []
+        while True:
+            message = await receive()
+            if message["type"] != "http.request":
+                return b"".join(chunks)
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                return b"".join(chunks)
+
+    @staticmethod
+    def _aggregate_id(body: bytes) -> Optional[str]:
+        try:
+            event = json.loads(body)
+        except ValueError:
+            return None
+        aggregate_id = event.get("aggregate_id") if isinstance(event, dict) else None
+        return aggregate_id if isinstance(aggregate_id, str) else None
+
+    @staticmethod
+    def _replay(body: bytes, receive):
+        replayed = False
+
+        async def replay():
+            nonlocal replayed
+            if replayed:
+                return await receive()
+            replayed = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        return replay
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or scope["method"] not in RateLimitMiddleware.WRITE_METHODS:
+            return await self._app(scope, receive, send)
+        group = scope["path"].split("/", 2)[1]
+        limits = self._limits.get(group)
+        if limits is None:
+            return await self._app(scope, receive, send)
+        aggregate_id = None
+        if any(limit.key == "aggregate" for limit in limits):
+            stream = RateLimitMiddleware.STREAM_PATH.match(scope["path"])
+            if stream is not None:
+                aggregate_id = stream.group(1)
+            else:
+                body = await RateLimitMiddleware._body(receive)
+                aggregate_id = RateLimitMiddleware._aggregate_id(body)
+                receive = RateLimitMiddleware._replay(body, receive)
+        client = None
+        wait = 0.0
+        for limit in limits:
+            key = aggregate_id if limit.key == "aggregate" else None
+            if key is None:
+                if client is None:
+                    client = self._client(scope)
+                key = client
+            wait = self._limiters[limit].acquire(key)
+            if wait > 0:
+                break
+        if wait > 0:
+            body = json.dumps({"detail": f"Too many requests for {group}; retry in {wait:.1f}s"}).encode()
+            await send({"type": "http.response.start", "status": 429,
+                        "headers": [(b"content-type", b"application/json"),
+                                    (b"content-length", str(len(body)).encode()),
+                                    (b"retry-after", str(math.ceil(wait)).encode())]})
+            await send({"type": "http.response.body", "body": body})
+            return
+        await self._app(scope, receive, send)
@@ -0,0 +1,16 @@
+from typing import Any, Dict, List
+
+from fastapi import APIRouter
+
+from PhotoVote.Projection import TallyEngine
+
+
+class ResultsRouter(APIRouter):
+    def __init__(self, tally: TallyEngine) -> None:
+        super().__init__()
+        self._tally: TallyEngine = tally
+
+    async def competition(self, competition_id: str) -> List[Dict[str, Any]]:
+        # The engine appends the events that arrived since the last read and recomputes every competition at once, so
+        # the first read after a burst of ballots pays for the rest
+        return [result._asdict() for result in self._tally.competition(competition_id)]
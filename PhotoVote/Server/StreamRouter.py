@@ -0,0 +1,50 @@
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse
+from pydantic import ValidationError
+
+from Common.Domain import CommandHandler
+from PhotoVote.Domain.Ballot import Ballot
+from PhotoVote.Server.BallotSession import BallotSession
+from PhotoVote.Server.BatchItem import BatchItem
+from PhotoVote.Server.EventPublisher import EventPublisher
+
+
+class StreamRouter(APIRouter):
+    # Accepts a ballot session as one chunked request of newline-delimited batch items, read and handled line by line
+    # as the chunks arrive. The response lists a result per line, as the batch route does, once the stream ends
+    def __init__(self, handler: CommandHandler[Ballot], publisher: EventPublisher, idle: float = 2.0,
+                 max_line: int = 65536) -> None:
+        super().__init__()
+        self._handler: CommandHandler[Ballot] = handler
+        self._publisher: EventPublisher = publisher
+        self._idle: float = idle
+        self._max_line: int = max_line
+
+    @staticmethod
+    async def _receive(session: BallotSession, line: bytes) -> None:
+        if not line.strip():
+            return
+        try:
+            item = BatchItem.model_validate_json(line)
+        except ValidationError as e:
+            return session.reject("", 422, str(e))
+        await session.receive(item)
+
+    async def ballot(self, ballot_id: str, request: Request) -> JSONResponse:
+        session = BallotSession(ballot_id, self._handler, self._publisher, self._idle)
+        buffer = b""
+        try:
+            async for chunk in request.stream():
+                buffer += chunk
+                *lines, buffer = buffer.split(b"\n")
+                for line in lines:
+                    await StreamRouter._receive(session, line)
+                if len(buffer) > self._max_line:
+                    session.reject("", 413, f"A line is longer than {self._max_line} bytes; the stream was cut off")
+                    buffer = b""
+                    break
+            await StreamRouter._receive(session, buffer)
+        finally:
+            results = await session.close()
+        status_code = 200 if all(result.status_code == 200 for result in results) else 207
+        return JSONResponse(status_code=status_code, content=[result.model_dump() for result in results])
@@ -1,153 +1,405 @@
-from typing import List, Callable, Awaitable
-from fastapi import FastAPI
-from fastapi.responses import Response
-from memphis import Memphis
-from memphis.producer import Producer
 import asyncio
-from PhotoVote.Event import BallotCast, BallotCandidateRated, CandidateAdded, CandidateRemoved, CandidateNameChanged, \
-    CandidateDescriptionChanged, CandidateImageUrlChanged, CandidateImageCaptionChanged, CompetitionAdded, \
-    CompetitionRemoved, CompetitionNameChanged, CompetitionDescriptionChanged, ElectionCreated, ElectionDeleted, \
-    ElectionNameChanged, ElectionDescriptionChanged, VoterRegistered
-from PhotoVote.Server.BallotRouter import BallotRouter
-from PhotoVote.Server.CandidateRouter import CandidateRouter
-from PhotoVote.Server.CompetitionRouter import CompetitionRouter
-from PhotoVote.Server.ElectionRouter import ElectionRouter
-from PhotoVote.Server.VoterRouter import VoterRouter
-from dotenv import load_dotenv
+import logging
 import os
+from contextlib import asynccontextmanager
+from typing import List, Dict, Optional, Any, TYPE_CHECKING
 
-app = FastAPI()
-memphis = Memphis()
-load_dotenv()
-
-MEMPHIS_HOST: str = os.getenv("MEMPHIS_HOST")
-MEMPHIS_USERNAME: str = os.getenv("MEMPHIS_USERNAME")
-MEMPHIS_ACCOUNT_ID: int = int(os.getenv("MEMPHIS_ACCOUNT_ID"))
-MEMPHIS_PASSWORD: str = os.getenv("MEMPHIS_PASSWORD")
-
-
-async def get_producer(station_name: str | List[str], producer_name: str) -> Producer:
-    await memphis.connect(MEMPHIS_HOST, MEMPHIS_USERNAME, MEMPHIS_ACCOUNT_ID, password=MEMPHIS_PASSWORD)
-    return await memphis.producer(station_name=station_name, producer_name=producer_name)
-
-
-@app.on_event("startup")
-def startup_event():
-    asyncio.create_task(main())
-
-
-async def setup_ballot_routes(producer: Producer) -> None:
-    ballot_router = BallotRouter(producer)
-
-    @ballot_router.post("/cast")
-    async def cast_ballot(event: BallotCast) -> Response:
-        return await ballot_router.cast(event)
-
-    @ballot_router.put("/candidaterated")
-    async def rate_candidate(event: BallotCandidateRated) -> Response:
-        return await ballot_router.candidate_rated(event)
-
-    app.include_router(ballot_router, prefix="/ballot")
-
-
-async def setup_candidate_routes(producer: Producer) -> None:
-    candidate_router = CandidateRouter(producer)
-
-    @candidate_router.post("/")
-    async def added(event: CandidateAdded) -> Response:
-        return await candidate_router.added(event)
-
-    @candidate_router.delete("/")
-    async def removed(event: CandidateRemoved) -> Response:
-        return await candidate_router.removed(event)
-
-    @candidate_router.put("/name")
-    async def name(event: CandidateNameChanged) -> Response:
-        return await candidate_router.name(event)
-
-    @candidate_router.put("/description")
-    async def description(event: CandidateDescriptionChanged) -> Response:
-        return await candidate_router.description(event)
-
-    @candidate_router.put("/imageurl")
-    async def imageurl(event: CandidateImageUrlChanged) -> Response:
-        return await candidate_router.imageurl(event)
-
-    @candidate_router.put("/imagecaption")
-    async def imagecaption(event: CandidateImageCaptionChanged) -> Response:
-        return await candidate_router.imagecaption(event)
-
-    app.include_router(candidate_router, prefix="/candidate")
-
-
-async def setup_competition_routes(producer: Producer) -> None:
-    competition_router = CompetitionRouter(producer)
-
-    @competition_router.post("/")
-    async def added(event: CompetitionAdded) -> Response:
-        return await competition_router.added(event)
-
-    @competition_router.delete("/")
-    async def removed(event: CompetitionRemoved) -> Response:
-        return await competition_router.removed(event)
-
-    @competition_router.put("name")
-    async def name_changed(event: CompetitionNameChanged) -> Response:
-        return await competition_router.name(event)
-
-    @competition_router.put("description")
-    async def description_changed(event: CompetitionDescriptionChanged) -> Response:
-        return await competition_router.description(event)
-
-    app.include_router(competition_router, prefix="/competition")
-
-
-async def setup_election_routes(producer: Producer) -> None:
-    election_router = ElectionRouter(producer)
-
-    @election_router.post("/")
-    async def create(event: ElectionCreated) -> Response:
-        return await election_router.created(event)
-
-    @election_router.delete("/")
-    async def delete(event: ElectionDeleted) -> Response:
-        return await election_router.deleted(event)
-
-    @election_router.put("/name")
-    async def name(event: ElectionNameChanged) -> Response:
-        return await election_router.name(event)
-
-    @election_router.put("/description")
-    async def description(event: ElectionDescriptionChanged) -> Response:
-        return await election_router.description(event)
-
-    app.include_router(election_router, prefix="/election")
-
-
-async def setup_voter_routes(producer: Producer) -> None:
-    voter_router = VoterRouter(producer)
-
-    @voter_router.post("/")
-    async def registered(event: VoterRegistered) -> Response:
-        return await voter_router.registered(event)
-
-    app.include_router(voter_router, prefix="/voter")
-
-
-async def setup(stations: List[str], producer_name: str, setup_routes: Callable[[Producer], Awaitable[None]]):
-    producer = await get_producer(stations, producer_name)
-    await setup_routes(producer)
-
+from dotenv import load_dotenv
+from fastapi import FastAPI, Header, APIRouter, Request
+from fastapi.responses import Response, JSONResponse
+
+from Common.Cache import LruCache, TtlCache, IdempotencyCache
+from Common.Domain import AggregateRepository, AggregateRebuilder, CommandHandler
+from Common.Event import EventBus
+from Common.Exception import TransportBusyError
+from Common.Store import InMemorySnapshotStore, SegmentEventStore
+from Common.RateLimit import RateLimiter, InMemoryRateLimiter, FileRateLimiter
+from Common.Transport import TransportProducer, LazyProducer, Backoff
+from PhotoVote.Event import BallotCast, BallotCandidateRated, registry
+from PhotoVote.Domain import BallotId
+from PhotoVote.Domain.Ballot import Ballot
+from PhotoVote.config import create_transport, create_codec, create_document_store, create_voter_index, \
+    create_event_store
+from PhotoVote.Server.BatchItem import BatchItem
+from PhotoVote.Server.BatchRouter import BatchRouter
+from PhotoVote.Server.EventPublisher import EventPublisher
+from PhotoVote.Server.EventRouter import EventRouter
+from PhotoVote.Server.RateLimit import RateLimit
+from PhotoVote.Server.RateLimitMiddleware import RateLimitMiddleware
+from PhotoVote.Server.StreamRouter import StreamRouter
+from PhotoVote.Server.routes import STATIONS, event_aggregates, event_routes, producer_name
+from PhotoVote.Worker.HandoffServer import HandoffServer
+
+if TYPE_CHECKING:
+    from PhotoVote.Projection import Leaderboard, ReadModel, TallyEngine
 
-async def main():
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+PHOTOVOTE_AGGREGATE_CACHE_SIZE: int = int(os.getenv("PHOTOVOTE_AGGREGATE_CACHE_SIZE", "10000"))
+PHOTOVOTE_READ_CACHE_SIZE: int = int(os.getenv("PHOTOVOTE_READ_CACHE_SIZE", "10000"))
+PHOTOVOTE_READ_CACHE_TTL: float = float(os.getenv("PHOTOVOTE_READ_CACHE_TTL", "5"))
+# total or mean: how /results ranks a competition's candidates; the leaderboard always ranks by total
+PHOTOVOTE_RESULTS_RANK_BY: str = os.getenv("PHOTOVOTE_RESULTS_RANK_BY", "mean")
+# Accepted event_ids remembered for answering client retries, and for how many seconds; a size of 0 turns this off
+PHOTOVOTE_DEDUP_SIZE: int = int(os.getenv("PHOTOVOTE_DEDUP_SIZE", "100000"))
+PHOTOVOTE_DEDUP_TTL: float = float(os.getenv("PHOTOVOTE_DEDUP_TTL", "600"))
+# Fraction of requests whose stages are timed for /metrics; 0 (the default) leaves the app uninstrumented
+PHOTOVOTE_METRICS_SAMPLE_RATE: float = float(os.getenv("PHOTOVOTE_METRICS_SAMPLE_RATE", "0"))
+# Seconds a ballot stream may be idle before the ratings it is holding back are published
+PHOTOVOTE_STREAM_IDLE: float = float(os.getenv("PHOTOVOTE_STREAM_IDLE", "2"))
+# Seconds an event arriving before its producer is connected waits for it, before the API answers 503
+PHOTOVOTE_STARTUP_WAIT: float = float(os.getenv("PHOTOVOTE_STARTUP_WAIT", "5"))
+# Per route group limits on how fast one ballot, voter or client may send, as group:key:rate[:burst] separated by
+# commas, e.g. "ballot:aggregate:20:40,voter:client:1:5,batch:client:5". The group is an aggregate or batch, the key
+# aggregate or client, and the rate per second. Empty (the default) limits nothing
+PHOTOVOTE_RATE_LIMITS: str = os.getenv("PHOTOVOTE_RATE_LIMITS", "")
+# Buckets kept per group; the least recently used are dropped beyond that
+PHOTOVOTE_RATE_LIMIT_SIZE: int = int(os.getenv("PHOTOVOTE_RATE_LIMIT_SIZE", "100000"))
+# Directory of bucket files shared by all ingest workers of a machine; empty keeps each worker's buckets in memory
+PHOTOVOTE_RATE_LIMIT_PATH: str = os.getenv("PHOTOVOTE_RATE_LIMIT_PATH", "")
+# Whether to take the client address from X-Forwarded-For, which the worker supervisor's front sets
+PHOTOVOTE_RATE_LIMIT_FORWARDED: bool = os.getenv("PHOTOVOTE_RATE_LIMIT_FORWARDED", "0") == "1"
+# all (the default) accepts events and projects them in process. Behind PhotoVote.Worker.supervisor, ingest workers
+# only accept the events of their share of the aggregates, and a single read worker projects every event from the
+# election station and serves the reads
+PHOTOVOTE_ROLE: str = os.getenv("PHOTOVOTE_ROLE", "all")
+# The name PhotoVote.Worker.supervisor gives this worker on its hash ring
+PHOTOVOTE_WORKER: str = os.getenv("PHOTOVOTE_WORKER", "")
+# The unix socket on which an ingest worker hands ballots over to another when the supervisor rebalances; only the
+# supervisor sets it, and without it there is no handoff listener
+PHOTOVOTE_HANDOFF_SOCKET: str = os.getenv("PHOTOVOTE_HANDOFF_SOCKET", "")
+# Ballots live at once while an ingest worker with a segment store rebuilds their snapshots on startup; 0 skips that
+PHOTOVOTE_REBUILD_WINDOW: int = int(os.getenv("PHOTOVOTE_REBUILD_WINDOW", "10000"))
+
+
+def instrument(app: FastAPI, router: APIRouter, prefix: str = "") -> None:
+    # Only affects routes added afterwards; prefix is the one the router will be included with
+    if app.state.metrics is not None:
+        from PhotoVote.Server.InstrumentedRoute import InstrumentedRoute
+        router.route_class = InstrumentedRoute.using(app.state.metrics, prefix)
+
+
+async def transport_busy(request, error: TransportBusyError) -> JSONResponse:
+    return JSONResponse(status_code=503, content={"detail": str(error)}, headers={"Retry-After": "1"})
+
+
+def setup_health_routes(app: FastAPI) -> None:
+    # Liveness only says the event loop is answering; readiness says the transport is connected and every producer,
+    # and on a read worker the projection consumer, is running. Load balancers and the worker supervisor should only
+    # send traffic to a ready process
+    state = app.state
+
+    @app.get("/health/live", include_in_schema=False)
+    async def live() -> Dict[str, str]:
+        return {"status": "live"}
+
+    @app.get("/health/ready", include_in_schema=False)
+    async def ready() -> JSONResponse:
+        producers = {producer.name: producer.ready for producer in state.producers.values()}
+        content: Dict[str, Any] = {"status": "ready" if state.ready else "starting", "role": state.role,
+                                   "producers": producers}
+        if state.startup_error is not None:
+            content["error"] = state.startup_error
+        return JSONResponse(status_code=200 if state.ready else 503, content=content)
+
+
+def setup_metrics_route(app: FastAPI) -> None:
+    from Common.Metrics import MetricsRegistry
+    metrics = app.state.metrics
+
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics_text() -> Response:
+        return Response(metrics.render(), media_type=MetricsRegistry.CONTENT_TYPE)
+
+
+def create_ballot(aggregate_id: str) -> Ballot:
+    return Ballot(BallotId.from_string(aggregate_id))
+
+
+def setup_ingest_routes(app: FastAPI, producers: Dict[str, TransportProducer]) -> None:
+    state = app.state
+    state.event_store = create_event_store("ballot")
+    state.snapshot_store = InMemorySnapshotStore()
+    ballot_repository = AggregateRepository(create_ballot, state.event_store, state.snapshot_store,
+                                            metrics=state.metrics)
+    ballot_handler = CommandHandler(ballot_repository, producers["ballot"], LruCache(PHOTOVOTE_AGGREGATE_CACHE_SIZE),
+                                    state.codec, state.bus)
+    # Event types whose aggregates are validated on ingest
+    handlers = {BallotCast: ballot_handler, BallotCandidateRated: ballot_handler}
+    # Shared by the per-aggregate routes and the batch route
+    publisher = EventPublisher({event_type: producers[aggregate]
+                                for event_type, aggregate in event_aggregates().items()},
+                               handlers, state.bus, state.codec, state.voter_index, state.dedup)
+    state.publisher = publisher
+    for aggregate in STATIONS:
+        router = EventRouter(publisher)
+        instrument(app, router, f"/{aggregate}")
+        for route in event_routes(aggregate):
+            router.add_event_route(route)
+        app.include_router(router, prefix=f"/{aggregate}")
+
+    batch_router = BatchRouter(publisher)
+    instrument(app, batch_router, "/batch")
+
+    @batch_router.post("/")
+    async def batch(items: List[BatchItem]) -> Response:
+        return await batch_router.ingest(items)
+
+    app.include_router(batch_router, prefix="/batch")
+
+    stream_router = StreamRouter(ballot_handler, publisher, PHOTOVOTE_STREAM_IDLE)
+    instrument(app, stream_router, "/ballot")
+
+    @stream_router.post("/{ballot_id}/stream")
+    async def stream(ballot_id: str, request: Request) -> Response:
+        return await stream_router.ballot(ballot_id, request)
+
+    app.include_router(stream_router, prefix="/ballot")
+
+    if PHOTOVOTE_HANDOFF_SOCKET != "":
+        state.handoff = HandoffServer(PHOTOVOTE_HANDOFF_SOCKET, ballot_handler, registry, PHOTOVOTE_WORKER)
+
+
+def setup_rate_limits(app: FastAPI) -> None:
+    # Checked before routing, so a request over its limit costs no parsing, validation or producing
+    limits: Dict[str, List[RateLimit]] = {}
+    for limit in RateLimit.parse(PHOTOVOTE_RATE_LIMITS, list(STATIONS) + ["batch"]):
+        limits.setdefault(limit.group, []).append(limit)
+    if len(limits) == 0:
+        return
+    limiters: Dict[RateLimit, RateLimiter] = {}
+    for limit in (limit for group_limits in limits.values() for limit in group_limits):
+        if PHOTOVOTE_RATE_LIMIT_PATH == "":
+            limiters[limit] = InMemoryRateLimiter(limit.rate, limit.burst, PHOTOVOTE_RATE_LIMIT_SIZE)
+        else:
+            os.makedirs(PHOTOVOTE_RATE_LIMIT_PATH, exist_ok=True)
+            name = f"{limit.group}-{limit.key}-{limit.rate:g}-{limit.burst:g}.limits"
+            limiters[limit] = FileRateLimiter(os.path.join(PHOTOVOTE_RATE_LIMIT_PATH, name), limit.rate, limit.burst,
+                                              PHOTOVOTE_RATE_LIMIT_SIZE)
+    app.state.rate_limiters = limiters
+    app.add_middleware(RateLimitMiddleware, limits=limits, limiters=limiters,
+                       forwarded=PHOTOVOTE_RATE_LIMIT_FORWARDED)
+
+
+def setup_leaderboard_routes(app: FastAPI, leaderboard: "Leaderboard") -> None:
+    from PhotoVote.Server.LeaderboardRouter import LeaderboardRouter
+    leaderboard_router = LeaderboardRouter(leaderboard)
+    instrument(app, leaderboard_router, "/leaderboard")
+
+    @leaderboard_router.get("/competition/{competition_id}")
+    async def top(competition_id: str, n: Optional[int] = None,
+                  if_none_match: Optional[str] = Header(default=None)) -> Response:
+        return await leaderboard_router.top(competition_id, n, if_none_match)
+
+    @leaderboard_router.get("/candidate/{candidate_id}")
+    async def candidate(candidate_id: str) -> Response:
+        return await leaderboard_router.candidate(candidate_id)
+
+    app.include_router(leaderboard_router, prefix="/leaderboard")
+
+
+def setup_results_routes(app: FastAPI, tally: "TallyEngine") -> None:
+    from PhotoVote.Server.ResultsRouter import ResultsRouter
+    results_router = ResultsRouter(tally)
+    instrument(app, results_router, "/results")
+
+    @results_router.get("/competition/{competition_id}")
+    async def competition(competition_id: str) -> List[Dict[str, Any]]:
+        return await results_router.competition(competition_id)
+
+    app.include_router(results_router, prefix="/results")
+
+
+def setup_query_routes(app: FastAPI, read_model: "ReadModel") -> None:
+    from PhotoVote.Server.QueryRouter import QueryRouter
+    query_router = QueryRouter(read_model)
+    instrument(app, query_router)
+
+    @query_router.get("/election/{election_id}")
+    async def election(election_id: str) -> Dict[str, Any]:
+        return await query_router.election(election_id)
+
+    @query_router.get("/election/{election_id}/competitions")
+    async def competitions(election_id: str) -> List[Dict[str, Any]]:
+        return await query_router.competitions(election_id)
+
+    @query_router.get("/competition/{competition_id}")
+    async def competition(competition_id: str) -> Dict[str, Any]:
+        return await query_router.competition(competition_id)
+
+    @query_router.get("/competition/{competition_id}/candidates")
+    async def candidates(competition_id: str) -> List[Dict[str, Any]]:
+        return await query_router.candidates(competition_id)
+
+    @query_router.get("/candidate/{candidate_id}")
+    async def candidate(candidate_id: str) -> Dict[str, Any]:
+        return await query_router.candidate(candidate_id)
+
+    @query_router.get("/ballot/{ballot_id}")
+    async def ballot(ballot_id: str) -> Dict[str, Any]:
+        return await query_router.ballot(ballot_id)
+
+    app.include_router(query_router)
+
+
+def setup_read_routes(app: FastAPI) -> EventBus:
+    # NumPy comes in with the projections, so ingest workers never import it
+    from PhotoVote.Projection import Leaderboard, ReadModel, TallyEngine
+    leaderboard = Leaderboard()
+    tally = TallyEngine(PHOTOVOTE_RESULTS_RANK_BY)
+    read_model = ReadModel(create_document_store(), TtlCache(PHOTOVOTE_READ_CACHE_SIZE, PHOTOVOTE_READ_CACHE_TTL))
+    projection_bus = EventBus()
+    projection_bus.subscribe(leaderboard.apply)
+    projection_bus.subscribe(read_model.apply)
+    projection_bus.subscribe(tally.apply)
+    setup_leaderboard_routes(app, leaderboard)
+    setup_results_routes(app, tally)
+    setup_query_routes(app, read_model)
+    return projection_bus
+
+
+async def start_projection_consumer(app: FastAPI) -> None:
+    from Common.Consumer import EventConsumer, EventDispatcher
+    state = app.state
+    dispatcher = EventDispatcher()
+    dispatcher.register_all(registry, state.projection_bus.publish)
+    consumer = await state.transport.consumer("election", "ReadWorker", "read-worker")
+    state.projection_consumer = EventConsumer([consumer], state.codec, dispatcher)
+    state.projection_consumer.start()
+
+
+async def restore_voter_index(app: FastAPI) -> None:
+    # A restarted ingest worker's index may lack the ballots its store holds: it is in memory unless
+    # PHOTOVOTE_INDEX_PATH is set, and a claim may have been lost with the process that made it. Other workers' keys
+    # are kept, since they may share the index files
+    state = app.state
+    store = state.event_store
+    casts = []
+    for aggregate_id in store.aggregates():
+        casts.extend(event for event in await store.read(aggregate_id) if isinstance(event, BallotCast))
+    restored = state.voter_index.restore(casts)
+    if restored > 0:
+        logger.info("Restored %d ballots to the voter index", restored)
+
+
+async def rebuild_snapshots(app: FastAPI) -> None:
+    # Snapshots are kept in memory, so a restarted worker would otherwise load every ballot from its whole history.
+    # One pass over the store's log leaves a snapshot of each ballot instead
+    state = app.state
+    store = state.event_store
+    if not isinstance(store, SegmentEventStore) or PHOTOVOTE_REBUILD_WINDOW == 0:
+        return
+    rebuilder = AggregateRebuilder(create_ballot, (BallotCast, BallotCandidateRated), state.snapshot_store,
+                                   PHOTOVOTE_REBUILD_WINDOW, store.codec)
+    rebuilt = await rebuilder.run(store.log())
+    if rebuilt > 0:
+        logger.info("Rebuilt the snapshots of %d ballots from %d events", rebuilt, rebuilder.events)
+
+
+async def start(app: FastAPI) -> None:
+    # Connects the transport and starts every producer concurrently, retrying with backoff until it succeeds. A failure
+    # is logged and shown by /health/ready rather than ending the process
+    state = app.state
+    backoff = Backoff(base=0.5, cap=30.0)
+    attempt = 0
+    while True:
+        try:
+            await state.transport.connect()
+            await asyncio.gather(*(producer.start() for producer in state.producers.values()))
+            if state.role == "read":
+                await start_projection_consumer(app)
+            state.startup_error = None
+            state.ready = True
+            return
+        except Exception as e:
+            state.startup_error = f"{type(e).__name__}: {e}"
+            logger.exception("PhotoVote startup failed, retrying")
+            await asyncio.sleep(backoff.delay(attempt))
+            attempt += 1
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    state = app.state
+    if state.event_store is not None:
+        await rebuild_snapshots(app)
+        await restore_voter_index(app)
+    # Listening before the worker can be ready, so the front never puts a worker on the ring that can't take ballots
+    if state.handoff is not None:
+        await state.handoff.start()
+    starting = asyncio.create_task(start(app))
     try:
-        tasks = [
-            setup(["election", "ballot"], "BallotProducer", setup_ballot_routes),
-            setup(["election", "candidate", "competition"], "CandidateProducer", setup_candidate_routes),
-            setup(["election", "competition"], "CompetitionProducer", setup_competition_routes),
-            setup(["election"], "ElectionProducer", setup_election_routes),
-            setup(["election", "voter"], "VoterProducer", setup_voter_routes)
-        ]
-        await asyncio.gather(*tasks)
-    except Exception as e:
-        await memphis.close()
+        yield
+    finally:
+        starting.cancel()
+        await asyncio.gather(starting, return_exceptions=True)
+        if state.handoff is not None:
+            await state.handoff.close()
+        if state.projection_consumer is not None:
+            await state.projection_consumer.stop()
+        await state.transport.close()
+        if state.event_store is not None:
+            state.event_store.close()
+        for limiter in state.rate_limiters.values():
+            limiter.close()
+
+
+def create_app(role: str = PHOTOVOTE_ROLE) -> FastAPI:
+    # Every route exists as soon as the app does. The transport connects in the background once the server starts; until
+    # then produces wait up to PHOTOVOTE_STARTUP_WAIT seconds for their producer, and /health/ready answers 503
+    if role not in ("all", "ingest", "read"):
+        raise ValueError(f"Unknown role: {role}")
+    app = FastAPI(lifespan=lifespan)
+    state = app.state
+    state.role = role
+    state.transport = create_transport()
+    state.metrics = None
+    # Encodes what ingest produces, and decodes events from our own stations for the projections
+    state.codec = create_codec(trusted=True)
+    if PHOTOVOTE_METRICS_SAMPLE_RATE > 0:
+        from Common.Metrics import MetricsRegistry, InstrumentedCodec
+        state.metrics = MetricsRegistry(PHOTOVOTE_METRICS_SAMPLE_RATE)
+        state.codec = InstrumentedCodec(state.codec, state.metrics)
+    state.ready = False
+    state.startup_error = None
+    state.projection_consumer = None
+    state.projection_bus = None
+    state.publisher = None
+    state.event_store = None
+    state.snapshot_store = None
+    state.handoff = None
+    state.rate_limiters = {}
+    # One producer per aggregate, for its routes and its share of the batch route; a read worker has none
+    state.producers = {aggregate: LazyProducer(state.transport, stations, producer_name(aggregate),
+                                               PHOTOVOTE_STARTUP_WAIT)
+                       for aggregate, stations in STATIONS.items()} if role != "read" else {}
+    # Duplicate votes and registrations are rejected before they are produced
+    state.voter_index = create_voter_index() if role != "read" else None
+    state.dedup = IdempotencyCache(PHOTOVOTE_DEDUP_SIZE, PHOTOVOTE_DEDUP_TTL) if PHOTOVOTE_DEDUP_SIZE > 0 else None
+    app.add_exception_handler(TransportBusyError, transport_busy)
+    setup_health_routes(app)
+    if state.metrics is not None:
+        setup_metrics_route(app)
+    if role != "ingest":
+        state.projection_bus = setup_read_routes(app)
+    # Every accepted event is published on the bus, which keeps the in-process projections current unless a read
+    # worker projects them from the transport instead
+    state.bus = state.projection_bus if role == "all" else EventBus()
+    if role != "read":
+        producers: Dict[str, TransportProducer] = state.producers
+        if state.metrics is not None:
+            from Common.Metrics import InstrumentedProducer
+            producers = {aggregate: InstrumentedProducer(producer, state.metrics)
+                         for aggregate, producer in producers.items()}
+        setup_ingest_routes(app, producers)
+        setup_rate_limits(app)
+    return app
+
+
+def __getattr__(name: str) -> Any:
+    # uvicorn PhotoVote.Server.api:app builds the app on first use, so importing this module stays cheap
+    if name == "app":
+        app = globals()["app"] = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
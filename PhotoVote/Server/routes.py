@@ -0,0 +1,53 @@
+from typing import Dict, List, Type
+
+from Common.Event import Event
+from PhotoVote.Event import BallotCast, BallotCandidateRated, CandidateAdded, CandidateRemoved, CandidateNameChanged, \
+    CandidateDescriptionChanged, CandidateImageUrlChanged, CandidateImageCaptionChanged, CompetitionAdded, \
+    CompetitionRemoved, CompetitionNameChanged, CompetitionDescriptionChanged, ElectionCreated, ElectionDeleted, \
+    ElectionNameChanged, ElectionDescriptionChanged, VoterRegistered
+from PhotoVote.Server.EventRoute import EventRoute
+
+# The stations each aggregate's events are produced to. Every one includes the election station, which the read side
+# consumes
+STATIONS: Dict[str, List[str]] = {
+    "ballot": ["election", "ballot"],
+    "candidate": ["election", "candidate", "competition"],
+    "competition": ["election", "competition"],
+    "election": ["election"],
+    "voter": ["election", "voter"],
+}
+
+# Every event the API accepts, and the route it is accepted on. The batch route accepts the same event types
+EVENT_ROUTES: List[EventRoute] = [
+    EventRoute(BallotCast, "ballot", "POST", "/cast"),
+    EventRoute(BallotCandidateRated, "ballot", "PUT", "/candidaterated"),
+    EventRoute(CandidateAdded, "candidate", "POST", "/"),
+    EventRoute(CandidateRemoved, "candidate", "DELETE", "/"),
+    EventRoute(CandidateNameChanged, "candidate", "PUT", "/name"),
+    EventRoute(CandidateDescriptionChanged, "candidate", "PUT", "/description"),
+    EventRoute(CandidateImageUrlChanged, "candidate", "PUT", "/imageurl"),
+    EventRoute(CandidateImageCaptionChanged, "candidate", "PUT", "/imagecaption"),
+    EventRoute(CompetitionAdded, "competition", "POST", "/"),
+    EventRoute(CompetitionRemoved, "competition", "DELETE", "/"),
+    EventRoute(CompetitionNameChanged, "competition", "PUT", "/name"),
+    EventRoute(CompetitionDescriptionChanged, "competition", "PUT", "/description"),
+    EventRoute(ElectionCreated, "election", "POST", "/"),
+    EventRoute(ElectionDeleted, "election", "DELETE", "/"),
+    EventRoute(ElectionNameChanged, "election", "PUT", "/name"),
+    EventRoute(ElectionDescriptionChanged, "election", "PUT", "/description"),
+    # Voter is a read-only aggregate that can be added to any election. It is immutable after creation and cannot be
+    # deleted, so registering is its only route
+    EventRoute(VoterRegistered, "voter", "POST", "/"),
+]
+
+
+def producer_name(aggregate: str) -> str:
+    return f"{aggregate.capitalize()}Producer"
+
+
+def event_routes(aggregate: str) -> List[EventRoute]:
+    return [route for route in EVENT_ROUTES if route.aggregate == aggregate]
+
+
+def event_aggregates() -> Dict[Type[Event], str]:
+    return {route.event_type: route.aggregate for route in EVENT_ROUTES}
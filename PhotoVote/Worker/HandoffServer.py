@@ -0,0 +1,128 @@
+import asyncio
+import json
+import logging
+import os
+from typing import Dict, List, Any, Optional, Set
+
+from Common.Domain import CommandHandler
+from Common.Event import Event, EventRegistry
+from Common.Shard import HashRing
+
+logger = logging.getLogger(__name__)
+
+
+class HandoffServer:
+    # Moves ballots between ingest workers when PhotoVote.Worker.supervisor changes their number. It listens on a unix
+    # socket of its own in the supervisor's run directory, which only the supervisor's user may open, and is no part of
+    # the HTTP app; so no client can reach it, through the front or otherwise.
+    #
+    # The front holds every write, then sends each worker the new ring: the ingest workers' names and handoff sockets.
+    # The worker exports the ballots that ring gives to another worker and sends their histories to the new owners,
+    # which adopt only the ballots the same ring gives to them. Adopted events were produced and indexed when the old
+    # owner accepted them, so they are only saved. A request is one JSON document, written before the connection is
+    # half-closed, and so is its answer
+    MODE: int = 0o600
+
+    def __init__(self, path: str, handler: CommandHandler, registry: EventRegistry, worker: str) -> None:
+        self._path: str = path
+        self._handler: CommandHandler = handler
+        self._registry: EventRegistry = registry
+        self._worker: str = worker
+        self._server: Optional[asyncio.AbstractServer] = None
+        # The server only holds a connection's task while it can read or write; one that is handing off, having read
+        # its request to the end, would otherwise be garbage collected
+        self._serving: Set[asyncio.Task] = set()
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @staticmethod
+    async def request(path: str, message: Dict[str, Any]) -> Dict[str, Any]:
+        reader, writer = await asyncio.open_unix_connection(path)
+        try:
+            writer.write(json.dumps(message).encode())
+            writer.write_eof()
+            answer = json.loads(await reader.read())
+        finally:
+            writer.close()
+            await writer.wait_closed()
+        if "error" in answer:
+            raise RuntimeError(f"Handoff through {path} failed: {answer['error']}")
+        return answer
+
+    async def start(self) -> None:
+        if os.path.exists(self._path):
+            os.unlink(self._path)
+        self._server = await asyncio.start_unix_server(self._serve, self._path)
+        os.chmod(self._path, HandoffServer.MODE)
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        task = asyncio.current_task()
+        self._serving.add(task)
+        try:
+            await self._answer(reader, writer)
+        finally:
+            self._serving.discard(task)
+
+    async def _answer(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            message = json.loads(await reader.read())
+            if "handoff" in message:
+                answer = {"moved": await self.handoff(message["handoff"])}
+            elif "adopt" in message:
+                answer = {"adopted": await self.adopt(message["adopt"]["owners"], message["adopt"]["streams"])}
+            else:
+                raise ValueError("Expected a handoff or an adopt request")
+        except Exception as e:
+            logger.exception("Handoff request failed")
+            answer = {"error": f"{type(e).__name__}: {e}"}
+        try:
+            writer.write(json.dumps(answer).encode())
+            await writer.drain()
+        finally:
+            writer.close()
+            await writer.wait_closed()
+
+    def _ring(self, owners: Dict[str, str]) -> HashRing:
+        # Handoff sockets all live in the supervisor's run directory, so this worker never sends histories elsewhere
+        directory = os.path.dirname(os.path.abspath(self._path))
+        for path in owners.values():
+            if os.path.dirname(os.path.abspath(path)) != directory:
+                raise ValueError(f"{path} is not a handoff socket of this worker's supervisor")
+        return HashRing(owners)
+
+    async def handoff(self, owners: Dict[str, str]) -> int:
+        ring = self._ring(owners)
+        moving: Dict[str, List[str]] = {}
+        for aggregate_id in self._handler.aggregates():
+            owner = ring.owner(aggregate_id)
+            if owner != self._worker:
+                moving.setdefault(owner, []).append(aggregate_id)
+        for owner, aggregate_ids in moving.items():
+            streams = {aggregate_id: [{"event_type": type(event).__name__, "event": event.model_dump(mode="json")}
+                                      for event in await self._handler.export(aggregate_id)]
+                       for aggregate_id in aggregate_ids}
+            await HandoffServer.request(owners[owner], {"adopt": {"owners": owners, "streams": streams}})
+        return sum(len(aggregate_ids) for aggregate_ids in moving.values())
+
+    async def adopt(self, owners: Dict[str, str], streams: Dict[str, List[Dict[str, Any]]]) -> int:
+        # Every stream is checked before any is adopted
+        ring = self._ring(owners)
+        histories: Dict[str, List[Event]] = {}
+        for aggregate_id, items in streams.items():
+            if ring.owner(aggregate_id) != self._worker:
+                raise ValueError(f"{aggregate_id} belongs to {ring.owner(aggregate_id)}, not {self._worker}")
+            history = [self._registry.named(item["event_type"]).model_validate(item["event"]) for item in items]
+            if any(event.aggregate_id != aggregate_id for event in history):
+                raise ValueError(f"The history of {aggregate_id} holds another aggregate's events")
+            histories[aggregate_id] = history
+        for aggregate_id, history in histories.items():
+            await self._handler.adopt(aggregate_id, history)
+        return len(histories)
@@ -0,0 +1,203 @@
+import asyncio
+import itertools
+import json
+import re
+from typing import Dict, List, Tuple, Optional, Any, Union, AsyncIterator
+
+import httpx
+
+from Common.Shard import HashRing
+from PhotoVote.Worker.HandoffServer import HandoffServer
+
+
+class ShardFront:
+    # The ASGI app in front of the worker processes. A write goes to the ingest worker that owns its aggregate_id on the
+    # hash ring, so every event of an aggregate reaches the same process and its cached aggregate never needs a lock
+    # or a reload. A batch is split by owner, sent to the owners concurrently and merged back into one result list in
+    # request order. Reads go to the read worker, which projects every event rather than one worker's share.
+    #
+    # A ballot stream is routed by the ballot id in its path and passed through chunk by chunk, so the worker sees the
+    # events as they are sent.
+    #
+    # rebalance() holds new writes and waits for those under way, then has every worker hand the ballots that change
+    # owner over to their new owners before the new ring takes effect; so a ballot is always validated against its
+    # whole history. That goes through each worker's HandoffServer socket, never over HTTP, and the front refuses any
+    # request for a /handoff path.
+    #
+    # The front only parses the JSON it needs for routing; validation, encoding and producing happen in the workers
+    STREAM_PATH = re.compile(r"^/ballot/([^/]+)/stream/?$")
+    FORWARDED_HEADERS = (b"content-type", b"if-none-match", b"accept")
+    RETURNED_HEADERS = ("content-type", "etag", "retry-after")
+    INTERNAL_PATH = "/handoff"
+
+    def __init__(self, ingest: Dict[str, str], read: str, handoff: Dict[str, str]) -> None:
+        self._ring: HashRing = HashRing(ingest)
+        self._handoff: Dict[str, str] = handoff
+        self._clients: Dict[str, httpx.AsyncClient] = {name: ShardFront.client(path) for name, path in ingest.items()}
+        self._read: httpx.AsyncClient = ShardFront.client(read)
+        self._any = itertools.cycle(self._ring.nodes)
+        self._open: asyncio.Event = asyncio.Event()
+        self._open.set()
+        self._writes: int = 0
+        self._idle: asyncio.Event = asyncio.Event()
+        self._idle.set()
+
+    @staticmethod
+    def client(socket_path: str) -> httpx.AsyncClient:
+        return httpx.AsyncClient(transport=httpx.AsyncHTTPTransport(uds=socket_path), base_url="http://worker",
+                                 timeout=30.0)
+
+    @property
+    def ring(self) -> HashRing:
+        return self._ring
+
+    async def rebalance(self, ingest: Dict[str, str], handoff: Dict[str, str]) -> None:
+        # Every worker in ingest must be listening already, and handoff names each one's handoff socket. If a worker
+        # fails to hand off its ballots the old ring is kept; a new owner that adopted some of them only ever holds an
+        # older part of their history, which it completes when it adopts them again
+        self._open.clear()
+        try:
+            await self._idle.wait()
+            await asyncio.gather(*(HandoffServer.request(self._handoff[name], {"handoff": handoff})
+                                   for name in self._ring.nodes))
+            clients = {name: self._clients.get(name) or ShardFront.client(path) for name, path in ingest.items()}
+            removed = [client for name, client in self._clients.items() if name not in ingest]
+            self._ring = HashRing(ingest)
+            self._clients = clients
+            self._any = itertools.cycle(self._ring.nodes)
+            self._handoff = handoff
+        finally:
+            self._open.set()
+        await asyncio.gather(*(client.aclose() for client in removed))
+
+    async def close(self) -> None:
+        await asyncio.gather(*(client.aclose() for client in self._clients.values()), self._read.aclose())
+
+    def _owner(self, aggregate_id: Any) -> httpx.AsyncClient:
+        if not isinstance(aggregate_id, str):
+            # Invalid either way; any worker can say so
+            return self._clients[next(self._any)]
+        return self._clients[self._ring.owner(aggregate_id)]
+
+    @staticmethod
+    async def _body(receive) -> bytes:
+        chunks: List[bytes] = []
+        while True:
+            message = await receive()
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                return b"".join(chunks)
+
+    @staticmethod
+    async def _chunks(receive) -> AsyncIterator[bytes]:
+        while True:
+            message = await receive()
+            yield message.get("body", b"")
+            if not message.get("more_body", False):
+                return
+
+    @staticmethod
+    async def _respond(send, status: int, body: bytes, headers: List[Tuple[bytes, bytes]]) -> None:
+        await send({"type": "http.response.start", "status": status,
+                    "headers": headers + [(b"content-length", str(len(body)).encode())]})
+        await send({"type": "http.response.body", "body": body})
+
+    async def _forward(self, client: httpx.AsyncClient, method: str, path: str,
+                       body: Union[bytes, AsyncIterator[bytes]],
+                       headers: Dict[str, str]) -> Tuple[int, bytes, List[Tuple[bytes, bytes]]]:
+        try:
+            response = await client.request(method, path, content=body, headers=headers)
+        except httpx.HTTPError as e:
+            return 502, json.dumps({"detail": f"Worker unavailable: {e}"}).encode(), [(b"content-type",
+                                                                                         b"application/json")]
+        returned = [(name.encode(), value.encode()) for name, value in response.headers.items()
+                    if name in ShardFront.RETURNED_HEADERS]
+        return response.status_code, response.content, returned
+
+    async def _batch(self, body: bytes, headers: Dict[str, str]) -> Tuple[int, bytes, List[Tuple[bytes, bytes]]]:
+        try:
+            items = json.loads(body)
+        except ValueError:
+            items = None
+        if not isinstance(items, list):
+            return await self._forward(self._clients[next(self._any)], "POST", "/batch/", body, headers)
+        shards: Dict[httpx.AsyncClient, List[int]] = {}
+        for index, item in enumerate(items):
+            event = item.get("event") if isinstance(item, dict) else None
+            shards.setdefault(self._owner(event.get("aggregate_id") if isinstance(event, dict) else None),
+                              []).append(index)
+
+        async def send_shard(client: httpx.AsyncClient, indexes: List[int]) -> None:
+            status, content, _ = await self._forward(client, "POST", "/batch/",
+                                                     json.dumps([items[index] for index in indexes]).encode(), headers)
+            shard_results = json.loads(content) if status in (200, 207) else None
+            for position, index in enumerate(indexes):
+                if shard_results is not None:
+                    results[index] = dict(shard_results[position], index=index)
+                else:
+                    item = items[index]
+                    results[index] = {"index": index,
+                                      "event_type": item.get("event_type") if isinstance(item, dict) else None,
+                                      "aggregate_id": None, "status_code": status,
+                                      "detail": content.decode(errors="replace")}
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+        await asyncio.gather(*(send_shard(client, indexes) for client, indexes in shards.items()))
+        status = 200 if all(result["status_code"] == 200 for result in results) else 207
+        return status, json.dumps(results).encode(), [(b"content-type", b"application/json")]
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    await self.close()
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+        if scope["type"] != "http":
+            return
+        if scope["path"].startswith(ShardFront.INTERNAL_PATH):
+            return await ShardFront._respond(send, 404, b'{"detail":"Not Found"}',
+                                             [(b"content-type", b"application/json")])
+        method = scope["method"]
+        path = scope["path"]
+        if scope["query_string"]:
+            path = f"{path}?{scope['query_string'].decode()}"
+        headers = {name.decode(): value.decode() for name, value in scope["headers"]
+                   if name in ShardFront.FORWARDED_HEADERS}
+        if scope.get("client"):
+            # For the workers' rate limits
+            headers["x-forwarded-for"] = scope["client"][0]
+        if method == "GET":
+            body = await ShardFront._body(receive)
+            response = await self._forward(self._read, method, path, body, headers)
+            return await ShardFront._respond(send, *response)
+        while not self._open.is_set():
+            await self._open.wait()
+        self._writes += 1
+        self._idle.clear()
+        try:
+            response = await self._write(scope, receive, method, path, headers)
+        finally:
+            self._writes -= 1
+            if self._writes == 0:
+                self._idle.set()
+        await ShardFront._respond(send, *response)
+
+    async def _write(self, scope, receive, method: str, path: str,
+                     headers: Dict[str, str]) -> Tuple[int, bytes, List[Tuple[bytes, bytes]]]:
+        stream = ShardFront.STREAM_PATH.match(scope["path"]) if method == "POST" else None
+        if stream is not None:
+            return await self._forward(self._owner(stream.group(1)), method, path, ShardFront._chunks(receive),
+                                       headers)
+        body = await ShardFront._body(receive)
+        if scope["path"].rstrip("/") == "/batch":
+            return await self._batch(body, headers)
+        try:
+            event = json.loads(body)
+        except ValueError:
+            event = None
+        client = self._owner(event.get("aggregate_id") if isinstance(event, dict) else None)
+        return await self._forward(client, method, path, body, headers)
@@ -0,0 +1,199 @@
+import asyncio
+import logging
+import os
+import signal
+import sys
+from typing import Dict, List, Optional
+
+import httpx
+
+from Common.Transport import Backoff
+from PhotoVote.Worker.ShardFront import ShardFront
+
+logger = logging.getLogger(__name__)
+
+
+class WorkerSupervisor:
+    # Starts and watches the worker processes of one machine: a read worker, ingest workers behind a ShardFront, and
+    # consumer workers that split the aggregates between them. A worker that exits on its own is restarted, and a
+    # restart that fails is logged and tried again with backoff until it succeeds or the worker is no longer wanted.
+    #
+    # Ingest workers keep their ballot histories in a segment store under their own name, as PhotoVote.config does by
+    # default, so a worker restarted under the same name and ring position reopens the history it had. They all
+    # share the voter index files under PHOTOVOTE_INDEX_PATH, which default to the index directory of the stores.
+    #
+    # scale() changes the number of workers. New ingest workers are started before the front's ring changes and
+    # removed ones stopped after it, so no request is sent to a worker that isn't listening, and the ballots that
+    # change owner are handed over in between (see ShardFront.rebalance). Consumer workers are all
+    # restarted under new names, and so in new consumer groups: each replays the stations for its new share, which the
+    # read model absorbs since applying an event twice leaves the same document
+    def __init__(self, run_path: str, ingest: int, consumers: int, startup_timeout: float = 30.0) -> None:
+        self._run_path: str = run_path
+        self._ingest: int = ingest
+        self._consumers: int = consumers
+        self._startup_timeout: float = startup_timeout
+        self._processes: Dict[str, asyncio.subprocess.Process] = {}
+        self._watchers: Dict[str, asyncio.Task] = {}
+        self._stopping: bool = False
+        self._front: Optional[ShardFront] = None
+        self._backoff: Backoff = Backoff(1.0, 30.0)
+
+    @property
+    def front(self) -> ShardFront:
+        if self._front is None:
+            raise RuntimeError("The supervisor has not been started")
+        return self._front
+
+    def socket_path(self, name: str) -> str:
+        return os.path.join(self._run_path, f"{name}.sock")
+
+    def handoff_path(self, name: str) -> str:
+        return os.path.join(self._run_path, f"{name}.handoff.sock")
+
+    def _handoff(self, names: List[str]) -> Dict[str, str]:
+        return {name: self.handoff_path(name) for name in names}
+
+    def _names(self) -> List[str]:
+        return ["read"] + self._ingest_names(self._ingest) + self._consumer_names(self._consumers)
+
+    def _ingest_names(self, count: int) -> List[str]:
+        return [f"ingest-{index}" for index in range(count)]
+
+    def _consumer_names(self, count: int) -> List[str]:
+        return [f"consumer-{index}-of-{count}" for index in range(count)]
+
+    def _command(self, name: str) -> List[str]:
+        if name.startswith("consumer-"):
+            return [sys.executable, "-m", "PhotoVote.Consumer.consumer"]
+        return [sys.executable, "-m", "uvicorn", "PhotoVote.Server.api:app", "--uds", self.socket_path(name),
+                "--log-level", "warning"]
+
+    def _environment(self, name: str) -> Dict[str, str]:
+        environment = dict(os.environ)
+        environment["PHOTOVOTE_WORKER"] = name
+        if name.startswith("consumer-"):
+            environment["PHOTOVOTE_SHARD"] = name
+            environment["PHOTOVOTE_SHARDS"] = ",".join(self._consumer_names(self._consumers))
+        else:
+            environment["PHOTOVOTE_ROLE"] = "read" if name == "read" else "ingest"
+            if name != "read":
+                environment["PHOTOVOTE_HANDOFF_SOCKET"] = self.handoff_path(name)
+                # One voter index for every ingest worker, beside their stores, so a voter is caught by any of them and
+                # after a restart
+                environment.setdefault("PHOTOVOTE_INDEX_PATH",
+                                       os.path.join(environment.get("PHOTOVOTE_EVENT_STORE_PATH", "store"), "index"))
+            # Workers are only reached through the front, which sets X-Forwarded-For
+            environment["PHOTOVOTE_RATE_LIMIT_FORWARDED"] = "1"
+        return environment
+
+    async def _spawn(self, name: str) -> None:
+        if name.startswith("consumer-"):
+            socket_path = None
+        else:
+            socket_path = self.socket_path(name)
+            if os.path.exists(socket_path):
+                os.unlink(socket_path)
+        self._processes[name] = await asyncio.create_subprocess_exec(*self._command(name),
+                                                                     env=self._environment(name))
+        if socket_path is not None:
+            await self._listening(name, socket_path)
+        # Watched once it is ready; until then whoever spawned it deals with its failure
+        self._watchers[name] = asyncio.create_task(self._watch(name, self._processes[name]))
+
+    async def _listening(self, name: str, socket_path: str) -> None:
+        # A worker is only put behind the front once /health/ready says its producers are connected
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self._startup_timeout
+        async with ShardFront.client(socket_path) as client:
+            while True:
+                if self._processes[name].returncode is not None or loop.time() > deadline:
+                    raise RuntimeError(f"Worker {name} did not become ready on {socket_path}")
+                if os.path.exists(socket_path):
+                    try:
+                        if (await client.get("/health/ready")).status_code == 200:
+                            return
+                    except httpx.HTTPError:
+                        pass
+                await asyncio.sleep(0.05)
+
+    def _wanted(self, name: str, process: asyncio.subprocess.Process) -> bool:
+        # Only a worker that is still wanted is restarted; one stopped by scale() or stop() has been replaced
+        # or removed already
+        return not self._stopping and self._processes.get(name) is process and name in self._names()
+
+    async def _watch(self, name: str, process: asyncio.subprocess.Process) -> None:
+        await process.wait()
+        attempt = 0
+        while self._wanted(name, process):
+            if attempt == 0:
+                logger.warning("Worker %s exited with code %s, restarting it", name, process.returncode)
+            await asyncio.sleep(self._backoff.delay(attempt))
+            if not self._wanted(name, process):
+                return
+            try:
+                await self._spawn(name)
+                return
+            except Exception:
+                logger.exception("Worker %s failed to restart", name)
+                attempt += 1
+            await self._abandon(name, process)
+
+    async def _abandon(self, name: str, process: asyncio.subprocess.Process) -> None:
+        # Stops a restarted process that never became ready, unless scale() or stop() has taken the worker over, and
+        # leaves the exited one in its place so the restart is tried again
+        started = self._processes.get(name)
+        if started is None or started is process:
+            return
+        self._processes[name] = process
+        if started.returncode is None:
+            started.kill()
+            await started.wait()
+
+    async def _terminate(self, name: str) -> None:
+        process = self._processes.pop(name, None)
+        watcher = self._watchers.pop(name, None)
+        if process is None:
+            return
+        if process.returncode is None:
+            process.send_signal(signal.SIGTERM)
+            try:
+                await asyncio.wait_for(process.wait(), self._startup_timeout)
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+        if watcher is not None:
+            await asyncio.gather(watcher, return_exceptions=True)
+
+    async def start(self) -> ShardFront:
+        # Only this user may reach the workers' sockets, the handoff sockets above all
+        os.makedirs(self._run_path, mode=0o700, exist_ok=True)
+        await asyncio.gather(*(self._spawn(name) for name in self._names()))
+        self._front = ShardFront({name: self.socket_path(name) for name in self._ingest_names(self._ingest)},
+                                 self.socket_path("read"), self._handoff(self._ingest_names(self._ingest)))
+        return self._front
+
+    async def scale(self, ingest: int, consumers: int) -> None:
+        if ingest < 1 or consumers < 0:
+            raise ValueError("At least one ingest worker is needed")
+        front = self.front
+        old_ingest = self._ingest_names(self._ingest)
+        new_ingest = self._ingest_names(ingest)
+        started = [name for name in new_ingest if name not in self._processes]
+        try:
+            await asyncio.gather(*(self._spawn(name) for name in started))
+            await front.rebalance({name: self.socket_path(name) for name in new_ingest}, self._handoff(new_ingest))
+        except Exception:
+            await asyncio.gather(*(self._terminate(name) for name in started))
+            raise
+        self._ingest = ingest
+        await asyncio.gather(*(self._terminate(name) for name in old_ingest if name not in new_ingest))
+        if consumers != self._consumers:
+            await asyncio.gather(*(self._terminate(name) for name in self._consumer_names(self._consumers)))
+            self._consumers = consumers
+            await asyncio.gather(*(self._spawn(name) for name in self._consumer_names(consumers)))
+
+    async def stop(self) -> None:
+        self._stopping = True
+        await asyncio.gather(*(self._terminate(name) for name in list(self._processes)))
+        if self._front is not None:
+            await self._front.close()
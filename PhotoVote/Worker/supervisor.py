@@ -0,0 +1,42 @@
+import asyncio
+import os
+import signal
+
+import uvicorn
+from dotenv import load_dotenv
+
+from PhotoVote.Worker.WorkerSupervisor import WorkerSupervisor
+
+load_dotenv()
+
+PHOTOVOTE_HOST: str = os.getenv("PHOTOVOTE_HOST", "127.0.0.1")
+PHOTOVOTE_PORT: int = int(os.getenv("PHOTOVOTE_PORT", "8000"))
+# Directory for the workers' unix sockets
+PHOTOVOTE_RUN_PATH: str = os.getenv("PHOTOVOTE_RUN_PATH", "run")
+
+
+def process_counts() -> tuple:
+    # One ingest worker per core by default. Read again on SIGHUP, so editing .env and sending SIGHUP rescales
+    load_dotenv(override=True)
+    return (int(os.getenv("PHOTOVOTE_INGEST_PROCESSES", str(os.cpu_count() or 1))),
+            int(os.getenv("PHOTOVOTE_CONSUMER_PROCESSES", "1")))
+
+
+async def main() -> None:
+    if os.getenv("PHOTOVOTE_TRANSPORT", "memphis") == "memory":
+        raise ValueError("Worker processes need a transport they can share: use memphis or file")
+    ingest, consumers = process_counts()
+    supervisor = WorkerSupervisor(PHOTOVOTE_RUN_PATH, ingest, consumers)
+    front = await supervisor.start()
+    loop = asyncio.get_running_loop()
+    loop.add_signal_handler(signal.SIGHUP, lambda: asyncio.create_task(supervisor.scale(*process_counts())))
+    server = uvicorn.Server(uvicorn.Config(front, host=PHOTOVOTE_HOST, port=PHOTOVOTE_PORT, log_level="warning"))
+    try:
+        # uvicorn returns from serve() on SIGINT or SIGTERM
+        await server.serve()
+    finally:
+        await supervisor.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
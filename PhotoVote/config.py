@@ -0,0 +1,93 @@
+import os
+from dotenv import load_dotenv
+
+from Common.Event import EventCodec, JsonEventCodec, BinaryEventCodec
+from Common.Index import MembershipIndex, BloomFilter
+from Common.Store import DocumentStore, InMemoryDocumentStore, SqliteDocumentStore, EventStore, InMemoryEventStore, \
+    SegmentEventStore
+from Common.Transport import Transport, InMemoryTransport, FileTransport
+from PhotoVote.Event import registry
+from PhotoVote.Domain.VoterIndex import VoterIndex
+
+# Settings shared by the API and the consumers, which must agree on the transport, the codec and the read model store
+load_dotenv()
+
+# memphis (the default), memory or file. The latter two need no broker, so the HTTP tier can be run and load tested
+# on its own
+PHOTOVOTE_TRANSPORT: str = os.getenv("PHOTOVOTE_TRANSPORT", "memphis")
+PHOTOVOTE_TRANSPORT_PATH: str = os.getenv("PHOTOVOTE_TRANSPORT_PATH", "events")
+# Messages the Memphis transport keeps in flight, and how many more may wait for a slot before requests get a 503
+PHOTOVOTE_MAX_IN_FLIGHT: int = int(os.getenv("PHOTOVOTE_MAX_IN_FLIGHT", "256"))
+PHOTOVOTE_MAX_WAITING: int = int(os.getenv("PHOTOVOTE_MAX_WAITING", "1024"))
+PHOTOVOTE_PRODUCE_RETRIES: int = int(os.getenv("PHOTOVOTE_PRODUCE_RETRIES", "3"))
+# json (the default) or binary, the compact tagged encoding of Common.Event.BinaryEventCodec. Consumers must use the
+# same one
+PHOTOVOTE_EVENT_CODEC: str = os.getenv("PHOTOVOTE_EVENT_CODEC", "json")
+# memory (the default), sqlite or mongodb
+PHOTOVOTE_DOCUMENT_STORE: str = os.getenv("PHOTOVOTE_DOCUMENT_STORE", "memory")
+PHOTOVOTE_SQLITE_PATH: str = os.getenv("PHOTOVOTE_SQLITE_PATH", "photovote.sqlite3")
+# Directory of the duplicate vote and registration index files, shared by all ingest workers of a machine; empty keeps
+# the index in memory only. A positive capacity puts a Bloom filter sized for that many keys in front of each index
+PHOTOVOTE_INDEX_PATH: str = os.getenv("PHOTOVOTE_INDEX_PATH", "")
+PHOTOVOTE_INDEX_BLOOM_CAPACITY: int = int(os.getenv("PHOTOVOTE_INDEX_BLOOM_CAPACITY", "0"))
+# segment (the default), which keeps the history that ingest validates against in segment files under
+# PHOTOVOTE_EVENT_STORE_PATH, one directory per worker, or memory, which forgets it, and so every ballot cast, when the
+# process exits; memory is only meant for tests and benchmarks. With fsync off, appends don't wait for the disk
+PHOTOVOTE_EVENT_STORE: str = os.getenv("PHOTOVOTE_EVENT_STORE", "segment")
+PHOTOVOTE_EVENT_STORE_PATH: str = os.getenv("PHOTOVOTE_EVENT_STORE_PATH", "store")
+PHOTOVOTE_EVENT_STORE_FSYNC: bool = os.getenv("PHOTOVOTE_EVENT_STORE_FSYNC", "1") == "1"
+
+
+def create_transport() -> Transport:
+    if PHOTOVOTE_TRANSPORT == "memory":
+        return InMemoryTransport()
+    if PHOTOVOTE_TRANSPORT == "file":
+        return FileTransport(PHOTOVOTE_TRANSPORT_PATH)
+    if PHOTOVOTE_TRANSPORT == "memphis":
+        # Only imported when selected, so the other transports work without memphis-py installed
+        from Common.Transport.MemphisTransport import MemphisTransport
+        return MemphisTransport(os.getenv("MEMPHIS_HOST"), os.getenv("MEMPHIS_USERNAME"),
+                                os.getenv("MEMPHIS_ACCOUNT_ID"), os.getenv("MEMPHIS_PASSWORD"),
+                                PHOTOVOTE_MAX_IN_FLIGHT, PHOTOVOTE_MAX_WAITING, PHOTOVOTE_PRODUCE_RETRIES)
+    raise ValueError(f"Unknown transport: {PHOTOVOTE_TRANSPORT}")
+
+
+def create_codec(trusted: bool = False) -> EventCodec:
+    # Only trusted to decode events from our own stations and stores
+    if PHOTOVOTE_EVENT_CODEC == "json":
+        return JsonEventCodec(registry, trusted)
+    if PHOTOVOTE_EVENT_CODEC == "binary":
+        return BinaryEventCodec(registry, trusted=trusted)
+    raise ValueError(f"Unknown event codec: {PHOTOVOTE_EVENT_CODEC}")
+
+
+def create_document_store() -> DocumentStore:
+    if PHOTOVOTE_DOCUMENT_STORE == "memory":
+        return InMemoryDocumentStore()
+    if PHOTOVOTE_DOCUMENT_STORE == "sqlite":
+        return SqliteDocumentStore(PHOTOVOTE_SQLITE_PATH)
+    if PHOTOVOTE_DOCUMENT_STORE == "mongodb":
+        from Common.Store.MongoDocumentStore import MongoDocumentStore
+        return MongoDocumentStore(os.getenv("MONGODB_URI"), os.getenv("MONGODB_DATABASE", "photovote"))
+    raise ValueError(f"Unknown document store: {PHOTOVOTE_DOCUMENT_STORE}")
+
+
+def create_event_store(name: str) -> EventStore:
+    if PHOTOVOTE_EVENT_STORE == "memory":
+        return InMemoryEventStore()
+    if PHOTOVOTE_EVENT_STORE == "segment":
+        # The worker supervisor names each worker, and a store can only be opened by one process
+        path = os.path.join(PHOTOVOTE_EVENT_STORE_PATH, os.getenv("PHOTOVOTE_WORKER", ""), name)
+        return SegmentEventStore(path, create_codec(trusted=True), fsync=PHOTOVOTE_EVENT_STORE_FSYNC)
+    raise ValueError(f"Unknown event store: {PHOTOVOTE_EVENT_STORE}")
+
+
+def create_voter_index() -> VoterIndex:
+    def index(name: str) -> MembershipIndex:
+        bloom = BloomFilter(PHOTOVOTE_INDEX_BLOOM_CAPACITY) if PHOTOVOTE_INDEX_BLOOM_CAPACITY > 0 else None
+        if PHOTOVOTE_INDEX_PATH == "":
+            return MembershipIndex(bloom=bloom)
+        os.makedirs(PHOTOVOTE_INDEX_PATH, exist_ok=True)
+        return MembershipIndex(os.path.join(PHOTOVOTE_INDEX_PATH, f"{name}.index"), bloom)
+
+    return VoterIndex(index("votes"), index("emails"))